@@ -1,12 +1,68 @@
-import json
-
-from typing import Dict, Optional
-
-import urllib3
-import pandas as pd
+import re
+import threading
+import time
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from urllib.parse import urlencode
 
+from Untappd_Deadline import expires_at, time_left
+from Untappd_Errors import (
+    UntappdConnectionError,
+    UntappdDeadlineError,
+    UntappdError,
+    raise_for_response,
+)
+from Untappd_Json import default_decoder, get_decoder
+from Untappd_Transport import Urllib3Transport
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    import urllib3
+
+    from Untappd_Cache import ResponseCache
+    from Untappd_Coalesce import SingleFlight
+    from Untappd_Credentials import CredentialPool
+    from Untappd_Hedge import HedgePolicy
+    from Untappd_Metrics import Metrics
+    from Untappd_Name_Store import NameResolutionStore
+    from Untappd_Rate_Limit import RateLimiter
+    from Untappd_Retry import CircuitBreaker, CircuitBreakers, RetryPolicy
+    from Untappd_Transport import RecordingTransport, ReplayTransport
+
+# The number of threads sending hedged reads, per client, for the primaries and the copies each
+HEDGE_WORKERS = 32
+
+_ADDRESS_ABBREVIATIONS = {
+    "street": "st",
+    "avenue": "ave",
+    "road": "rd",
+    "boulevard": "blvd",
+    "drive": "dr",
+    "lane": "ln",
+    "place": "pl",
+    "court": "ct",
+    "square": "sq",
+    "highway": "hwy",
+    "parkway": "pkwy",
+    "suite": "ste",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+}
+
 
 class UntappdAPI:
     def __init__(self, client_id: str, client_secret: str) -> None:
@@ -24,7 +80,35 @@ class UntappdAPI:
         self.client_secret = client_secret
         self.auth = None
         self.user_auth_params = None
-        self.https = urllib3.PoolManager()
+        self._urllib3_transport = Urllib3Transport()
+        self.transport = self._urllib3_transport
+        self.cache = None
+        self.name_store = None
+        self.rate_limiter = None
+        self.coalescer = None
+        self.credential_pool = None
+        self.retry_policy = None
+        self.circuit_breakers = None
+        self.timeout = None
+        self.hedge_policy = None
+        self.metrics = None
+        self.decoder = None
+        self._hedge_executor = None
+        self._hedge_primary_executor = None
+        self._hedge_primary_slots = threading.BoundedSemaphore(HEDGE_WORKERS)
+        self._hedge_lock = threading.Lock()
+
+    @property
+    def https(self) -> "urllib3.PoolManager":
+        """The urllib3 connection pool of this client, created on first use"""
+        return self._urllib3_transport.pool
+
+    @https.setter
+    def https(self, pool: "urllib3.PoolManager") -> None:
+        default = self.transport is self._urllib3_transport
+        self._urllib3_transport = Urllib3Transport(pool)
+        if default:
+            self.transport = self._urllib3_transport
 
     def set_auth(self, auth: str) -> None:
         """Method to set the auth token for a request given by Untappd's API after user authorization
@@ -36,10 +120,153 @@ class UntappdAPI:
         """
         self.auth = auth
 
+    def set_cache(self, cache: Optional["ResponseCache"]) -> None:
+        """Method to set the cache used for GET responses, see Untappd_Cache.ResponseCache
+
+        Parameters
+        ----------
+        cache: ResponseCache
+            The cache to use, or None to disable caching
+        """
+        self.cache = cache
+
+    def set_name_store(self, name_store: Optional["NameResolutionStore"]) -> None:
+        """Method to set the store used to resolve names to ids, see Untappd_Name_Store
+
+        Parameters
+        ----------
+        name_store: NameResolutionStore
+            The store to use, or None to always search for names
+        """
+        self.name_store = name_store
+
+    def set_rate_limiter(self, rate_limiter: Optional["RateLimiter"]) -> None:
+        """Method to set the rate limiter pacing requests, see Untappd_Rate_Limit.RateLimiter
+
+        Parameters
+        ----------
+        rate_limiter: RateLimiter
+            The rate limiter to use, or None to send requests immediately
+        """
+        self.rate_limiter = rate_limiter
+
+    def set_coalescing(self, coalescer: Optional["SingleFlight"]) -> None:
+        """Method to set the coalescer merging identical concurrent GET requests, see Untappd_Coalesce
+
+        Parameters
+        ----------
+        coalescer: SingleFlight
+            The coalescer to use, which may be shared between clients, or None to send every request
+        """
+        self.coalescer = coalescer
+
+    def set_credential_pool(self, credential_pool: Optional["CredentialPool"]) -> None:
+        """Method to set the pool of client keys that unauthenticated requests rotate through
+
+        Requests made with the user's access token are not affected, see
+        Untappd_Credentials.CredentialPool
+
+        Parameters
+        ----------
+        credential_pool: CredentialPool
+            The pool to use, or None to always use this client's id and secret
+        """
+        self.credential_pool = credential_pool
+
+    def set_retry_policy(self, retry_policy: Optional["RetryPolicy"]) -> None:
+        """Method to set the policy retrying failed requests, see Untappd_Retry.RetryPolicy
+
+        Parameters
+        ----------
+        retry_policy: RetryPolicy
+            The policy to use, or None to raise the error of the first failure
+        """
+        self.retry_policy = retry_policy
+
+    def set_circuit_breakers(
+        self, circuit_breakers: Optional["CircuitBreakers"]
+    ) -> None:
+        """Method to set the circuit breakers failing fast on degraded endpoints, see Untappd_Retry
+
+        Parameters
+        ----------
+        circuit_breakers: CircuitBreakers
+            The breakers to use, which may be shared between clients, or None to always send requests
+        """
+        self.circuit_breakers = circuit_breakers
+
+    def set_timeout(self, timeout: Optional[float]) -> None:
+        """Method to set the deadline of every call of this client, see Untappd_Deadline
+
+        The deadline covers rate limit waits and retries, and calls inside a shorter
+        deadline() keep the shorter one.
+
+        Parameters
+        ----------
+        timeout: float
+            The time allowed per call in seconds, or None for no deadline
+        """
+        self.timeout = timeout
+
+    def set_hedging(self, hedge_policy: Optional["HedgePolicy"]) -> None:
+        """Method to set the policy hedging slow reads, see Untappd_Hedge.HedgePolicy
+
+        Parameters
+        ----------
+        hedge_policy: HedgePolicy
+            The policy to use, or None to never send duplicate requests
+        """
+        self.hedge_policy = hedge_policy
+
+    def set_transport(
+        self,
+        transport: Optional[
+            Union["Urllib3Transport", "RecordingTransport", "ReplayTransport"]
+        ],
+    ) -> None:
+        """Method to set the transport sending requests, see Untappd_Transport
+
+        Parameters
+        ----------
+        transport: Urllib3Transport, RecordingTransport or ReplayTransport
+            The transport to use, or None to send requests over this client's connection pool
+        """
+        if transport is None:
+            transport = self._urllib3_transport
+        self.transport = transport
+
+    def set_metrics(self, metrics: Optional["Metrics"]) -> None:
+        """Method to set the collector of per-endpoint request metrics, see Untappd_Metrics
+
+        Parameters
+        ----------
+        metrics: Metrics
+            The collector to use, which may be shared between clients, or None to record nothing
+        """
+        self.metrics = metrics
+
+    def set_decoder(
+        self, decoder: Optional[Union[str, Callable[[bytes], Any]]]
+    ) -> None:
+        """Method to set the JSON decoder of responses, see Untappd_Json
+
+        Parameters
+        ----------
+        decoder: str or callable
+            "orjson", "msgspec", "json" or "auto", a function parsing the bytes of a body
+            and raising ValueError if they are not valid JSON, or None for the fastest
+            backend installed
+        """
+        if isinstance(decoder, str):
+            decoder = get_decoder(decoder)
+        self.decoder = decoder
+
     def _get_api_auth_token(self) -> str:
         """Internal function to get the access token if set, or the client ID and secret"""
         if self.auth:
             return "access_token=" + self.auth
+        elif self.credential_pool is not None:
+            return self.credential_pool.acquire()
         else:
             return (
                 "client_id=" + self.client_id + "&client_secret=" + self.client_secret
@@ -49,9 +276,35 @@ class UntappdAPI:
         """Internal function to return the authed users access token"""
         return "access_token=" + self.auth
 
+    def _build_url(self, method: str, auth: str, params: Dict) -> str:
+        """Internal function to build the full request url
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        auth: str
+            URL encoding of Untappd API authorization tokens
+        params: dictionary
+            Params for the API request
+
+        Returns
+        -------
+        The url of our request
+        """
+        url = self.url + method + "?" + auth
+        if params:
+            url = url + "&" + urlencode(params)
+        return url
+
     def _do_get(
-        self, method: str, auth: str, params: Dict, fields: Optional[Dict] = None
-    ) -> Dict:
+        self,
+        method: str,
+        auth: str,
+        params: Dict,
+        fields: Optional[Dict] = None,
+        model: Optional[Callable[[Dict], Any]] = None,
+    ) -> Any:
         """Internal Function to send GET requests
 
         Parameters
@@ -64,21 +317,35 @@ class UntappdAPI:
             Params for the API request
         fields: dictionary
             Fields that we want returned from our request (optional)
+        model: callable, default=None
+            Converts the response, such as into models of Untappd_Models (optional)
 
         Returns
         -------
-        A dictionary of our GET request
+        A dictionary of our GET request, or what model converted it to
         """
-        url = self.url + method + "?" + auth
-
-        if params:
-            params = urlencode(params)
-            url = url + "&" + params
-        if fields:
-            response = self.https.request("GET", url, fields=fields)
+        cache_key = None
+        if self.cache is not None:
+            cache_key, cached = self.cache.lookup(method, auth, params, fields)
+            if cached is not None:
+                return cached if model is None else model(cached)
+        url = self._build_url(method, auth, params)
+        if self.coalescer is not None and self.coalescer.coalesces(method):
+            key = self.coalescer.make_key(method, auth, params, fields)
+            data = self.coalescer.do(
+                key,
+                self._fetch_json,
+                "GET",
+                method,
+                auth,
+                url,
+                fields,
+                timeout=self.timeout,
+            )
         else:
-            response = self.https.request("GET", url)
-        return json.loads(response.data.decode("utf-8"))
+            data = self._fetch_json("GET", method, auth, url, fields)
+        self._update_cache(method, cache_key, data)
+        return data if model is None else model(data)
 
     def _do_post(
         self, method: str, auth: str, params: Dict, fields: Optional[Dict] = None
@@ -100,15 +367,318 @@ class UntappdAPI:
         -------
         A dictionary of our POST request
         """
-        url = self.url + method + "?" + auth
-        if params:
-            params = urlencode(params)
-            url = url + "&" + params
-        if fields:
-            response = self.https.request("POST", url, fields=fields)
+        url = self._build_url(method, auth, params)
+        data = self._fetch_json("POST", method, auth, url, fields)
+        self._update_cache(method, None, data)
+        return data
+
+    def _fetch_json(
+        self, verb: str, method: str, auth: str, url: str, fields: Optional[Dict]
+    ) -> Dict:
+        """Internal function to send a request and decode its JSON response, retrying failures
+
+        Raises
+        ------
+        UntappdError
+            The classified error of the last attempt, see Untappd_Errors
+        """
+        expires = expires_at(self.timeout)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker = None
+            try:
+                breaker = self._before_attempt(method)
+                if self.hedge_policy is not None and self.hedge_policy.hedges(method):
+                    response = self._send_hedged(
+                        verb, method, auth, url, fields, expires
+                    )
+                else:
+                    response = self._send(verb, method, auth, url, fields, expires)
+                data = self._decode(method, *response)
+            except UntappdError as error:
+                time.sleep(self._retry_delay(method, attempt, error, breaker, expires))
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return data
+
+    def _send(
+        self,
+        verb: str,
+        method: str,
+        auth: str,
+        url: str,
+        fields: Optional[Dict],
+        expires: Optional[float] = None,
+    ) -> Tuple[int, Mapping, bytes]:
+        """Internal function to send a request, paced against its rate limiter if set
+
+        Parameters
+        ----------
+        verb: str
+            The HTTP verb of the request
+        method: str
+            Untappd API method
+        auth: str
+            URL encoding of Untappd API authorization tokens
+        url: str
+            The full url of the request
+        fields: dictionary
+            Fields that we want returned from our request
+        expires: float, default=None
+            The monotonic time the request must complete by (optional)
+
+        Returns
+        -------
+        The status, headers and body of the response
+        """
+        rate_limiter = self._pace(method, auth, expires)
+        return self._request(verb, method, rate_limiter, url, fields, expires)
+
+    def _pace(
+        self, method: str, auth: str, expires: Optional[float]
+    ) -> Optional["RateLimiter"]:
+        """Internal function to wait until the rate limiter of a request lets it be sent
+
+        Returns the rate limiter the request was reserved on, if any.
+        """
+        rate_limiter = self._rate_limiter_for(auth)
+        if rate_limiter is not None:
+            delay = rate_limiter.reserve()
+            left = time_left(expires, method)
+            if left is not None and delay >= left:
+                rate_limiter.release()
+                raise UntappdDeadlineError(
+                    f"{method} would wait {delay:.1f}s for the rate limit, past its deadline",
+                    method,
+                    sent=False,
+                )
+            if delay > 0:
+                time.sleep(delay)
+        return rate_limiter
+
+    def _request(
+        self,
+        verb: str,
+        method: str,
+        rate_limiter: Optional["RateLimiter"],
+        url: str,
+        fields: Optional[Dict],
+        expires: Optional[float],
+    ) -> Tuple[int, Mapping, bytes]:
+        """Internal function to send a request which was already paced, see _send"""
+        try:
+            started = time.perf_counter()
+            status, headers, body = self.transport.request(
+                verb, url, fields, time_left(expires, method)
+            )
+        except Exception as e:
+            if rate_limiter is not None:
+                rate_limiter.release()
+            error = self._transport_error(method, e, expires)
+            if error is not None:
+                raise error from e
+            raise
+        if rate_limiter is not None:
+            rate_limiter.update(headers, status)
+        if self.metrics is not None:
+            self.metrics.observe_response(
+                method, status, headers, len(body), time.perf_counter() - started
+            )
+        return status, headers, body
+
+    def _transport_error(
+        self, method: str, error: BaseException, expires: Optional[float]
+    ) -> Optional[UntappdError]:
+        """Internal function to classify an exception raised sending a request
+
+        Returns None if the exception is not a connection or timeout error.
+        """
+        from urllib3 import exceptions
+
+        if not isinstance(error, exceptions.HTTPError):
+            return None
+        # Only a connection which was never made certainly did not reach Untappd
+        sent = not isinstance(
+            error, (exceptions.NewConnectionError, exceptions.ConnectTimeoutError)
+        )
+        return self._no_response_error(method, error, sent, expires)
+
+    @staticmethod
+    def _no_response_error(
+        method: str, error: BaseException, sent: bool, expires: Optional[float]
+    ) -> UntappdError:
+        """Internal function to return the error of a request which got no response"""
+        if expires is not None and time.monotonic() >= expires:
+            return UntappdDeadlineError(
+                f"{method} did not complete before its deadline", method, sent=sent
+            )
+        return UntappdConnectionError(f"{method} failed: {error}", method, sent=sent)
+
+    def _send_hedged(
+        self,
+        verb: str,
+        method: str,
+        auth: str,
+        url: str,
+        fields: Optional[Dict],
+        expires: Optional[float],
+    ) -> Tuple[int, Mapping, bytes]:
+        """Internal function to send a read, racing a copy of it if it is slower than usual
+
+        The copy is only sent when its rate limiter can send it at once, and whichever
+        request answers first is used. The other one completes in the background.
+
+        The primary is sent at once on a pool of its own, rather than queued behind other
+        requests on the pool of the copies, so the hedge delay only counts the time it has
+        really been in flight. The calling thread waits on both to return the first answer.
+        When every primary thread is busy the read is sent on the calling thread unhedged.
+        """
+        policy = self.hedge_policy
+        hedge_after = policy.delay(method)
+        rate_limiter = self._pace(method, auth, expires)
+        started = time.monotonic()
+        if hedge_after is None or not self._hedge_primary_slots.acquire(blocking=False):
+            response = self._request(verb, method, rate_limiter, url, fields, expires)
+            policy.observe(method, time.monotonic() - started)
+            return response
+        from concurrent.futures import as_completed, wait
+
+        args = (verb, method, rate_limiter, url, fields, expires)
+
+        def send_primary() -> Tuple[int, Mapping, bytes]:
+            try:
+                return self._request(*args)
+            finally:
+                self._hedge_primary_slots.release()
+
+        try:
+            primary = self._get_hedge_executor(primary=True).submit(send_primary)
+        except BaseException:
+            self._hedge_primary_slots.release()
+            raise
+        futures = [primary]
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done and policy.try_hedge():
+            if rate_limiter is None or rate_limiter.reserve() <= 0:
+                executor = self._get_hedge_executor()
+                futures.append(executor.submit(self._request, *args))
+            else:
+                # The copy would have to wait for the rate limit, so it cannot win
+                rate_limiter.release()
+        error = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            policy.observe(method, time.monotonic() - started, future is not primary)
+            return response
+        raise error
+
+    def _get_hedge_executor(self, primary: bool = False) -> "ThreadPoolExecutor":
+        """Internal function to lazily create the threads hedged primaries or their copies are sent on"""
+        name = "_hedge_primary_executor" if primary else "_hedge_executor"
+        if getattr(self, name) is None:
+            with self._hedge_lock:
+                if getattr(self, name) is None:
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    prefix = "untappd-hedge-primary" if primary else "untappd-hedge"
+                    executor = ThreadPoolExecutor(
+                        max_workers=HEDGE_WORKERS, thread_name_prefix=prefix
+                    )
+                    setattr(self, name, executor)
+        return getattr(self, name)
+
+    def _decode(self, method: str, status: int, headers: Mapping, body: bytes) -> Dict:
+        """Internal function to decode a response, raising the classified error of a failure"""
+        started = None if self.metrics is None else time.perf_counter()
+        try:
+            data = (self.decoder or default_decoder())(body)
+        except ValueError:
+            data = None
+        if started is not None:
+            self.metrics.observe_decode(method, time.perf_counter() - started)
+        raise_for_response(method, status, headers, data)
+        return data
+
+    def _before_attempt(self, method: str) -> Optional["CircuitBreaker"]:
+        """Internal function to return the circuit breaker of a request, raising if it is open"""
+        if self.circuit_breakers is None:
+            return None
+        breaker = self.circuit_breakers.breaker_for(method)
+        breaker.before_request(method)
+        return breaker
+
+    def _retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        error: UntappdError,
+        breaker: Optional["CircuitBreaker"],
+        expires: Optional[float] = None,
+    ) -> float:
+        """Internal function to record a failed attempt and return the delay before the next one
+
+        Raises the error if the request should not be retried, or not before its deadline.
+        """
+        if breaker is not None:
+            breaker.record_failure(error)
+        if self.metrics is not None:
+            self.metrics.observe_error(method, error)
+        if self.retry_policy is None:
+            raise error
+        delay = self.retry_policy.delay(method, attempt, error)
+        if delay is None:
+            raise error
+        if expires is not None and time.monotonic() + delay >= expires:
+            raise error
+        return delay
+
+    def _rate_limiter_for(self, auth: str) -> Optional["RateLimiter"]:
+        """Internal function to return the rate limiter of the credentials a request is sent with"""
+        if self.credential_pool is not None:
+            rate_limiter = self.credential_pool.rate_limiter_for(auth)
+            if rate_limiter is not None:
+                return rate_limiter
+        return self.rate_limiter
+
+    def _update_cache(self, method: str, cache_key, data: Dict) -> None:
+        """Internal function to store a response in the cache, or invalidate the responses it made stale
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        cache_key: hashable
+            The cache key returned by the cache lookup, or None if the method is not cached
+        data: dictionary
+            The decoded response
+        """
+        if self.cache is None:
+            return
+        if cache_key is not None:
+            self.cache.store(cache_key, data)
         else:
-            response = self.https.request("POST", url)
-        return json.loads(response.data.decode("utf-8"))
+            self.cache.invalidate_after(method)
+
+    def _stored_name_id(self, kind: str, key: Tuple[str, ...]) -> Optional[str]:
+        """Internal function to return the id of a name from the name store, if set and known"""
+        if self.name_store is None:
+            return None
+        return self.name_store.get(kind, key)
+
+    def _store_name_id(self, kind: str, key: Tuple[str, ...], value: str) -> None:
+        """Internal function to save the resolved id of a name to the name store, if set"""
+        if self.name_store is not None:
+            self.name_store.put(kind, key, value)
 
     def _find_venue_id(self, venue_name: str, address: str) -> str:
         """Returns the venue id given a name and an address
@@ -124,16 +694,105 @@ class UntappdAPI:
         -------
         The venue_id of our given venue
         """
-        data = self.venue_search(venue_name)
-        address_df = pd.DataFrame()
-        for j in range(data["response"]["venues"]["count"]):
-            address_df = pd.concat(
-                [
-                    address_df,
-                    pd.DataFrame.from_dict(data["response"]["venues"]["items"][j]),
-                ]
+        venue_id = self._stored_name_id("venue", (venue_name, address))
+        if venue_id is None:
+            data = self.venue_search(venue_name)
+            venue_id = self._venue_id_from_search(data, venue_name, address)
+            self._store_name_id("venue", (venue_name, address), venue_id)
+        return venue_id
+
+    @staticmethod
+    def _normalize_address(address: str) -> str:
+        """Internal function to normalize the case, punctuation and abbreviations of an address"""
+        words = re.sub(r"[^\w\s]", " ", address.casefold()).split()
+        return " ".join(_ADDRESS_ABBREVIATIONS.get(word, word) for word in words)
+
+    @staticmethod
+    def _address_contains(address: str, other: str) -> bool:
+        """Internal function to check whether one normalized address holds the other as whole words
+
+        The house numbers, the first words if they start with a digit, must be the same, so
+        "1 main street" neither matches "11 main street" nor "main street".
+        """
+        words, other_words = address.split(), other.split()
+        if not words or not other_words:
+            return False
+        numbered = words[0][0].isdigit() or other_words[0][0].isdigit()
+        if numbered and words[0] != other_words[0]:
+            return False
+        if len(words) < len(other_words):
+            words, other_words = other_words, words
+        size = len(other_words)
+        return any(
+            words[start : start + size] == other_words
+            for start in range(len(words) - size + 1)
+        )
+
+    @classmethod
+    def _rank_venues(cls, data: Dict, venue_name: str, address: str) -> List[Dict]:
+        """Returns the venues of a venue search response matching an address, best first
+
+        Venues whose normalized address equals our address rank above venues whose address
+        only contains it, or is contained in it, as whole words with the same house number,
+        and ties are broken by how closely the venue name matches.
+
+        Parameters
+        ----------
+        data: dict
+            The response of our venue search
+        venue_name: str
+            The name of the venue
+        address: str
+            The street address of the venue
+
+        Returns
+        -------
+        A list of the matching venues
+        """
+        target_address = cls._normalize_address(address)
+        target_name = " ".join(venue_name.casefold().split())
+        ranked = []
+        for position, item in enumerate(data["response"]["venues"]["items"]):
+            venue = item.get("venue", item)
+            venue_address = venue.get("venue_address")
+            if venue_address is None:
+                venue_address = venue.get("location", {}).get("venue_address", "")
+            venue_address = cls._normalize_address(venue_address)
+            if venue_address == target_address:
+                address_score = 2
+            elif cls._address_contains(venue_address, target_address):
+                address_score = 1
+            else:
+                continue
+            name = " ".join(venue.get("venue_name", "").casefold().split())
+            name_score = 2 if name == target_name else int(target_name in name)
+            ranked.append((-address_score, -name_score, position, venue))
+        ranked.sort(key=lambda candidate: candidate[:3])
+        return [candidate[3] for candidate in ranked]
+
+    @classmethod
+    def _venue_id_from_search(cls, data: Dict, venue_name: str, address: str) -> str:
+        """Returns the id of the best matching venue from a venue search response
+
+        Parameters
+        ----------
+        data: dict
+            The response of our venue search
+        venue_name: str
+            The name of the venue
+        address: str
+            The street address of the venue
+
+        Returns
+        -------
+        The venue_id of our given venue
+        """
+        venues = cls._rank_venues(data, venue_name, address)
+        if not venues:
+            raise ValueError(
+                f"No venue named {venue_name} found at the address {address}"
             )
-        return address_df.loc[address_df["venue_address"] == address]["venue_id"][0]
+        return venues[0]["venue_id"]
 
     def _find_beer_id(self, beer_name: str, brewery_name: str) -> str:
         """Returns the beer id given the beer name and brewery name
@@ -149,7 +808,16 @@ class UntappdAPI:
         -------
         The beer_id given our beer name and brewery name
         """
-        data = self.beer_search(beer_name, fields={"brewery_name": brewery_name})
+        beer_id = self._stored_name_id("beer", (beer_name, brewery_name))
+        if beer_id is None:
+            data = self.beer_search(beer_name, fields={"brewery_name": brewery_name})
+            beer_id = self._beer_id_from_search(data)
+            self._store_name_id("beer", (beer_name, brewery_name), beer_id)
+        return beer_id
+
+    @staticmethod
+    def _beer_id_from_search(data: Dict) -> str:
+        """Returns the id of the top beer from a beer search response"""
         return data["response"]["beers"]["items"][0]["beer"]["bid"]
 
     def _find_brewery_id(self, brewery_name: str) -> str:
@@ -164,7 +832,16 @@ class UntappdAPI:
         -------
         The brewery_id given the brewery name
         """
-        data = self.brewery_search(brewery_name)
+        brewery_id = self._stored_name_id("brewery", (brewery_name,))
+        if brewery_id is None:
+            data = self.brewery_search(brewery_name)
+            brewery_id = self._brewery_id_from_search(data)
+            self._store_name_id("brewery", (brewery_name,), brewery_id)
+        return brewery_id
+
+    @staticmethod
+    def _brewery_id_from_search(data: Dict) -> str:
+        """Returns the id of the top brewery from a brewery search response"""
         return data["response"]["brewery"]["items"][0]["brewery"]["brewery_id"]
 
     def brewery_search(self, query: str, fields: Optional[Dict] = None) -> Dict:
@@ -0,0 +1,555 @@
+"""Untappd API asyncio clients
+
+Async counterparts of the blocking clients. Every method keeps the name and return
+shape of its blocking version, but has to be awaited, except for the *_many batch
+lookups, which are iterated with ``async for``. Requests share one aiohttp
+session per client, so connections are reused and at most ``max_concurrency``
+requests are in flight at once. The iter_* pagination helpers are only available on the
+blocking clients, and raise TypeError on these.
+"""
+
+import asyncio
+import sys
+import time
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from UntappdAPI import UntappdAPI
+from Untappd_Batch import BatchResult, run_batch_async
+from Untappd_Deadline import expires_at, time_left
+from Untappd_Errors import UntappdDeadlineError, UntappdError
+from Untappd_Feed import UntappdFeed
+from Untappd_Friends import UntappdFriends
+from Untappd_Transport import CONNECT_TIMEOUT, READ_TIMEOUT
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Models import Beer, Brewery, Checkin, Venue
+from Untappd_User_Actions import UntappdUserActions
+from Untappd_User_Info import UntappdUserInfo
+
+if TYPE_CHECKING:
+    from Untappd_Rate_Limit import RateLimiter
+    from Untappd_Transport import RecordingTransport, ReplayTransport
+
+
+def _blocking_only(name: str) -> Callable:
+    """Internal function to return a method raising TypeError in place of an iter_* helper
+
+    The iterators call the client's methods for each page, which on an async client return
+    coroutines instead of responses, so they would silently yield nothing.
+    """
+
+    def method(self, *args, **kwargs):
+        raise TypeError(
+            f"{name} is only available on the blocking clients, page through "
+            f"{type(self).__name__} by awaiting each page with max_id or offset instead"
+        )
+
+    method.__name__ = name
+    return method
+
+
+class AsyncUntappdAPI(UntappdAPI):
+    def __init__(
+        self, client_id: str, client_secret: str, max_concurrency: int = 100
+    ) -> None:
+        """Base class for getting data from Untappd with asyncio
+
+        Parameters
+        -----------
+        client_id: str
+            The Untappd API Client ID
+        client_secret: str
+            The Untappd API Client Secret
+        max_concurrency: int, default=100
+            The maximum number of requests in flight at once
+        """
+        super().__init__(client_id, client_secret)
+        self.max_concurrency = max_concurrency
+        self.transport = None
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncUntappdAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the underlying session and its pooled connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def set_transport(
+        self, transport: Optional[Union["RecordingTransport", "ReplayTransport"]]
+    ) -> None:
+        """Method to set a blocking transport used in place of aiohttp, see Untappd_Transport
+
+        Requests are sent through it on the default executor of the event loop, which
+        lets recorded runs be replayed by async clients too.
+
+        Parameters
+        ----------
+        transport: RecordingTransport or ReplayTransport
+            The transport to use, or None to send requests with aiohttp
+        """
+        self.transport = transport
+
+    def _get_session(self):
+        """Internal function to lazily create the shared aiohttp session"""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError(
+                    "AsyncUntappdAPI requires aiohttp, install it with `pip install aiohttp` or "
+                    "`pip install -r requirements-async.txt`"
+                ) from e
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency, limit_per_host=self.max_concurrency
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=CONNECT_TIMEOUT,
+                sock_read=READ_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def _do_get(
+        self,
+        method: str,
+        auth: str,
+        params: Dict,
+        fields: Optional[Dict] = None,
+        model: Optional[Callable[[Dict], Any]] = None,
+    ) -> Any:
+        """Internal Function to send GET requests, see UntappdAPI._do_get"""
+        cache_key = None
+        if self.cache is not None:
+            cache_key, cached = self.cache.lookup(method, auth, params, fields)
+            if cached is not None:
+                return cached if model is None else model(cached)
+        url = self._build_url(method, auth, params)
+        if self.coalescer is not None and self.coalescer.coalesces(method):
+            key = self.coalescer.make_key(method, auth, params, fields)
+            data = await self.coalescer.do_async(
+                key,
+                self._fetch_json,
+                "GET",
+                method,
+                auth,
+                url,
+                fields,
+                timeout=self.timeout,
+            )
+        else:
+            data = await self._fetch_json("GET", method, auth, url, fields)
+        self._update_cache(method, cache_key, data)
+        return data if model is None else model(data)
+
+    async def _do_post(
+        self, method: str, auth: str, params: Dict, fields: Optional[Dict] = None
+    ) -> Dict:
+        """Internal Function to send POST requests, see UntappdAPI._do_post"""
+        url = self._build_url(method, auth, params)
+        data = await self._fetch_json("POST", method, auth, url, fields)
+        self._update_cache(method, None, data)
+        return data
+
+    async def _fetch_json(
+        self, verb: str, method: str, auth: str, url: str, fields: Optional[Dict]
+    ) -> Dict:
+        """Internal function to send a request and decode its JSON response, see UntappdAPI._fetch_json"""
+        expires = expires_at(self.timeout)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker = None
+            try:
+                breaker = self._before_attempt(method)
+                if self.hedge_policy is not None and self.hedge_policy.hedges(method):
+                    response = await self._send_hedged(
+                        verb, method, auth, url, fields, expires
+                    )
+                else:
+                    response = await self._send(
+                        verb, method, auth, url, fields, expires
+                    )
+                data = self._decode(method, *response)
+            except UntappdError as error:
+                await asyncio.sleep(
+                    self._retry_delay(method, attempt, error, breaker, expires)
+                )
+                continue
+            except BaseException:
+                # Other errors, cancellation included, give back the breaker's slot and
+                # propagate unclassified
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return data
+
+    async def _send(
+        self,
+        verb: str,
+        method: str,
+        auth: str,
+        url: str,
+        fields: Optional[Dict],
+        expires: Optional[float] = None,
+    ) -> Tuple[int, Mapping, bytes]:
+        """Internal function to send a request, see UntappdAPI._send"""
+        rate_limiter = await self._pace(method, auth, expires)
+        return await self._request(verb, method, rate_limiter, url, fields, expires)
+
+    async def _pace(
+        self, method: str, auth: str, expires: Optional[float]
+    ) -> Optional["RateLimiter"]:
+        """Internal function to wait until the rate limiter of a request lets it be sent, see UntappdAPI._pace"""
+        rate_limiter = self._rate_limiter_for(auth)
+        if rate_limiter is not None:
+            delay = rate_limiter.reserve()
+            left = time_left(expires, method)
+            if left is not None and delay >= left:
+                rate_limiter.release()
+                raise UntappdDeadlineError(
+                    f"{method} would wait {delay:.1f}s for the rate limit, past its deadline",
+                    method,
+                    sent=False,
+                )
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return rate_limiter
+
+    async def _request(
+        self,
+        verb: str,
+        method: str,
+        rate_limiter: Optional["RateLimiter"],
+        url: str,
+        fields: Optional[Dict],
+        expires: Optional[float],
+    ) -> Tuple[int, Mapping, bytes]:
+        """Internal function to send a request which was already paced, see UntappdAPI._request"""
+        if verb == "GET":
+            kwargs = {"params": fields}
+        else:
+            kwargs = {"data": fields}
+        try:
+            started = time.perf_counter()
+            left = time_left(expires, method)
+            if self.transport is not None:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    None, self.transport.request, verb, url, fields, left
+                )
+                status, headers, body = response
+            else:
+                if left is not None:
+                    kwargs["timeout"] = self._client_timeout(left)
+                session = self._get_session()
+                async with session.request(verb, url, **kwargs) as response:
+                    status, headers = response.status, response.headers
+                    body = await response.read()
+        except Exception as e:
+            if rate_limiter is not None:
+                rate_limiter.release()
+            error = self._transport_error(method, e, expires)
+            if error is not None:
+                raise error from e
+            raise
+        except BaseException:
+            # Cancellation and interrupts give back the reservation and propagate as is
+            if rate_limiter is not None:
+                rate_limiter.release()
+            raise
+        if rate_limiter is not None:
+            rate_limiter.update(headers, status)
+        if self.metrics is not None:
+            self.metrics.observe_response(
+                method, status, headers, len(body), time.perf_counter() - started
+            )
+        return status, headers, body
+
+    def _transport_error(
+        self, method: str, error: Exception, expires: Optional[float]
+    ) -> Optional[UntappdError]:
+        """Internal function to classify an exception raised sending a request, see UntappdAPI._transport_error"""
+        if isinstance(error, asyncio.CancelledError):
+            return None
+        if isinstance(error, asyncio.TimeoutError):
+            return self._no_response_error(method, error, True, expires)
+        try:
+            import aiohttp
+        except ImportError:
+            aiohttp = None
+        if aiohttp is not None and isinstance(error, aiohttp.ClientError):
+            # Only a connection which was never made certainly did not reach Untappd
+            sent = not isinstance(error, aiohttp.ClientConnectorError)
+            return self._no_response_error(method, error, sent, expires)
+        # Only a blocking transport raises urllib3 errors, and it has imported urllib3
+        if "urllib3" not in sys.modules:
+            return None
+        return super()._transport_error(method, error, expires)
+
+    async def _send_hedged(
+        self,
+        verb: str,
+        method: str,
+        auth: str,
+        url: str,
+        fields: Optional[Dict],
+        expires: Optional[float],
+    ) -> Tuple[int, Mapping, bytes]:
+        """Internal function to send a read, racing a copy of it if it is slower than usual
+
+        Unlike the blocking client, the request which loses the race is cancelled.
+        """
+        policy = self.hedge_policy
+        hedge_after = policy.delay(method)
+        rate_limiter = await self._pace(method, auth, expires)
+        started = time.monotonic()
+        args = (verb, method, rate_limiter, url, fields, expires)
+        if hedge_after is None:
+            response = await self._request(*args)
+            policy.observe(method, time.monotonic() - started)
+            return response
+        primary = asyncio.ensure_future(self._request(*args))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done and policy.try_hedge():
+                if rate_limiter is None or rate_limiter.reserve() <= 0:
+                    tasks.add(asyncio.ensure_future(self._request(*args)))
+                else:
+                    # The copy would have to wait for the rate limit, so it cannot win
+                    rate_limiter.release()
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    policy.observe(
+                        method, time.monotonic() - started, task is not primary
+                    )
+                    return task.result()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _client_timeout(self, left: float):
+        """Internal function to return the aiohttp timeout of a request with left seconds to its deadline"""
+        import aiohttp
+
+        return aiohttp.ClientTimeout(
+            total=left,
+            sock_connect=CONNECT_TIMEOUT,
+            sock_read=READ_TIMEOUT,
+        )
+
+    async def _find_venue_id(self, venue_name: str, address: str) -> str:
+        """Returns the venue id given a name and an address"""
+        venue_id = self._stored_name_id("venue", (venue_name, address))
+        if venue_id is None:
+            data = await self.venue_search(venue_name)
+            venue_id = self._venue_id_from_search(data, venue_name, address)
+            self._store_name_id("venue", (venue_name, address), venue_id)
+        return venue_id
+
+    async def _find_beer_id(self, beer_name: str, brewery_name: str) -> str:
+        """Returns the beer id given the beer name and brewery name"""
+        beer_id = self._stored_name_id("beer", (beer_name, brewery_name))
+        if beer_id is None:
+            data = await self.beer_search(
+                beer_name, fields={"brewery_name": brewery_name}
+            )
+            beer_id = self._beer_id_from_search(data)
+            self._store_name_id("beer", (beer_name, brewery_name), beer_id)
+        return beer_id
+
+    async def _find_brewery_id(self, brewery_name: str) -> str:
+        """Returns the brewery id given the brewery name"""
+        brewery_id = self._stored_name_id("brewery", (brewery_name,))
+        if brewery_id is None:
+            data = await self.brewery_search(brewery_name)
+            brewery_id = self._brewery_id_from_search(data)
+            self._store_name_id("brewery", (brewery_name,), brewery_id)
+        return brewery_id
+
+
+class AsyncUntappdFeed(AsyncUntappdAPI, UntappdFeed):
+    iter_friend_feed = _blocking_only("iter_friend_feed")
+    iter_user_feed = _blocking_only("iter_user_feed")
+    iter_venue_feed = _blocking_only("iter_venue_feed")
+    iter_beer_feed = _blocking_only("iter_beer_feed")
+    iter_brewery_feed = _blocking_only("iter_brewery_feed")
+
+    async def venue_feed_name(
+        self,
+        venue_name: str,
+        address: str,
+        min_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
+        """Returns the feed of a venue by name, see UntappdFeed.venue_feed_name"""
+        venue_id = str(await self._find_venue_id(venue_name, address))
+        return await self.venue_feed_id(venue_id, min_id, max_id, limit, model)
+
+    async def beer_feed_name(
+        self,
+        beer_name: str,
+        brewery_name: str,
+        min_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
+        """Returns the feed of a beer by name, see UntappdFeed.beer_feed_name"""
+        beer_id = str(await self._find_beer_id(beer_name, brewery_name))
+        return await self.beer_feed_id(beer_id, min_id, max_id, limit, model)
+
+    async def brewery_feed_name(
+        self,
+        brewery_name: str,
+        min_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
+        """Returns the feed of a brewery by name, see UntappdFeed.brewery_feed_name"""
+        brewery_id = str(await self._find_brewery_id(brewery_name))
+        return await self.brewery_feed_id(
+            brewery_id, min_id, max_id, limit=limit, model=model
+        )
+
+
+class AsyncUntappdGeneralInfo(AsyncUntappdAPI, UntappdGeneralInfo):
+    async def brewery_info_name(
+        self, brewery_name: str, compact: Optional[bool] = None, model: bool = False
+    ) -> Union[Dict, Brewery]:
+        """Returns the information of a brewery by name, see UntappdGeneralInfo.brewery_info_name"""
+        brewery_id = str(await self._find_brewery_id(brewery_name))
+        return await self.brewery_info_id(brewery_id, compact, model)
+
+    async def beer_info_name(
+        self,
+        beer_name: str,
+        brewery_name: str,
+        compact: Optional[bool] = None,
+        model: bool = False,
+    ) -> Union[Dict, Beer]:
+        """Returns the information of a beer by name, see UntappdGeneralInfo.beer_info_name"""
+        beer_id = str(await self._find_beer_id(beer_name, brewery_name))
+        return await self.beer_info_id(beer_id, compact, model)
+
+    async def venue_info_name(
+        self,
+        venue_name: str,
+        address: str,
+        compact: Optional[bool] = None,
+        model: bool = False,
+    ) -> Union[Dict, Venue]:
+        """Returns the information of a venue by name, see UntappdGeneralInfo.venue_info_name"""
+        venue_id = str(await self._find_venue_id(venue_name, address))
+        return await self.venue_info_id(venue_id, compact, model)
+
+    def brewery_info_many(
+        self,
+        brewery_ids: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> AsyncIterator[BatchResult]:
+        """Returns the information of many breweries, see UntappdGeneralInfo.brewery_info_many
+
+        Iterate it with ``async for``. At most max_workers lookups are in flight at once and
+        their results are yielded as they complete.
+        """
+        return run_batch_async(
+            lambda brewery_id: self.brewery_info_id(brewery_id, compact),
+            brewery_ids,
+            max_workers,
+        )
+
+    def beer_info_many(
+        self,
+        beer_ids: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> AsyncIterator[BatchResult]:
+        """Returns the information of many beers, see UntappdGeneralInfo.beer_info_many
+
+        Iterate it with ``async for``. At most max_workers lookups are in flight at once and
+        their results are yielded as they complete.
+        """
+        return run_batch_async(
+            lambda beer_id: self.beer_info_id(beer_id, compact), beer_ids, max_workers
+        )
+
+    def venue_info_many(
+        self,
+        venue_ids: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> AsyncIterator[BatchResult]:
+        """Returns the information of many venues, see UntappdGeneralInfo.venue_info_many
+
+        Iterate it with ``async for``. At most max_workers lookups are in flight at once and
+        their results are yielded as they complete.
+        """
+        return run_batch_async(
+            lambda venue_id: self.venue_info_id(venue_id, compact),
+            venue_ids,
+            max_workers,
+        )
+
+    def user_info_many(
+        self,
+        usernames: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> AsyncIterator[BatchResult]:
+        """Returns the information of many users, see UntappdGeneralInfo.user_info_many
+
+        Iterate it with ``async for``. At most max_workers lookups are in flight at once and
+        their results are yielded as they complete.
+        """
+        return run_batch_async(
+            lambda username: self.user_info(username, compact), usernames, max_workers
+        )
+
+
+class AsyncUntappdUserInfo(AsyncUntappdAPI, UntappdUserInfo):
+    iter_badges = _blocking_only("iter_badges")
+    iter_friends = _blocking_only("iter_friends")
+    iter_wishlist = _blocking_only("iter_wishlist")
+    iter_distinct_beers = _blocking_only("iter_distinct_beers")
+
+
+class AsyncUntappdFriends(AsyncUntappdAPI, UntappdFriends):
+    pass
+
+
+class AsyncUntappdUserActions(AsyncUntappdAPI, UntappdUserActions):
+    pass
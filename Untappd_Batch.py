@@ -0,0 +1,144 @@
+"""Concurrent batch lookups on a bounded thread pool, or on asyncio tasks"""
+
+import contextvars
+
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+
+
+class BatchResult(NamedTuple):
+    """The outcome of one lookup of a batch, with either its result or its error"""
+
+    key: str
+    result: Optional[Dict]
+    error: Optional[Exception]
+
+
+def _distinct(keys: Iterable) -> Iterator[str]:
+    """Internal generator of the keys as strings, skipping those already seen"""
+    seen = set()
+    for key in keys:
+        key = str(key)
+        if key not in seen:
+            seen.add(key)
+            yield key
+
+
+def run_batch(
+    lookup: Callable[[str], Dict], keys: Iterable, max_workers: int = 8
+) -> Iterator[BatchResult]:
+    """Runs a lookup for every distinct key on a thread pool, yielding results as they complete
+
+    Keys are deduplicated in order and submitted lazily, so at most twice max_workers lookups
+    are queued at once. A failed lookup is yielded with its error instead of stopping the
+    batch. Requests are still paced by the rate limiter of the client, if one is set, and
+    closing the iterator early cancels the lookups not yet started. Lookups run in a copy
+    of the context they are submitted from, so they keep any deadline.
+
+    Parameters
+    ----------
+    lookup: callable
+        Returns the response for a key
+    keys: iterable
+        The keys to look up
+    max_workers: int, default=8
+        The number of lookups to run at once
+
+    Returns
+    -------
+    An iterator of BatchResult, in order of completion
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    pending = _distinct(keys)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    running = {}
+
+    def submit() -> None:
+        while len(running) < 2 * max_workers:
+            key = next(pending, None)
+            if key is None:
+                return
+            context = contextvars.copy_context()
+            running[executor.submit(context.run, lookup, key)] = key
+
+    try:
+        submit()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    yield BatchResult(key, future.result(), None)
+                else:
+                    yield BatchResult(key, None, error)
+            submit()
+    finally:
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def run_batch_async(
+    lookup: Callable[[str], Awaitable[Dict]], keys: Iterable, max_workers: int = 8
+) -> AsyncIterator[BatchResult]:
+    """Awaits a lookup for every distinct key, yielding results as they complete, see run_batch
+
+    Keys are deduplicated in order and started lazily, so at most max_workers lookups are
+    in flight at once. A failed lookup is yielded with its error instead of stopping the
+    batch, and closing the iterator early, or cancelling the task iterating it, cancels the
+    lookups in flight. Lookups run as tasks in a copy of the current context, so they keep
+    any deadline.
+
+    Parameters
+    ----------
+    lookup: callable
+        Returns an awaitable of the response for a key
+    keys: iterable
+        The keys to look up
+    max_workers: int, default=8
+        The number of lookups to await at once
+
+    Returns
+    -------
+    An asynchronous iterator of BatchResult, in order of completion
+    """
+    import asyncio
+
+    pending = _distinct(keys)
+    running = {}
+
+    def submit() -> None:
+        while len(running) < max_workers:
+            key = next(pending, None)
+            if key is None:
+                return
+            running[asyncio.ensure_future(lookup(key))] = key
+
+    try:
+        submit()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            finished = [(running.pop(task), task) for task in done]
+            # Start the next lookups before handing over results, so none waits on the caller
+            submit()
+            for key, task in finished:
+                error = task.exception()
+                if error is None:
+                    yield BatchResult(key, task.result(), None)
+                else:
+                    yield BatchResult(key, None, error)
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
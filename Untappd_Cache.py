@@ -0,0 +1,282 @@
+"""In-memory response cache for Untappd API reads"""
+
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+# Seconds to keep a response for, by method prefix. Only methods with a TTL are cached
+DEFAULT_TTLS = {
+    "beer/info/": 3600.0,
+    "brewery/info/": 3600.0,
+    "venue/info/": 3600.0,
+    "venue/foursquare_lookup/": 86400.0,
+    "user/info/": 600.0,
+    "checkin/view/": 300.0,
+    "beer/trending": 300.0,
+    "search/": 3600.0,
+}
+
+# Methods which change data on Untappd and the cached method prefixes they make stale
+WRITE_INVALIDATIONS = {
+    "checkin/add": (
+        "checkin/recent",
+        "user/checkin/",
+        "user/info/",
+        "user/beers/",
+        "beer/info/",
+        "beer/checkins/",
+        "brewery/info/",
+        "brewery/checkins/",
+        "venue/info/",
+        "venue/checkins/",
+        "thepub/local",
+    ),
+    "checkin/addcomment/": ("checkin/view/",),
+    "checkin/deletecomment/": ("checkin/view/",),
+    "checkin/toast/": ("checkin/view/",),
+    "friend/": ("user/friends/", "user/pending", "user/info/"),
+    "user/wishlist/add": ("user/wishlist/", "beer/info/"),
+    "user/wishlist/delete": ("user/wishlist/", "beer/info/"),
+}
+
+
+def write_endpoint(method: str, endpoints) -> Optional[str]:
+    """Returns the endpoint of endpoints a write method is sent to, or None if it is not one
+
+    An endpoint ending in "/" takes an id and matches any method below it, such as
+    "checkin/toast/" matching "checkin/toast/1". Any other endpoint only matches itself or
+    the methods below it, so "user/wishlist/add" does not match the wishlist read
+    "user/wishlist/addison".
+
+    Parameters
+    ----------
+    method: str
+        Untappd API method
+    endpoints: iterable of str
+        The write endpoints, such as the keys of WRITE_INVALIDATIONS
+
+    Returns
+    -------
+    The endpoint matching the method
+    """
+    for endpoint in endpoints:
+        if endpoint.endswith("/"):
+            if method.startswith(endpoint):
+                return endpoint
+        elif method == endpoint or method.startswith(endpoint + "/"):
+            return endpoint
+    return None
+
+
+def is_write(method: str) -> bool:
+    """Returns whether an Untappd API method changes data on Untappd
+
+    Parameters
+    ----------
+    method: str
+        Untappd API method
+
+    Returns
+    -------
+    True if the method is a write
+    """
+    return write_endpoint(method, WRITE_INVALIDATIONS) is not None
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """A thread-safe TTL cache with LRU eviction for decoded GET responses
+
+        Responses are returned as the same object that was stored, so callers should not
+        mutate them.
+
+        Parameters
+        ----------
+        max_size: int, default=1024
+            The maximum number of responses to hold before evicting the least recently used
+        ttls: dict, default=None
+            Seconds to cache each method prefix for, such as {"beer/info/": 3600}. Methods
+            matching no prefix are never cached. Defaults to DEFAULT_TTLS
+        """
+        if max_size < 1:
+            raise ValueError(f"Cache max_size is {max_size} but must be at least 1")
+        self.max_size = max_size
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _longest_prefix(method: str, prefixes) -> Optional[str]:
+        """Internal function to find the longest prefix matching a method"""
+        match = None
+        for prefix in prefixes:
+            if method.startswith(prefix) and (
+                match is None or len(prefix) > len(match)
+            ):
+                match = prefix
+        return match
+
+    def ttl_for(self, method: str) -> Optional[float]:
+        """Returns the TTL of a method, or None if it is not cached
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+
+        Returns
+        -------
+        The number of seconds responses of this method are cached for
+        """
+        if is_write(method):
+            return None
+        prefix = self._longest_prefix(method, self.ttls)
+        if prefix is None:
+            return None
+        return self.ttls[prefix]
+
+    @staticmethod
+    def make_key(
+        method: str, auth: str, params: Optional[Dict], fields: Optional[Dict]
+    ) -> Hashable:
+        """Returns the cache key of a request, normalizing its auth scope and the order and types of its params
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        auth: str
+            URL encoding of Untappd API authorization tokens
+        params: dictionary
+            Params for the API request
+        fields: dictionary
+            Fields that we want returned from our request
+
+        Returns
+        -------
+        A hashable key of our request
+        """
+        if auth.startswith("client_id="):
+            # Every client key sees the same data, only user tokens have their own view
+            auth = "client_id"
+        return (
+            method,
+            auth,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            tuple(sorted((k, str(v)) for k, v in (fields or {}).items())),
+        )
+
+    def lookup(
+        self, method: str, auth: str, params: Optional[Dict], fields: Optional[Dict]
+    ) -> Tuple[Optional[Hashable], Optional[Dict]]:
+        """Looks up the cached response of a request
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        auth: str
+            URL encoding of Untappd API authorization tokens
+        params: dictionary
+            Params for the API request
+        fields: dictionary
+            Fields that we want returned from our request
+
+        Returns
+        -------
+        The cache key of the request, or None if the method is not cached, and the cached
+        response, or None on a miss
+        """
+        ttl = self.ttl_for(method)
+        if ttl is None:
+            return None, None
+        key = self.make_key(method, auth, params, fields)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return key, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        return key, None
+
+    def store(self, key: Hashable, response: Dict) -> None:
+        """Stores a response under a key returned by lookup
+
+        Parameters
+        ----------
+        key: hashable
+            The cache key of the request
+        response: dict
+            The decoded response of the request
+        """
+        ttl = self.ttl_for(key[0])
+        if ttl is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Removes cached responses
+
+        Parameters
+        ----------
+        prefix: str, default=None
+            Only remove responses of methods starting with this prefix (optional)
+
+        Returns
+        -------
+        The number of responses removed
+        """
+        with self._lock:
+            if prefix is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale = [key for key in self._entries if key[0].startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def invalidate_after(self, method: str) -> int:
+        """Removes the cached responses made stale by a write to Untappd
+
+        Parameters
+        ----------
+        method: str
+            The Untappd API method that was sent
+
+        Returns
+        -------
+        The number of responses removed
+        """
+        write = write_endpoint(method, WRITE_INVALIDATIONS)
+        if write is None:
+            return 0
+        return sum(self.invalidate(prefix) for prefix in WRITE_INVALIDATIONS[write])
+
+    def stats(self) -> Dict:
+        """Returns the hit, miss and eviction counters and the current size of the cache"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
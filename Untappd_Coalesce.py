@@ -0,0 +1,202 @@
+"""Coalescing of identical concurrent GET requests into a single request"""
+
+import asyncio
+import threading
+import time
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from Untappd_Cache import ResponseCache, is_write
+from Untappd_Deadline import expires_at
+from Untappd_Errors import UntappdDeadlineError
+
+
+class _Call:
+    def __init__(self) -> None:
+        """Internal record of a request in flight, shared by its waiters"""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    def __init__(self, task: "asyncio.Task") -> None:
+        """Internal record of a request in flight on an event loop and its waiters"""
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """Sends only one of any identical GET requests in flight at the same time
+
+        Requests are identical when their method, auth scope, params and fields match. The
+        first caller sends the request and every caller arriving while it is in flight
+        waits for it, up to its own deadline, and gets the same decoded response, or the
+        same error. Responses are shared, so callers should not mutate them. Writes are
+        never coalesced.
+
+        Works across threads through do and within an event loop through do_async.
+        """
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def coalesces(method: str) -> bool:
+        """Returns whether requests of a method may be coalesced
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+
+        Returns
+        -------
+        True unless the method is a write
+        """
+        return not is_write(method)
+
+    @staticmethod
+    def make_key(
+        method: str, auth: str, params: Optional[Dict], fields: Optional[Dict]
+    ) -> Hashable:
+        """Returns the key identifying a request, see ResponseCache.make_key"""
+        return ResponseCache.make_key(method, auth, params, fields)
+
+    @staticmethod
+    def _deadline_error(key: Hashable) -> UntappdDeadlineError:
+        """Internal function to return the error of a waiter whose deadline passed"""
+        method = key[0] if isinstance(key, tuple) and key else str(key)
+        return UntappdDeadlineError(
+            f"{method} did not complete before its deadline", method, sent=False
+        )
+
+    def do(
+        self,
+        key: Hashable,
+        fetch: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Calls fetch unless a call with the same key is in flight, then waits for that one
+
+        A waiter only waits until its own deadline, that of Untappd_Deadline or timeout,
+        whichever comes first, and then raises UntappdDeadlineError.
+
+        Parameters
+        ----------
+        key: hashable
+            The key of the request, see make_key
+        fetch: callable
+            Sends the request and returns its decoded response
+        args:
+            The arguments of fetch
+        timeout: float, default=None
+            The seconds the caller may wait, such as the timeout of its client (optional)
+
+        Returns
+        -------
+        The decoded response
+        """
+        expires = expires_at(timeout)
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            left = None if expires is None else max(expires - time.monotonic(), 0.0)
+            if not call.done.wait(left):
+                raise self._deadline_error(key)
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fetch(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fetch: Callable[..., Awaitable[Any]],
+        *args,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Awaits fetch unless a call with the same key is in flight on this loop, then awaits that one
+
+        The request runs in a task of its own, so a caller being cancelled or passing its
+        deadline leaves the others waiting for its result or error. The request is only
+        cancelled once every caller has given up on it.
+
+        Parameters
+        ----------
+        key: hashable
+            The key of the request, see make_key
+        fetch: callable
+            Coroutine function sending the request and returning its decoded response
+        args:
+            The arguments of fetch
+        timeout: float, default=None
+            The seconds the caller may wait, such as the timeout of its client (optional)
+
+        Returns
+        -------
+        The decoded response
+        """
+        expires = expires_at(timeout)
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            if call is None:
+                task = loop.create_task(fetch(*args))
+                call = self._async_calls[loop_key] = _AsyncCall(task)
+                task.add_done_callback(lambda _: self._forget(loop_key, call))
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+            call.waiters += 1
+        try:
+            if expires is None:
+                return await asyncio.shield(call.task)
+            left = max(expires - time.monotonic(), 0.0)
+            try:
+                return await asyncio.wait_for(asyncio.shield(call.task), left)
+            except asyncio.TimeoutError:
+                if call.task.done():
+                    raise
+                raise self._deadline_error(key) from None
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.task.done()
+            if abandoned:
+                call.task.cancel()
+
+    def _forget(self, loop_key: Tuple[int, Hashable], call: "_AsyncCall") -> None:
+        """Internal function to drop a finished async call, marking its error as retrieved"""
+        with self._lock:
+            if self._async_calls.get(loop_key) is call:
+                del self._async_calls[loop_key]
+        if not call.task.cancelled():
+            # In case every caller gave up before it failed
+            call.task.exception()
+
+    def stats(self) -> Dict:
+        """Returns the number of requests sent and the number coalesced into them"""
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced}
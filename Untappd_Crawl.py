@@ -0,0 +1,355 @@
+"""Resumable bulk crawls of paginated endpoints with checkpoints in SQLite
+
+A crawl is a manifest of work units, each an endpoint and the user, venue, beer or brewery
+it is walked for, such as ("user_feed", "someone"). CrawlRunner walks the units
+concurrently with the iterators of the clients, so requests are paced by their rate
+limiter, and hands every page of items to a sink. The pagination cursor of a unit is saved
+right after its page is handed over and before the next page is requested, so a crawl
+stopped at any point, by a crash, an interrupt or an exhausted quota, resumes with the
+next page not yet handed over and never requests a saved page again.
+"""
+
+import time
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from Untappd_Batch import BatchResult, run_batch
+from Untappd_Store import SQLiteStore
+
+# The endpoints units can walk, with the iterator method walking them and whether it
+# takes a page size
+ENDPOINTS = {
+    "user_feed": ("iter_user_feed", True),
+    "user_distinct_beers": ("iter_distinct_beers", False),
+    "user_wishlist": ("iter_wishlist", False),
+    "user_badges": ("iter_badges", False),
+    "user_friends": ("iter_friends", True),
+    "venue_feed": ("iter_venue_feed", True),
+    "beer_feed": ("iter_beer_feed", True),
+    "brewery_feed": ("iter_brewery_feed", True),
+}
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class CrawlStore(SQLiteStore):
+    schema = (
+        "CREATE TABLE IF NOT EXISTS crawl_units ("
+        "endpoint TEXT NOT NULL, entity_id TEXT NOT NULL, status TEXT NOT NULL, "
+        "cursor INTEGER, items INTEGER NOT NULL DEFAULT 0, "
+        "pages INTEGER NOT NULL DEFAULT 0, error TEXT, updated_at REAL NOT NULL, "
+        "PRIMARY KEY (endpoint, entity_id))",
+        "CREATE INDEX IF NOT EXISTS crawl_units_status ON crawl_units (status)",
+    )
+
+    def add(self, units: Iterable[Tuple[str, str]]) -> int:
+        """Adds work units to the crawl, leaving units already in it as they are
+
+        Parameters
+        ----------
+        units: iterable of tuples
+            The (endpoint, entity_id) of each unit, with an endpoint of ENDPOINTS
+
+        Returns
+        -------
+        The number of units added
+        """
+        rows = []
+        for endpoint, entity_id in units:
+            if endpoint not in ENDPOINTS:
+                raise ValueError(
+                    f"Endpoint is {endpoint} whereas only {', '.join(ENDPOINTS)} can be "
+                    "crawled"
+                )
+            rows.append((endpoint, str(entity_id), PENDING, time.time()))
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO crawl_units "
+                "(endpoint, entity_id, status, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def get(self, endpoint: str, entity_id: str) -> Optional[Dict]:
+        """Returns the state of a work unit, or None if it is not in the crawl
+
+        Parameters
+        ----------
+        endpoint: str
+            The endpoint of the unit
+        entity_id: str
+            The user, venue, beer or brewery of the unit
+
+        Returns
+        -------
+        A dictionary of the status, cursor, items, pages and error of the unit
+        """
+        row = (
+            self._connect()
+            .execute(
+                "SELECT status, cursor, items, pages, error FROM crawl_units "
+                "WHERE endpoint = ? AND entity_id = ?",
+                (endpoint, str(entity_id)),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return dict(zip(("status", "cursor", "items", "pages", "error"), row))
+
+    def pending(self, failed: bool = False) -> List[Tuple[str, str, Optional[int]]]:
+        """Returns the units still to crawl, in the order they were added
+
+        Parameters
+        ----------
+        failed: bool, default=False
+            Include the units which failed, to retry them from their last checkpoint
+
+        Returns
+        -------
+        A list of the (endpoint, entity_id, cursor) of each unit
+        """
+        statuses = (PENDING, FAILED if failed else PENDING)
+        return (
+            self._connect()
+            .execute(
+                "SELECT endpoint, entity_id, cursor FROM crawl_units "
+                "WHERE status IN (?, ?) ORDER BY rowid",
+                statuses,
+            )
+            .fetchall()
+        )
+
+    def checkpoint(
+        self,
+        endpoint: str,
+        entity_id: str,
+        cursor: Optional[int],
+        items: int,
+        pages: int,
+        done: bool = False,
+    ) -> None:
+        """Saves the cursor of a unit once pages of it have been handed over
+
+        Parameters
+        ----------
+        endpoint: str
+            The endpoint of the unit
+        entity_id: str
+            The user, venue, beer or brewery of the unit
+        cursor: int
+            The resume_token to continue the unit from
+        items: int
+            The number of items handed over since the last checkpoint
+        pages: int
+            The number of pages requested since the last checkpoint
+        done: bool, default=False
+            Whether the unit has been walked to its end
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE crawl_units SET status = ?, cursor = ?, items = items + ?, "
+                "pages = pages + ?, error = NULL, updated_at = ? "
+                "WHERE endpoint = ? AND entity_id = ?",
+                (
+                    DONE if done else PENDING,
+                    cursor,
+                    items,
+                    pages,
+                    time.time(),
+                    endpoint,
+                    str(entity_id),
+                ),
+            )
+
+    def fail(self, endpoint: str, entity_id: str, error: BaseException) -> None:
+        """Marks a unit as failed, keeping its last checkpoint
+
+        Parameters
+        ----------
+        endpoint: str
+            The endpoint of the unit
+        entity_id: str
+            The user, venue, beer or brewery of the unit
+        error: exception
+            The error the unit failed with
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE crawl_units SET status = ?, error = ?, updated_at = ? "
+                "WHERE endpoint = ? AND entity_id = ?",
+                (FAILED, repr(error), time.time(), endpoint, str(entity_id)),
+            )
+
+    def progress(self) -> Dict[str, int]:
+        """Returns the number of units, items and pages of the crawl by status
+
+        Returns
+        -------
+        A dictionary with the units pending, done and failed, and the items and pages
+        crawled so far
+        """
+        result = {PENDING: 0, DONE: 0, FAILED: 0, "items": 0, "pages": 0}
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT status, COUNT(*), SUM(items), SUM(pages) FROM crawl_units "
+                "GROUP BY status"
+            )
+            .fetchall()
+        )
+        for status, units, items, pages in rows:
+            result[status] = units
+            result["items"] += items or 0
+            result["pages"] += pages or 0
+        return result
+
+
+class CrawlRunner:
+    def __init__(
+        self,
+        clients: Sequence[Any],
+        store: CrawlStore,
+        sink: Callable[[str, str, List], None],
+        max_workers: int = 4,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> None:
+        """Walks the units of a crawl concurrently, checkpointing each unit after every page
+
+        Units run on a bounded thread pool, each walking its pages in order. Give the
+        clients a shared RateLimiter with set_rate_limiter so the workers together stay
+        within the quota. A unit failing, for instance on an exhausted quota, is marked
+        failed with its last checkpoint kept, and the other units carry on.
+
+        Parameters
+        ----------
+        clients: sequence of clients
+            The clients whose iterators walk the endpoints, such as an UntappdFeed and an
+            UntappdUserInfo, each endpoint using the first client which has its iterator
+        store: CrawlStore
+            The store of the units and their checkpoints
+        sink: callable
+            Called with the endpoint, the entity id and the items of each page, in order,
+            before the page's checkpoint is saved. A page is only handed over again if the
+            process stops between the sink returning and the checkpoint being saved
+        max_workers: int, default=4
+            The number of units walked at once
+        limit: int, default=None
+            The number of items requested per page, for the endpoints taking a page size
+            (optional)
+        model: bool, default=False
+            Hand models of Untappd_Models to the sink instead of dictionaries (optional)
+        """
+        self.clients = list(clients)
+        self.store = store
+        self.sink = sink
+        self.max_workers = max_workers
+        self.limit = limit
+        self.model = model
+
+    def _iterator(self, endpoint: str, entity_id: str, cursor: Optional[int]):
+        """Internal function to return the iterator walking a unit from its cursor"""
+        method, takes_limit = ENDPOINTS[endpoint]
+        for client in self.clients:
+            if hasattr(client, method):
+                kwargs = {"resume_token": cursor, "model": self.model}
+                if takes_limit and self.limit:
+                    kwargs["limit"] = self.limit
+                return getattr(client, method)(entity_id, **kwargs)
+        raise ValueError(f"None of the clients can crawl the endpoint {endpoint}")
+
+    def crawl(
+        self, endpoint: str, entity_id: str, cursor: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Walks one unit from a cursor to its end, checkpointing after every page
+
+        Parameters
+        ----------
+        endpoint: str
+            The endpoint of the unit
+        entity_id: str
+            The user, venue, beer or brewery of the unit
+        cursor: int, default=None
+            The checkpointed cursor to continue from, None to start at the first page
+
+        Returns
+        -------
+        A dictionary of the items and pages crawled
+        """
+        iterator = self._iterator(endpoint, entity_id, cursor)
+        fetch = iterator.fetch
+        page: List = []
+        totals = {"items": 0, "pages": 0}
+        fetched = 0
+
+        def save(done: bool) -> None:
+            nonlocal fetched
+            if page:
+                self.sink(endpoint, entity_id, list(page))
+            self.store.checkpoint(
+                endpoint, entity_id, iterator.resume_token, len(page), fetched, done
+            )
+            totals["items"] += len(page)
+            totals["pages"] += fetched
+            page.clear()
+            fetched = 0
+
+        def checkpointed_fetch(next_cursor: Optional[int]) -> Dict:
+            # Every item of the previous page has been yielded, so resume_token is the
+            # cursor of the page about to be requested
+            nonlocal fetched
+            if fetched:
+                save(False)
+            fetched += 1
+            return fetch(next_cursor)
+
+        iterator.fetch = checkpointed_fetch
+        try:
+            for item in iterator:
+                page.append(item)
+            save(True)
+        except Exception as e:
+            self.store.fail(endpoint, entity_id, e)
+            raise
+        return totals
+
+    def run(self, retry_failed: bool = False) -> Iterator[BatchResult]:
+        """Crawls every unit not yet done, yielding the outcome of each as it completes
+
+        Stopping the iteration, or the process, leaves every unit at its last checkpoint,
+        and running again continues from there.
+
+        Parameters
+        ----------
+        retry_failed: bool, default=False
+            Also crawl the units which failed, from their last checkpoint
+
+        Returns
+        -------
+        An iterator of BatchResult keyed "endpoint:entity_id", with the items and pages
+        crawled or the error of the unit
+        """
+        cursors = {
+            f"{endpoint}:{entity_id}": cursor
+            for endpoint, entity_id, cursor in self.store.pending(retry_failed)
+        }
+
+        def crawl(key: str) -> Dict[str, int]:
+            endpoint, entity_id = key.split(":", 1)
+            return self.crawl(endpoint, entity_id, cursors[key])
+
+        return run_batch(crawl, cursors, self.max_workers)
@@ -0,0 +1,108 @@
+"""Pools of Untappd API client keys to scale throughput past one key's rate limit"""
+
+import itertools
+import threading
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Untappd_Rate_Limit import RateLimiter
+
+
+class CredentialPool:
+    def __init__(
+        self,
+        credentials: Iterable[Tuple[str, str]],
+        limit: int = 100,
+        window: float = 3600.0,
+        burst: int = 5,
+        margin: float = 1.0,
+    ) -> None:
+        """A pool of client ids and secrets that unauthenticated requests rotate through
+
+        Every key, and every user access token a request is sent with, is paced by its own
+        RateLimiter. Each unauthenticated request takes the key that can send soonest, so
+        throughput grows with the number of keys. Requests made with a user's access token
+        keep that token and only draw on its budget.
+
+        Parameters
+        ----------
+        credentials: iterable
+            The (client_id, client_secret) pairs of the keys
+        limit: int, default=100
+            The number of requests allowed per window for each key or token until a response
+            reports the real limit
+        window: float, default=3600.0
+            The length of the rate limit window in seconds
+        burst: int, default=5
+            The number of requests each key may send back to back after an idle period
+        margin: float, default=1.0
+            Seconds each rate limiter waits past the end of a window, see RateLimiter
+        """
+        self.limit = limit
+        self.window = window
+        self.burst = burst
+        self.margin = margin
+        self._keys = [
+            "client_id=" + client_id + "&client_secret=" + client_secret
+            for client_id, client_secret in credentials
+        ]
+        if not self._keys:
+            raise ValueError(
+                "A credential pool needs at least one client id and secret"
+            )
+        self._rate_limiters = {
+            auth: RateLimiter(limit, window, burst, margin) for auth in self._keys
+        }
+        self._last_used = dict.fromkeys(self._keys, 0)
+        self._order = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> str:
+        """Returns the auth of the key that can send a request soonest
+
+        Returns
+        -------
+        URL encoding of the client id and secret
+        """
+        with self._lock:
+            auth = min(
+                self._keys,
+                key=lambda key: (self._rate_limiters[key].peek(), self._last_used[key]),
+            )
+            self._last_used[auth] = next(self._order)
+            return auth
+
+    def rate_limiter_for(self, auth: str) -> Optional[RateLimiter]:
+        """Returns the rate limiter pacing a key or user access token, creating it for new tokens
+
+        Parameters
+        ----------
+        auth: str
+            URL encoding of Untappd API authorization tokens
+
+        Returns
+        -------
+        The rate limiter of the credentials
+        """
+        with self._lock:
+            rate_limiter = self._rate_limiters.get(auth)
+            if rate_limiter is None:
+                rate_limiter = RateLimiter(
+                    self.limit, self.window, self.burst, self.margin
+                )
+                self._rate_limiters[auth] = rate_limiter
+            return rate_limiter
+
+    def state(self) -> List[Dict]:
+        """Returns the rate limiter state of every key and user access token"""
+        with self._lock:
+            rate_limiters = list(self._rate_limiters.items())
+        states = []
+        for auth, rate_limiter in rate_limiters:
+            state = rate_limiter.state()
+            if auth.startswith("client_id="):
+                state["client_id"] = auth.split("&", 1)[0][len("client_id=") :]
+            else:
+                state["access_token"] = auth[len("access_token=") :][:8] + "..."
+            states.append(state)
+        return states
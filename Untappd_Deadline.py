@@ -0,0 +1,87 @@
+"""Per-call deadlines for Untappd API requests
+
+A deadline bounds the total time of every request made inside it, including rate limit
+waits and retries:
+
+    with deadline(2.0):
+        client.beer_info_id("1")
+
+Deadlines are kept in a context variable, so they follow asyncio tasks and nest, with the
+earliest deadline winning.
+"""
+
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from Untappd_Errors import UntappdDeadlineError
+
+_expires_at: ContextVar[Optional[float]] = ContextVar("untappd_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Context manager bounding the time of the requests made inside it
+
+    Parameters
+    ----------
+    seconds: float
+        The time allowed, None for no deadline beyond the enclosing ones
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _expires_at.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _expires_at.set(expires_at)
+    try:
+        yield
+    finally:
+        _expires_at.reset(token)
+
+
+def expires_at(timeout: Optional[float] = None) -> Optional[float]:
+    """Returns the monotonic time the current call must finish by
+
+    Parameters
+    ----------
+    timeout: float, default=None
+        A deadline in seconds from now to apply as well, such as the client's (optional)
+
+    Returns
+    -------
+    The earliest of the deadlines, or None if there is none
+    """
+    current = _expires_at.get()
+    if timeout is None:
+        return current
+    own = time.monotonic() + timeout
+    return own if current is None else min(own, current)
+
+
+def time_left(expires: Optional[float], method: str) -> Optional[float]:
+    """Returns the seconds left before a deadline, raising UntappdDeadlineError once it passed
+
+    Parameters
+    ----------
+    expires: float
+        The monotonic time of the deadline, None for no deadline
+    method: str
+        Untappd API method of the request
+
+    Returns
+    -------
+    The seconds left, or None if there is no deadline
+    """
+    if expires is None:
+        return None
+    left = expires - time.monotonic()
+    if left <= 0:
+        raise UntappdDeadlineError(
+            f"{method} did not complete before its deadline", method, sent=False
+        )
+    return left
@@ -0,0 +1,174 @@
+"""Classified errors of Untappd API requests"""
+
+import time
+
+from typing import Dict, Mapping, Optional
+
+
+class UntappdError(Exception):
+    retryable = False
+
+    def __init__(
+        self,
+        message: str,
+        method: Optional[str] = None,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        sent: bool = True,
+    ) -> None:
+        """Base class of the errors raised for failed Untappd API requests
+
+        Parameters
+        ----------
+        message: str
+            A description of the error
+        method: str, default=None
+            The Untappd API method of the request (optional)
+        status: int, default=None
+            The HTTP status of the response, None if there was no response (optional)
+        retry_after: float, default=None
+            Seconds the server asked us to wait before trying again (optional)
+        sent: bool, default=True
+            Whether Untappd may have processed the request, False only when it certainly
+            did not
+        """
+        super().__init__(message)
+        self.method = method
+        self.status = status
+        self.retry_after = retry_after
+        self.sent = sent
+
+
+class UntappdClientError(UntappdError):
+    """The request was refused as invalid or unauthorized and should not be retried"""
+
+
+class UntappdRateLimitError(UntappdError):
+    """The rate limit of the key was spent, so the request was refused without processing"""
+
+    retryable = True
+
+
+class UntappdServerError(UntappdError):
+    """Untappd failed to process the request"""
+
+    retryable = True
+
+
+class UntappdDecodeError(UntappdError, ValueError):
+    """The response was not the JSON the API returns, usually an error page from a proxy"""
+
+    retryable = True
+
+
+class UntappdConnectionError(UntappdError):
+    """No response was received, because the connection failed or timed out"""
+
+    retryable = True
+
+
+class UntappdDeadlineError(UntappdError):
+    """The deadline of the call passed before it completed, see Untappd_Deadline"""
+
+
+class CircuitOpenError(UntappdError):
+    """The request was not sent because the circuit breaker of its endpoint is open"""
+
+
+def parse_header_int(headers: Optional[Mapping], name: str) -> Optional[int]:
+    """Returns the integer value of a header, such as X-Ratelimit-Remaining
+
+    Parameters
+    ----------
+    headers: mapping
+        The case-insensitive headers of the response
+    name: str
+        The name of the header
+
+    Returns
+    -------
+    The value, or None if the header is missing or is not an integer
+    """
+    if headers is None:
+        return None
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def parse_retry_after(headers: Optional[Mapping]) -> Optional[float]:
+    """Returns the seconds to wait given by the Retry-After or X-Ratelimit-Reset header
+
+    Parameters
+    ----------
+    headers: mapping
+        The case-insensitive headers of the response
+
+    Returns
+    -------
+    The delay in seconds, or None if neither header is set
+    """
+    if headers is None:
+        return None
+    value = headers.get("Retry-After")
+    if value is not None:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                return None
+    value = headers.get("X-Ratelimit-Reset")
+    if value is not None:
+        try:
+            reset = float(value)
+        except ValueError:
+            return None
+        # Large values are epoch timestamps, small ones a number of seconds
+        if reset > 1e9:
+            reset -= time.time()
+        return max(reset, 0.0)
+    return None
+
+
+def raise_for_response(
+    method: str, status: int, headers: Optional[Mapping], data: Optional[Dict]
+) -> None:
+    """Raises the classified error of a failed response
+
+    Parameters
+    ----------
+    method: str
+        Untappd API method
+    status: int
+        The HTTP status of the response
+    headers: mapping
+        The case-insensitive headers of the response
+    data: dictionary
+        The decoded response, None if it was not JSON
+    """
+    detail = None
+    if isinstance(data, dict):
+        meta = data.get("meta")
+        if isinstance(meta, dict):
+            detail = meta.get("error_detail")
+    message = f"{method} returned HTTP {status}" + (f": {detail}" if detail else "")
+    if status == 429:
+        raise UntappdRateLimitError(
+            message, method, status, parse_retry_after(headers), sent=False
+        )
+    if status >= 500:
+        raise UntappdServerError(message, method, status, parse_retry_after(headers))
+    if status >= 400:
+        raise UntappdClientError(message, method, status)
+    if data is None:
+        raise UntappdDecodeError(
+            f"{method} returned a response which is not JSON", method, status
+        )
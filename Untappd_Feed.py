@@ -1,8 +1,11 @@
 """Untappd API Feed Calls
 """
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Union
 
 from UntappdAPI import Dict, UntappdAPI
+from Untappd_Models import Checkin, checkin_models
+from Untappd_Pagination import MaxIdIterator
 
 
 class UntappdFeed(UntappdAPI):
@@ -10,8 +13,11 @@ class UntappdFeed(UntappdAPI):
         super().__init__(client_id, client_secret)
 
     def friend_feed(
-        self, max_id: Optional[str] = None, limit: Optional[int] = None
-    ) -> Dict:
+        self,
+        max_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the friends' check-in feed
 
         Parameters
@@ -20,10 +26,12 @@ class UntappdFeed(UntappdAPI):
             Check-in id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary of the friends' check-in feed
+        A dictionary of the friends' check-in feed, or a list of Checkin if model is True
         """
         method = "checkin/recent"
         auth = self._get_access_token()
@@ -32,11 +40,17 @@ class UntappdFeed(UntappdAPI):
             params["max_id"] = max_id
         if limit:
             params["limit"] = limit
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=checkin_models if model else None
+        )
 
     def user_feed(
-        self, username: str, max_id: Optional[int] = None, limit: Optional[int] = None
-    ) -> Dict:
+        self,
+        username: str,
+        max_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the check-in feed of a specific user
 
         Parameters
@@ -47,10 +61,12 @@ class UntappdFeed(UntappdAPI):
             Check-in id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary of a users' check-in feed
+        A dictionary of a users' check-in feed, or a list of Checkin if model is True
         """
         method = "user/checkin/" + username
         auth = self._get_api_auth_token()
@@ -59,17 +75,20 @@ class UntappdFeed(UntappdAPI):
             params["max_id"] = max_id
         if limit:
             params["limit"] = limit
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=checkin_models if model else None
+        )
 
     def pub_feed(
         self,
-        min_id: Optional[str],
-        lng: Optional[str],
-        lat: Optional[str],
-        radius: Optional[int],
-        max_id: Optional[int],
-        limit: Optional[int],
-    ) -> Dict:
+        min_id: Optional[str] = None,
+        lng: Optional[str] = None,
+        lat: Optional[str] = None,
+        radius: Optional[int] = None,
+        max_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the public feed of a location
 
         Parameters
@@ -86,10 +105,12 @@ class UntappdFeed(UntappdAPI):
             Checkin id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary of the public feed
+        A dictionary of the public feed, or a list of Checkin if model is True
         """
         method = "thepub/local"
         auth = self._get_api_auth_token()
@@ -106,7 +127,9 @@ class UntappdFeed(UntappdAPI):
             params["max_id"] = max_id
         if limit:
             params["limit"] = limit
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=checkin_models if model else None
+        )
 
     def venue_feed_id(
         self,
@@ -114,7 +137,8 @@ class UntappdFeed(UntappdAPI):
         min_id: Optional[int] = None,
         max_id: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> Dict:
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the feed of a venue by id
 
         Parameters
@@ -127,10 +151,12 @@ class UntappdFeed(UntappdAPI):
             Checkin id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary containing the feed of our venue_id
+        A dictionary containing the feed of our venue_id, or a list of Checkin if model is True
         """
         method = "venue/checkins/" + venue_id
         auth = self._get_api_auth_token()
@@ -141,7 +167,9 @@ class UntappdFeed(UntappdAPI):
             params["max_id"] = max_id
         if limit:
             params["limit"] = limit
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=checkin_models if model else None
+        )
 
     def venue_feed_name(
         self,
@@ -150,7 +178,8 @@ class UntappdFeed(UntappdAPI):
         min_id: Optional[int] = None,
         max_id: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> Dict:
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the feed of a venue by name
 
         Parameters
@@ -165,13 +194,15 @@ class UntappdFeed(UntappdAPI):
             Checkin id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary of the feed of our venue name
+        A dictionary of the feed of our venue name, or a list of Checkin if model is True
         """
         venue_id = str(self._find_venue_id(venue_name, address))
-        return self.venue_feed_id(venue_id, min_id, max_id, limit)
+        return self.venue_feed_id(venue_id, min_id, max_id, limit, model)
 
     def beer_feed_id(
         self,
@@ -179,7 +210,8 @@ class UntappdFeed(UntappdAPI):
         min_id: Optional[int] = None,
         max_id: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> Dict:
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the feed of a beer by id
 
         Parameters
@@ -192,10 +224,12 @@ class UntappdFeed(UntappdAPI):
             Checkin id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary containing the feed of our beer id
+        A dictionary containing the feed of our beer id, or a list of Checkin if model is True
         """
         method = "beer/checkins/" + beer_id
         auth = self._get_api_auth_token()
@@ -206,7 +240,9 @@ class UntappdFeed(UntappdAPI):
             params["max_id"] = max_id
         if limit:
             params["limit"] = limit
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=checkin_models if model else None
+        )
 
     def beer_feed_name(
         self,
@@ -215,7 +251,8 @@ class UntappdFeed(UntappdAPI):
         min_id: Optional[int] = None,
         max_id: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> Dict:
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the feed of a beer by name
 
         Parameters
@@ -230,13 +267,15 @@ class UntappdFeed(UntappdAPI):
             Checkin id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary containing the feed our beer name
+        A dictionary containing the feed our beer name, or a list of Checkin if model is True
         """
         beer_id = str(self._find_beer_id(beer_name, brewery_name))
-        return self.beer_feed_id(beer_id, min_id, max_id, limit)
+        return self.beer_feed_id(beer_id, min_id, max_id, limit, model)
 
     def brewery_feed_id(
         self,
@@ -244,7 +283,8 @@ class UntappdFeed(UntappdAPI):
         min_id: Optional[int] = None,
         max_id: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> Dict:
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the feed of a brewery by id
 
         Parameters
@@ -257,10 +297,12 @@ class UntappdFeed(UntappdAPI):
             Checkin id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
 
         Returns
         -------
-        A dictionary containing the feed of our brewery id
+        A dictionary containing the feed of our brewery id, or a list of Checkin if model is True
         """
         method = "brewery/checkins/" + brewery_id
         auth = self._get_api_auth_token()
@@ -271,7 +313,9 @@ class UntappdFeed(UntappdAPI):
             params["max_id"] = max_id
         if limit:
             params["limit"] = limit
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=checkin_models if model else None
+        )
 
     def brewery_feed_name(
         self,
@@ -279,7 +323,8 @@ class UntappdFeed(UntappdAPI):
         min_id: Optional[int] = None,
         max_id: Optional[int] = None,
         limit: Optional[int] = None,
-    ) -> Dict:
+        model: bool = False,
+    ) -> Union[Dict, List[Checkin]]:
         """Returns the feed of a brewery by name
 
         Parameters
@@ -292,10 +337,246 @@ class UntappdFeed(UntappdAPI):
             Checkin id the results will start with (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the check-ins as a list of Checkin models (optional)
+
+        Returns
+        -------
+        A dictionary of containing the feed of our brewery name, or a list of Checkin if model is True
+        """
+        brewery_id = str(self._find_brewery_id(brewery_name))
+        return self.brewery_feed_id(
+            brewery_id, min_id, max_id, limit=limit, model=model
+        )
+
+    def iter_friend_feed(
+        self,
+        limit: Optional[int] = None,
+        min_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> MaxIdIterator:
+        """Iterates over the friends' check-in feed one check-in at a time, newest first
+
+        Parameters
+        ----------
+        limit: int, default=None
+            Number of results to fetch per request (optional)
+        min_id: int, default=None
+            Stop at the first check-in whose id is at or below this watermark (optional)
+        until: datetime, default=None
+            Stop at the first check-in older than this (optional)
+        max_items: int, default=None
+            Stop after this many check-ins (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Checkin models instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of check-in dictionaries, or of Checkin if model is True
+        """
+        return MaxIdIterator(
+            lambda max_id: self.friend_feed(max_id, limit),
+            resume_token=resume_token,
+            prefetch=prefetch,
+            page_size=limit,
+            max_items=max_items,
+            until=until,
+            min_id=min_id,
+            model=Checkin.from_dict if model else None,
+        )
+
+    def iter_user_feed(
+        self,
+        username: str,
+        limit: Optional[int] = None,
+        min_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> MaxIdIterator:
+        """Iterates over the check-in feed of a specific user one check-in at a time, newest first
+
+        Parameters
+        ----------
+        username: str
+            The username of the user
+        limit: int, default=None
+            Number of results to fetch per request (optional)
+        min_id: int, default=None
+            Stop at the first check-in whose id is at or below this watermark (optional)
+        until: datetime, default=None
+            Stop at the first check-in older than this (optional)
+        max_items: int, default=None
+            Stop after this many check-ins (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Checkin models instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of check-in dictionaries, or of Checkin if model is True
+        """
+        return MaxIdIterator(
+            lambda max_id: self.user_feed(username, max_id, limit),
+            resume_token=resume_token,
+            prefetch=prefetch,
+            page_size=limit,
+            max_items=max_items,
+            until=until,
+            min_id=min_id,
+            model=Checkin.from_dict if model else None,
+        )
+
+    def iter_venue_feed(
+        self,
+        venue_id: str,
+        limit: Optional[int] = None,
+        min_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> MaxIdIterator:
+        """Iterates over the feed of a venue one check-in at a time, newest first
+
+        Parameters
+        ----------
+        venue_id: str
+            The id of the venue
+        limit: int, default=None
+            Number of results to fetch per request (optional)
+        min_id: int, default=None
+            Only return check-ins newer than this check-in id (optional)
+        until: datetime, default=None
+            Stop at the first check-in older than this (optional)
+        max_items: int, default=None
+            Stop after this many check-ins (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Checkin models instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of check-in dictionaries, or of Checkin if model is True
+        """
+        return MaxIdIterator(
+            lambda max_id: self.venue_feed_id(venue_id, min_id, max_id, limit),
+            resume_token=resume_token,
+            prefetch=prefetch,
+            page_size=limit,
+            max_items=max_items,
+            until=until,
+            min_id=min_id,
+            model=Checkin.from_dict if model else None,
+        )
+
+    def iter_beer_feed(
+        self,
+        beer_id: str,
+        limit: Optional[int] = None,
+        min_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> MaxIdIterator:
+        """Iterates over the feed of a beer one check-in at a time, newest first
+
+        Parameters
+        ----------
+        beer_id: str
+            The id of the beer
+        limit: int, default=None
+            Number of results to fetch per request (optional)
+        min_id: int, default=None
+            Only return check-ins newer than this check-in id (optional)
+        until: datetime, default=None
+            Stop at the first check-in older than this (optional)
+        max_items: int, default=None
+            Stop after this many check-ins (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Checkin models instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of check-in dictionaries, or of Checkin if model is True
+        """
+        return MaxIdIterator(
+            lambda max_id: self.beer_feed_id(beer_id, min_id, max_id, limit),
+            resume_token=resume_token,
+            prefetch=prefetch,
+            page_size=limit,
+            max_items=max_items,
+            until=until,
+            min_id=min_id,
+            model=Checkin.from_dict if model else None,
+        )
+
+    def iter_brewery_feed(
+        self,
+        brewery_id: str,
+        limit: Optional[int] = None,
+        min_id: Optional[int] = None,
+        until: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> MaxIdIterator:
+        """Iterates over the feed of a brewery one check-in at a time, newest first
+
+        Parameters
+        ----------
+        brewery_id: str
+            The id of the brewery
+        limit: int, default=None
+            Number of results to fetch per request (optional)
+        min_id: int, default=None
+            Only return check-ins newer than this check-in id (optional)
+        until: datetime, default=None
+            Stop at the first check-in older than this (optional)
+        max_items: int, default=None
+            Stop after this many check-ins (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Checkin models instead of dictionaries (optional)
 
         Returns
         -------
-        A dictionary of containing the feed of our brewery name
+        An iterator of check-in dictionaries, or of Checkin if model is True
         """
-        brewery_id = self._find_brewery_id(brewery_name)
-        return self.brewery_feed_id(brewery_id, min_id, max_id, limit=limit)
+        return MaxIdIterator(
+            lambda max_id: self.brewery_feed_id(brewery_id, min_id, max_id, limit),
+            resume_token=resume_token,
+            prefetch=prefetch,
+            page_size=limit,
+            max_items=max_items,
+            until=until,
+            min_id=min_id,
+            model=Checkin.from_dict if model else None,
+        )
@@ -0,0 +1,309 @@
+"""Conversion of check-in feeds and distinct beer lists into pandas DataFrames
+
+The converters take a response, a list of responses, an iterator such as
+`iter_user_feed(username)`, or models of Untappd_Models, and build every column in a
+single pass over the items without creating a dictionary per row. Columns are typed:
+ids as nullable integers, ratings and coordinates as floats, times as UTC datetimes and
+styles, breweries, venues, countries and cities as categoricals. pandas is only imported
+when a converter is first called.
+"""
+
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple
+
+from Untappd_Models import Beer, Checkin
+
+if TYPE_CHECKING:
+    import numpy
+    import pandas as pd
+
+# The format of Untappd's timestamps, such as "Mon, 01 Jan 2024 00:00:00 +0000"
+CREATED_AT_FORMAT = "%a, %d %b %Y %H:%M:%S %z"
+
+# The columns of check-in frames and their kinds
+CHECKIN_COLUMNS = (
+    ("checkin_id", "id"),
+    ("created_at", "datetime"),
+    ("rating_score", "float"),
+    ("checkin_comment", "string"),
+    ("uid", "id"),
+    ("user_name", "category"),
+    ("bid", "id"),
+    ("beer_name", "category"),
+    ("beer_style", "category"),
+    ("beer_abv", "float"),
+    ("beer_ibu", "float"),
+    ("brewery_id", "id"),
+    ("brewery_name", "category"),
+    ("country_name", "category"),
+    ("venue_id", "id"),
+    ("venue_name", "category"),
+    ("venue_city", "category"),
+    ("lat", "float"),
+    ("lng", "float"),
+)
+
+# The columns of distinct beer and wishlist frames and their kinds
+BEER_COLUMNS = (
+    ("bid", "id"),
+    ("beer_name", "category"),
+    ("beer_style", "category"),
+    ("beer_abv", "float"),
+    ("beer_ibu", "float"),
+    ("global_rating_score", "float"),
+    ("brewery_id", "id"),
+    ("brewery_name", "category"),
+    ("country_name", "category"),
+    ("rating_score", "float"),
+    ("count", "id"),
+    ("first_checkin_id", "id"),
+    ("first_created_at", "datetime"),
+    ("recent_created_at", "datetime"),
+    ("created_at", "datetime"),
+)
+
+_EMPTY: Dict = {}
+
+
+def _checkin_row(item: Any) -> Tuple:
+    """Internal function to return the values of a check-in in CHECKIN_COLUMNS order"""
+    if isinstance(item, Checkin):
+        user, beer, brewery, venue = item.user, item.beer, item.brewery, item.venue
+        return (
+            item.checkin_id,
+            item.created_at,
+            item.rating_score,
+            item.checkin_comment,
+            user and user.uid,
+            user and user.user_name,
+            beer and beer.bid,
+            beer and beer.beer_name,
+            beer and beer.beer_style,
+            beer and beer.beer_abv,
+            beer and beer.beer_ibu,
+            brewery and brewery.brewery_id,
+            brewery and brewery.brewery_name,
+            brewery and brewery.country_name,
+            venue and venue.venue_id,
+            venue and venue.venue_name,
+            venue and venue.city,
+            venue and venue.lat,
+            venue and venue.lng,
+        )
+    user = item.get("user") or _EMPTY
+    beer = item.get("beer") or _EMPTY
+    brewery = item.get("brewery") or _EMPTY
+    # Untappd sends an empty list for a check-in without a venue
+    venue = item.get("venue") or _EMPTY
+    location = venue.get("location") or _EMPTY
+    return (
+        item["checkin_id"],
+        item.get("created_at"),
+        item.get("rating_score"),
+        item.get("checkin_comment"),
+        user.get("uid"),
+        user.get("user_name"),
+        beer.get("bid"),
+        beer.get("beer_name"),
+        beer.get("beer_style"),
+        beer.get("beer_abv"),
+        beer.get("beer_ibu"),
+        brewery.get("brewery_id"),
+        brewery.get("brewery_name"),
+        brewery.get("country_name"),
+        venue.get("venue_id"),
+        venue.get("venue_name"),
+        location.get("venue_city"),
+        location.get("lat"),
+        location.get("lng"),
+    )
+
+
+def _beer_row(item: Any) -> Tuple:
+    """Internal function to return the values of a listed beer in BEER_COLUMNS order"""
+    if isinstance(item, Beer):
+        brewery = item.brewery
+        return (
+            item.bid,
+            item.beer_name,
+            item.beer_style,
+            item.beer_abv,
+            item.beer_ibu,
+            item.rating_score,
+            brewery and brewery.brewery_id,
+            brewery and brewery.brewery_name,
+            brewery and brewery.country_name,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+    beer = item.get("beer") or _EMPTY
+    brewery = item.get("brewery") or beer.get("brewery") or _EMPTY
+    return (
+        beer.get("bid"),
+        beer.get("beer_name"),
+        beer.get("beer_style"),
+        beer.get("beer_abv"),
+        beer.get("beer_ibu"),
+        beer.get("rating_score"),
+        brewery.get("brewery_id"),
+        brewery.get("brewery_name"),
+        brewery.get("country_name"),
+        item.get("rating_score"),
+        item.get("count"),
+        item.get("first_checkin_id"),
+        item.get("first_created_at"),
+        item.get("recent_created_at"),
+        item.get("created_at"),
+    )
+
+
+def _items(source: Any, path: Tuple[str, ...]) -> Iterable:
+    """Internal function to iterate over the items of a response, responses or items"""
+    if isinstance(source, dict):
+        source = (source,)
+    for element in source:
+        if isinstance(element, dict) and "response" in element:
+            items = element
+            for key in path:
+                items = (items or _EMPTY).get(key)
+            yield from items or ()
+        else:
+            yield element
+
+
+def checkin_rows(source: Any) -> Iterator[Tuple]:
+    """Returns an iterator over the check-ins of a source as tuples in CHECKIN_COLUMNS order
+
+    Parameters
+    ----------
+    source: dictionary, iterable of dictionaries or iterable of Checkin
+        Anything checkins_to_frame takes, consumed lazily
+    """
+    return map(_checkin_row, _items(source, ("response", "checkins", "items")))
+
+
+def beer_rows(source: Any) -> Iterator[Tuple]:
+    """Returns an iterator over the beers of a source as tuples in BEER_COLUMNS order
+
+    Parameters
+    ----------
+    source: dictionary, iterable of dictionaries or iterable of Beer
+        Anything beers_to_frame takes, consumed lazily
+    """
+    return map(_beer_row, _items(source, ("response", "beers", "items")))
+
+
+def _pandas():
+    """Internal function to import pandas, with a helpful error if it is not installed"""
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError(
+            "Converting to DataFrames requires pandas, install it with `pip install pandas` or "
+            "`pip install -r requirements.txt`"
+        ) from e
+    return pandas
+
+
+def _column(pd, values: "numpy.ndarray", kind: str):
+    """Internal function to build a typed column from the values of every row"""
+    if kind == "id":
+        mask = pd.isna(values)
+        if mask.any():
+            values = values.copy()
+            values[mask] = 0
+        return pd.arrays.IntegerArray(values.astype("int64"), mask)
+    if kind == "float":
+        return values.astype(float)
+    if kind == "datetime":
+        result = pd.to_datetime(values, format=CREATED_AT_FORMAT, utc=True)
+        # Timestamps are to the second, and pandas 2 picks the unit from the values
+        return result.as_unit("s") if hasattr(result, "as_unit") else result
+    if kind == "category":
+        return pd.Categorical(values)
+    return pd.array(values, dtype="string")
+
+
+def _frame(
+    rows: Iterable[Tuple], columns: Tuple[Tuple[str, str], ...]
+) -> "pd.DataFrame":
+    """Internal function to build a frame from rows"""
+    pd = _pandas()
+    import numpy
+
+    rows: List[Tuple] = list(rows)
+    table = numpy.empty((len(rows), len(columns)), dtype=object)
+    if rows:
+        table[:] = rows
+    # One contiguous array per column, each converted with a single vectorized call
+    table = numpy.ascontiguousarray(table.T)
+    return pd.DataFrame(
+        {name: _column(pd, table[i], kind) for i, (name, kind) in enumerate(columns)}
+    )
+
+
+def checkins_to_frame(source: Any) -> "pd.DataFrame":
+    """Returns the check-ins of a feed as a DataFrame with one row per check-in
+
+    Parameters
+    ----------
+    source: dictionary, iterable of dictionaries or iterable of Checkin
+        A feed response such as the one of user_feed, venue_feed_id, beer_feed_id,
+        brewery_feed_id or pub_feed, a list of such responses, an iterator of check-ins
+        such as iter_user_feed, or Checkin models
+
+    Returns
+    -------
+    A DataFrame with the columns of CHECKIN_COLUMNS
+    """
+    return _frame(checkin_rows(source), CHECKIN_COLUMNS)
+
+
+def beers_to_frame(source: Any) -> "pd.DataFrame":
+    """Returns the beers of distinct beer or wishlist lists as a DataFrame with one row per beer
+
+    The beer's own rating is in global_rating_score, and rating_score is the user's rating.
+
+    Parameters
+    ----------
+    source: dictionary, iterable of dictionaries or iterable of Beer
+        A response of user_distinct_beers or user_wishlist, a list of such responses, an
+        iterator such as iter_distinct_beers, or Beer models
+
+    Returns
+    -------
+    A DataFrame with the columns of BEER_COLUMNS
+    """
+    return _frame(beer_rows(source), BEER_COLUMNS)
+
+
+def to_frame(source: Any) -> "pd.DataFrame":
+    """Returns check-ins or beers as a DataFrame, depending on what the source holds
+
+    Parameters
+    ----------
+    source: dictionary, iterable of dictionaries or iterable of models
+        Anything checkins_to_frame or beers_to_frame take
+
+    Returns
+    -------
+    A DataFrame of check-ins or of beers
+    """
+    if isinstance(source, dict):
+        source = (source,)
+    source = iter(source)
+    first = next(source, None)
+    if first is None:
+        return checkins_to_frame(())
+    source = chain((first,), source)
+    if isinstance(first, Beer) or (
+        isinstance(first, dict)
+        and ("beers" in (first.get("response") or _EMPTY) or "beer" in first)
+        and "checkin_id" not in first
+    ):
+        return beers_to_frame(source)
+    return checkins_to_frame(source)
@@ -1,13 +1,28 @@
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, Optional, Union
 
 from UntappdAPI import UntappdAPI
+from Untappd_Batch import BatchResult, run_batch
+from Untappd_Models import (
+    Beer,
+    Brewery,
+    Checkin,
+    User,
+    Venue,
+    beer_model,
+    brewery_model,
+    checkin_model,
+    user_model,
+    venue_model,
+)
 
 
 class UntappdGeneralInfo(UntappdAPI):
     def __init__(self, client_id: str, client_secret: str) -> None:
         super().__init__(client_id, client_secret)
 
-    def brewery_info_id(self, brewery_id: str, compact: Optional[bool] = None) -> Dict:
+    def brewery_info_id(
+        self, brewery_id: str, compact: Optional[bool] = None, model: bool = False
+    ) -> Union[Dict, Brewery]:
         """Returns the information of a brewery
 
         Parameters
@@ -16,21 +31,25 @@ class UntappdGeneralInfo(UntappdAPI):
             The id of the brewery
         compact: bool, default=None
             Pass "true" to return a compact listing of the brewery (optional)
+        model: bool, default=False
+            Return a Brewery model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the brewery
+        A dictionary containing information about the brewery, or a Brewery if model is True
         """
         method = "brewery/info/" + brewery_id
         auth = self._get_api_auth_token()
         params = {}
         if compact:
             params["compact"] = compact
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=brewery_model if model else None
+        )
 
     def brewery_info_name(
-        self, brewery_name: str, compact: Optional[bool] = None
-    ) -> Dict:
+        self, brewery_name: str, compact: Optional[bool] = None, model: bool = False
+    ) -> Union[Dict, Brewery]:
         """Returns the information of a brewery by name
 
         Parameters
@@ -39,15 +58,19 @@ class UntappdGeneralInfo(UntappdAPI):
             The name of the brewery
         compact: bool, default=None
             Pass "true" to return a compact listing of the beer (optional)
+        model: bool, default=False
+            Return a Brewery model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the brewery
+        A dictionary containing information about the brewery, or a Brewery if model is True
         """
-        brewery_id = self._find_brewery_id(brewery_name)
-        return self.brewery_info_id(brewery_id, compact)
+        brewery_id = str(self._find_brewery_id(brewery_name))
+        return self.brewery_info_id(brewery_id, compact, model)
 
-    def beer_info_id(self, beer_id: str, compact: Optional[bool] = None) -> Dict:
+    def beer_info_id(
+        self, beer_id: str, compact: Optional[bool] = None, model: bool = False
+    ) -> Union[Dict, Beer]:
         """Returns the information of a beer by id
 
         Parameters
@@ -56,21 +79,27 @@ class UntappdGeneralInfo(UntappdAPI):
             The id of the beer
         compact: bool, default=None
             Pass "true" to return a compact listing of the beer (optional)
+        model: bool, default=False
+            Return a Beer model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the beer
+        A dictionary containing information about the beer, or a Beer if model is True
         """
         method = "beer/info/" + beer_id
         auth = self._get_api_auth_token()
         params = {}
         if compact:
             params["compact"] = compact
-        return self._do_get(method, auth, params)
+        return self._do_get(method, auth, params, model=beer_model if model else None)
 
     def beer_info_name(
-        self, beer_name: str, brewery_name: str, compact: Optional[bool] = None
-    ) -> Dict:
+        self,
+        beer_name: str,
+        brewery_name: str,
+        compact: Optional[bool] = None,
+        model: bool = False,
+    ) -> Union[Dict, Beer]:
         """Returns the information of a beer by name
 
         Parameters
@@ -81,15 +110,19 @@ class UntappdGeneralInfo(UntappdAPI):
             The name of the brewery that the beer was brewed at
         compact: bool, default=None
             Pass "true" to return a compact listing of the beer (optional)
+        model: bool, default=False
+            Return a Beer model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the beer
+        A dictionary containing information about the beer, or a Beer if model is True
         """
-        beer_id = self._find_beer_id(beer_name, brewery_name)
-        return self.beer_info_id(beer_id, compact)
+        beer_id = str(self._find_beer_id(beer_name, brewery_name))
+        return self.beer_info_id(beer_id, compact, model)
 
-    def venue_info_id(self, venue_id: str, compact: Optional[bool] = None) -> Dict:
+    def venue_info_id(
+        self, venue_id: str, compact: Optional[bool] = None, model: bool = False
+    ) -> Union[Dict, Venue]:
         """Returns the information of a venue by id
 
         Parameters
@@ -98,21 +131,27 @@ class UntappdGeneralInfo(UntappdAPI):
             The id of the venue
         compact: bool, default=None
             Pass "true" to return a compact listing of the venue (optional)
+        model: bool, default=False
+            Return a Venue model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the venue
+        A dictionary containing information about the venue, or a Venue if model is True
         """
         method = "venue/info/" + venue_id
         auth = self._get_api_auth_token()
         params = {}
         if compact:
             params["compact"] = compact
-        return self._do_get(method, auth, params)
+        return self._do_get(method, auth, params, model=venue_model if model else None)
 
     def venue_info_name(
-        self, venue_name: str, address: str, compact: Optional[bool] = None
-    ):
+        self,
+        venue_name: str,
+        address: str,
+        compact: Optional[bool] = None,
+        model: bool = False,
+    ) -> Union[Dict, Venue]:
         """Returns the information of a venue by name
 
         Parameters
@@ -123,31 +162,39 @@ class UntappdGeneralInfo(UntappdAPI):
             The street address of the venue
         compact: bool, default=None
             Pass "true" to return a compact listing of the venue (optional)
+        model: bool, default=False
+            Return a Venue model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the venue
+        A dictionary containing information about the venue, or a Venue if model is True
         """
-        venue_id = self._find_venue_id(venue_name, address)
-        return self.venue_info_id(venue_id, compact)
+        venue_id = str(self._find_venue_id(venue_name, address))
+        return self.venue_info_id(venue_id, compact, model)
 
-    def checkin_info(self, checkin_id: str) -> Dict:
+    def checkin_info(
+        self, checkin_id: str, model: bool = False
+    ) -> Union[Dict, Checkin]:
         """Returns the information of a checkin
 
         Parameters
         ----------
         checkin_id: str
             The id of the checkin
+        model: bool, default=False
+            Return a Checkin model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the check-in
+        A dictionary containing information about the check-in, or a Checkin if model is True
         """
         method = "checkin/view/" + checkin_id
         auth = self._get_api_auth_token()
-        return self._do_get(method, auth, {})
+        return self._do_get(method, auth, {}, model=checkin_model if model else None)
 
-    def user_info(self, username: str, compact: Optional[bool] = None) -> Dict:
+    def user_info(
+        self, username: str, compact: Optional[bool] = None, model: bool = False
+    ) -> Union[Dict, User]:
         """Returns the information of a user
 
         Parameters
@@ -156,14 +203,124 @@ class UntappdGeneralInfo(UntappdAPI):
             The username that the person goes by
         compact: bool, default=None
             Pass "true" to return a compact listing of the user (optional)
+        model: bool, default=False
+            Return a User model instead of the dictionary (optional)
 
         Returns
         -------
-        A dictionary containing information about the user
+        A dictionary containing information about the user, or a User if model is True
         """
         method = "user/info/" + username
         auth = self._get_api_auth_token()
         params = {}
         if compact:
             params["compact"] = compact
-        return self._do_get(method, auth, params)
+        return self._do_get(method, auth, params, model=user_model if model else None)
+
+    def brewery_info_many(
+        self,
+        brewery_ids: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> Iterator[BatchResult]:
+        """Returns the information of many breweries, fetched concurrently
+
+        Parameters
+        ----------
+        brewery_ids: iterable
+            The ids of the breweries, duplicates are only fetched once
+        compact: bool, default=None
+            Pass "true" to return a compact listing of the breweries (optional)
+        max_workers: int, default=8
+            The number of requests to run at once
+
+        Returns
+        -------
+        An iterator of BatchResult, holding the information or error of each brewery in
+        order of completion
+        """
+        return run_batch(
+            lambda brewery_id: self.brewery_info_id(brewery_id, compact),
+            brewery_ids,
+            max_workers,
+        )
+
+    def beer_info_many(
+        self,
+        beer_ids: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> Iterator[BatchResult]:
+        """Returns the information of many beers, fetched concurrently
+
+        Parameters
+        ----------
+        beer_ids: iterable
+            The ids of the beers, duplicates are only fetched once
+        compact: bool, default=None
+            Pass "true" to return a compact listing of the beers (optional)
+        max_workers: int, default=8
+            The number of requests to run at once
+
+        Returns
+        -------
+        An iterator of BatchResult, holding the information or error of each beer in order
+        of completion
+        """
+        return run_batch(
+            lambda beer_id: self.beer_info_id(beer_id, compact), beer_ids, max_workers
+        )
+
+    def venue_info_many(
+        self,
+        venue_ids: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> Iterator[BatchResult]:
+        """Returns the information of many venues, fetched concurrently
+
+        Parameters
+        ----------
+        venue_ids: iterable
+            The ids of the venues, duplicates are only fetched once
+        compact: bool, default=None
+            Pass "true" to return a compact listing of the venues (optional)
+        max_workers: int, default=8
+            The number of requests to run at once
+
+        Returns
+        -------
+        An iterator of BatchResult, holding the information or error of each venue in order
+        of completion
+        """
+        return run_batch(
+            lambda venue_id: self.venue_info_id(venue_id, compact),
+            venue_ids,
+            max_workers,
+        )
+
+    def user_info_many(
+        self,
+        usernames: Iterable[str],
+        compact: Optional[bool] = None,
+        max_workers: int = 8,
+    ) -> Iterator[BatchResult]:
+        """Returns the information of many users, fetched concurrently
+
+        Parameters
+        ----------
+        usernames: iterable
+            The usernames of the users, duplicates are only fetched once
+        compact: bool, default=None
+            Pass "true" to return a compact listing of the users (optional)
+        max_workers: int, default=8
+            The number of requests to run at once
+
+        Returns
+        -------
+        An iterator of BatchResult, holding the information or error of each user in order
+        of completion
+        """
+        return run_batch(
+            lambda username: self.user_info(username, compact), usernames, max_workers
+        )
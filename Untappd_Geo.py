@@ -0,0 +1,404 @@
+"""Coverage of whole areas with the local pub feed
+
+pub_feed answers for one circle of at most 25 miles and returns at most one page of the
+newest check-ins in it. cover_bbox and cover_polygon compute the circles covering an area:
+centers on a hexagonal lattice, the thinnest covering of the plane by equal circles, keeping
+only the circles which reach into the area, or a single circle for an area it spans.
+PubAreaFeed queries the circles concurrently, yields each check-in once however many
+circles overlap it, pages a circle whose page comes back full, meaning it may hold
+check-ins the page left out, and splits a circle still full after a few pages into seven
+circles of half its radius covering it, down to a radius of one mile.
+
+Distances are computed on a flat projection of the area around its middle, which is
+accurate to well under one percent for metro areas and regions a few hundred miles across.
+"""
+
+import contextvars
+import math
+
+from collections import deque
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from Untappd_Feed import UntappdFeed
+
+# The largest radius pub_feed takes, in miles
+MAX_RADIUS = 25
+
+_MILES_PER_DEGREE = 69.09
+
+# The offsets of the lattice tried along each axis when covering an area
+_OFFSETS = 4
+
+
+class Tile(NamedTuple):
+    """A circle queried with pub_feed, its radius in whole miles"""
+
+    lat: float
+    lng: float
+    radius: int
+
+
+def _polygon(area: Sequence) -> List[Tuple[float, float]]:
+    """Internal function to return an area as a polygon of (lat, lng) points
+
+    The area is either a (south, west, north, east) bounding box or a sequence of at least
+    three (lat, lng) points.
+    """
+    if len(area) == 4 and all(isinstance(value, (int, float)) for value in area):
+        south, west, north, east = area
+        if south >= north or west >= east:
+            raise ValueError(
+                "A bounding box is (south, west, north, east) with south below north "
+                "and west below east"
+            )
+        return [(south, west), (south, east), (north, east), (north, west)]
+    points = [(float(lat), float(lng)) for lat, lng in area]
+    if len(points) < 3:
+        raise ValueError("A polygon needs at least three (lat, lng) points")
+    return points
+
+
+class _Projection:
+    def __init__(self, lat: float, lng: float) -> None:
+        """Internal flat projection in miles around a point"""
+        self.lat = lat
+        self.lng = lng
+        self.scale = _MILES_PER_DEGREE * math.cos(math.radians(lat))
+
+    def to_xy(self, lat: float, lng: float) -> Tuple[float, float]:
+        return (lng - self.lng) * self.scale, (lat - self.lat) * _MILES_PER_DEGREE
+
+    def to_latlng(self, x: float, y: float) -> Tuple[float, float]:
+        return self.lat + y / _MILES_PER_DEGREE, self.lng + x / self.scale
+
+
+def _inside(x: float, y: float, polygon: List[Tuple[float, float]]) -> bool:
+    """Internal function to check whether a point is inside a polygon, by ray casting"""
+    result = False
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            result = not result
+        x1, y1 = x2, y2
+    return result
+
+
+def _distance_to_edges(x: float, y: float, polygon: List[Tuple[float, float]]) -> float:
+    """Internal function to return the distance from a point to the edges of a polygon"""
+    result = math.inf
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+        t = (
+            0.0
+            if length == 0
+            else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length))
+        )
+        result = min(result, math.hypot(x - x1 - t * dx, y - y1 - t * dy))
+        x1, y1 = x2, y2
+    return result
+
+
+def _reaches(
+    x: float, y: float, radius: float, polygon: List[Tuple[float, float]]
+) -> bool:
+    """Internal function to check whether a circle overlaps a polygon"""
+    return _inside(x, y, polygon) or _distance_to_edges(x, y, polygon) < radius
+
+
+class _Area:
+    def __init__(self, area: Sequence) -> None:
+        """Internal polygon of an area, projected to miles around its middle"""
+        points = _polygon(area)
+        lats = [lat for lat, _ in points]
+        lngs = [lng for _, lng in points]
+        self.projection = _Projection(
+            (min(lats) + max(lats)) / 2, (min(lngs) + max(lngs)) / 2
+        )
+        self.polygon = [self.projection.to_xy(lat, lng) for lat, lng in points]
+
+    def reaches(self, tile: Tile) -> bool:
+        """Whether a tile overlaps the area"""
+        x, y = self.projection.to_xy(tile.lat, tile.lng)
+        return _reaches(x, y, tile.radius, self.polygon)
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """Whether a point is inside the area"""
+        return _inside(*self.projection.to_xy(lat, lng), self.polygon)
+
+    def cover(self, radius: int) -> List[Tile]:
+        """The fewest tiles of the hexagonal coverings of the area tried"""
+        xs = [x for x, _ in self.polygon]
+        ys = [y for _, y in self.polygon]
+        middle = ((min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2)
+        if all(
+            math.hypot(x - middle[0], y - middle[1]) <= radius for x, y in self.polygon
+        ):
+            return [Tile(*self.projection.to_latlng(*middle), radius)]
+        # Rows 1.5 radii apart with centers sqrt(3) radii apart, every other row shifted
+        # by half that, leave no point further than radius from a center. How many of
+        # them reach into the area depends on where the lattice falls, so try a few
+        # offsets of it and keep the covering with the fewest
+        dx, dy = math.sqrt(3) * radius, 1.5 * radius
+        best: List[Tile] = []
+        for i in range(_OFFSETS):
+            for j in range(_OFFSETS):
+                centers = []
+                x0 = min(xs) - dx + i * dx / _OFFSETS
+                y = min(ys) - dy + j * dy / _OFFSETS
+                row = 0
+                while y < max(ys) + dy:
+                    x = x0 + (dx / 2 if row % 2 else 0.0)
+                    while x < max(xs) + dx:
+                        if _reaches(x, y, radius, self.polygon):
+                            centers.append((x, y))
+                        x += dx
+                    y += dy
+                    row += 1
+                if not best or len(centers) < len(best):
+                    best = centers
+        return [Tile(*self.projection.to_latlng(x, y), radius) for x, y in best]
+
+
+def cover_bbox(
+    south: float, west: float, north: float, east: float, radius: int = MAX_RADIUS
+) -> List[Tile]:
+    """Returns the circles covering a bounding box
+
+    Parameters
+    ----------
+    south: float
+        The latitude of the southern edge
+    west: float
+        The longitude of the western edge
+    north: float
+        The latitude of the northern edge
+    east: float
+        The longitude of the eastern edge
+    radius: int, default=25
+        The radius of the circles in miles, at most 25
+
+    Returns
+    -------
+    A list of Tile
+    """
+    return cover_polygon((south, west, north, east), radius)
+
+
+def cover_polygon(polygon: Sequence, radius: int = MAX_RADIUS) -> List[Tile]:
+    """Returns the circles covering a polygon
+
+    Parameters
+    ----------
+    polygon: sequence
+        The (lat, lng) points of the polygon, or a (south, west, north, east) bounding box
+    radius: int, default=25
+        The radius of the circles in miles, at most 25
+
+    Returns
+    -------
+    A list of Tile
+    """
+    if not 1 <= radius <= MAX_RADIUS:
+        raise ValueError(
+            f"Radius is {radius} whereas it must be from 1 to {MAX_RADIUS}"
+        )
+    return _Area(polygon).cover(int(radius))
+
+
+def split_tile(tile: Tile) -> List[Tile]:
+    """Returns seven circles of half the radius of a tile which cover it
+
+    One circle shares the center of the tile and the others are spread around it at
+    sqrt(3) / 2 of its radius, the thinnest covering of a circle by seven.
+
+    Parameters
+    ----------
+    tile: Tile
+        The tile to split, of a radius of at least 2 miles
+
+    Returns
+    -------
+    A list of Tile
+    """
+    if tile.radius < 2:
+        raise ValueError("A tile of a radius below 2 miles cannot be split")
+    radius = math.ceil(tile.radius / 2)
+    projection = _Projection(tile.lat, tile.lng)
+    tiles = [Tile(tile.lat, tile.lng, radius)]
+    distance = math.sqrt(3) / 2 * tile.radius
+    for i in range(6):
+        angle = math.pi / 6 + i * math.pi / 3
+        lat, lng = projection.to_latlng(
+            distance * math.cos(angle), distance * math.sin(angle)
+        )
+        tiles.append(Tile(lat, lng, radius))
+    return tiles
+
+
+class PubAreaFeed:
+    def __init__(
+        self,
+        client: UntappdFeed,
+        max_workers: int = 4,
+        limit: int = 25,
+        max_pages: int = 4,
+        min_radius: int = 1,
+    ) -> None:
+        """Collects the check-ins of the local pub feed over a whole area
+
+        A circle whose page comes back full is paged with max_id, below the oldest
+        check-in of the page. One still full after max_pages pages is busy, and is split
+        into seven circles of half its radius, which each start below the oldest
+        check-in the circle returned and so never return its check-ins again. Circles at
+        min_radius are only paged.
+
+        Parameters
+        ----------
+        client: UntappdFeed
+            The client querying pub_feed, best given a RateLimiter
+        max_workers: int, default=4
+            The number of circles queried at once
+        limit: int, default=25
+            The number of check-ins requested per circle, a circle returning this many
+            being split or paged
+        max_pages: int, default=4
+            The number of full pages of a circle before it is split, 1 to split circles
+            on their first full page. Paging costs a request per page whereas the seven
+            circles of a split overlap, but a feed which only pages so deep misses the
+            check-ins of busy circles paged rather than split
+        min_radius: int, default=1
+            The radius in miles below which full circles are paged rather than split,
+            the radius of the covering to only page
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.limit = limit
+        self.max_pages = max_pages
+        self.min_radius = min_radius
+        self.requests = 0
+        self.splits = 0
+        self.pages = 0
+        self.duplicates = 0
+
+    def _query(
+        self, tile: Tile, min_id: Optional[int], max_id: Optional[int]
+    ) -> List[Dict]:
+        """Internal function to return the check-ins of a circle, newest first"""
+        data = self.client.pub_feed(
+            min_id=min_id,
+            lng=f"{tile.lng:.6f}",
+            lat=f"{tile.lat:.6f}",
+            radius=tile.radius,
+            max_id=max_id,
+            limit=self.limit,
+        )
+        return ((data.get("response") or {}).get("checkins") or {}).get("items") or []
+
+    def checkins(
+        self,
+        area: Sequence,
+        radius: int = MAX_RADIUS,
+        min_id: Optional[int] = None,
+        clip: bool = True,
+    ) -> Iterator[Dict]:
+        """Yields the check-ins of an area, each once, as the circles covering it answer
+
+        Parameters
+        ----------
+        area: sequence
+            A (south, west, north, east) bounding box, or the (lat, lng) points of a polygon
+        radius: int, default=25
+            The radius in miles of the circles the area is first covered with
+        min_id: int, default=None
+            Only return check-ins newer than this one, for polling an area (optional)
+        clip: bool, default=True
+            Leave out the check-ins at venues outside the area, which the circles reaching
+            over its edges return
+
+        Returns
+        -------
+        An iterator of check-in dictionaries, stopped by the first error of a circle
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        region = _Area(area)
+        # The circles to query, with the max_id each starts from and its full pages
+        queries: Deque[Tuple[Tile, Optional[int], int]] = deque(
+            (tile, None, 0) for tile in cover_polygon(area, radius)
+        )
+        seen = set()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        running: Dict[Any, Tuple[Tile, int]] = {}
+        try:
+            while queries or running:
+                while queries and len(running) < self.max_workers:
+                    tile, max_id, pages = queries.popleft()
+                    # A copy of the context, so the query keeps any deadline
+                    context = contextvars.copy_context()
+                    future = executor.submit(
+                        context.run, self._query, tile, min_id, max_id
+                    )
+                    running[future] = (tile, pages)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile, pages = running.pop(future)
+                    items = future.result()
+                    self.requests += 1
+                    if items and len(items) >= self.limit:
+                        below = min(int(item["checkin_id"]) for item in items) - 1
+                        if (
+                            pages + 1 >= self.max_pages
+                            and tile.radius >= 2
+                            and math.ceil(tile.radius / 2) >= max(self.min_radius, 1)
+                        ):
+                            self.splits += 1
+                            queries.extend(
+                                (child, below, 0)
+                                for child in split_tile(tile)
+                                if region.reaches(child)
+                            )
+                        else:
+                            self.pages += 1
+                            queries.append((tile, below, pages + 1))
+                    for item in items:
+                        checkin_id = int(item["checkin_id"])
+                        if checkin_id in seen:
+                            self.duplicates += 1
+                            continue
+                        seen.add(checkin_id)
+                        location = (item.get("venue") or {}).get("location") or {}
+                        if (
+                            clip
+                            and location.get("lat") is not None
+                            and not region.contains(location["lat"], location["lng"])
+                        ):
+                            continue
+                        yield item
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the requests made, circles split and paged, and repeated check-ins
+
+        Repeated check-ins are those returned by more than one of the overlapping circles.
+        """
+        return {
+            "requests": self.requests,
+            "splits": self.splits,
+            "pages": self.pages,
+            "duplicates": self.duplicates,
+        }
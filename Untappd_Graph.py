@@ -0,0 +1,411 @@
+"""Breadth-first crawls of the friend graph with compact, resumable output
+
+FriendGraphCrawler walks user_friends breadth-first from seed users, expanding several
+users at once on a thread pool, so requests are paced by the client's rate limiter. Every
+user found is given a dense node id, in the order found, and kept in a NodeIndex, which
+stores 64-bit fingerprints of usernames rather than the names themselves. The graph is
+written to a directory as it grows:
+
+- nodes.tsv, one line per node id with its depth and username
+- edges.bin, the (user, friend) pairs of node ids as little-endian unsigned 32-bit integers
+- state.json, the checkpoint saved after every user expanded
+
+Breadth-first order means the frontier is the node ids from the next one to expand to the
+last one found, so only the frontier keeps usernames in memory, and the checkpoint only
+holds that id, the users being expanded and the lengths of the two files. A crawl stopped
+at any point truncates the files back to the checkpoint and continues from it.
+read_graph loads the graph as CSR arrays.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import sys
+import time
+
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional, Tuple
+
+from Untappd_Errors import UntappdClientError
+from Untappd_User_Info import UntappdUserInfo
+
+if TYPE_CHECKING:
+    import numpy
+
+NODES = "nodes.tsv"
+EDGES = "edges.bin"
+STATE = "state.json"
+
+# The array typecode of unsigned 32-bit integers on this platform
+_UINT32 = "I" if array("I").itemsize == 4 else "L"
+
+
+class NodeIndex:
+    def __init__(self, capacity: int = 1024) -> None:
+        """A compact map of usernames to dense node ids
+
+        Usernames are kept as 64-bit fingerprints in an open addressing table, about 24 to
+        48 bytes per username against well over 100 for a set of strings. Usernames are
+        case insensitive, as on Untappd. Two names sharing a fingerprint, which is
+        unlikely before billions of names, would be taken as the same user.
+
+        Parameters
+        ----------
+        capacity: int, default=1024
+            The number of slots to start with, grown as needed
+        """
+        size = 1
+        while size < capacity:
+            size *= 2
+        self._keys = array("Q", bytes(8 * size))
+        self._ids = array("I", bytes(4 * size))
+        self._mask = size - 1
+        self._size = 0
+
+    @staticmethod
+    def fingerprint(username: str) -> int:
+        """Returns the non-zero 64-bit fingerprint of a username"""
+        digest = hashlib.blake2b(
+            username.lower().encode("utf-8"), digest_size=8
+        ).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def _slot(self, key: int) -> int:
+        """Internal function to return the slot of a fingerprint, or the free one for it"""
+        keys, mask = self._keys, self._mask
+        slot = key & mask
+        while keys[slot] and keys[slot] != key:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _grow(self) -> None:
+        """Internal function to double the table"""
+        keys, ids = self._keys, self._ids
+        size = 2 * len(keys)
+        self._keys = array("Q", bytes(8 * size))
+        self._ids = array("I", bytes(4 * size))
+        self._mask = size - 1
+        for key, node in zip(keys, ids):
+            if key:
+                slot = self._slot(key)
+                self._keys[slot] = key
+                self._ids[slot] = node
+
+    def get(self, username: str) -> Optional[int]:
+        """Returns the node id of a username, None if it has not been added"""
+        slot = self._slot(self.fingerprint(username))
+        return self._ids[slot] if self._keys[slot] else None
+
+    def add(self, username: str) -> Tuple[int, bool]:
+        """Adds a username, giving it the next node id if it is new
+
+        Parameters
+        ----------
+        username: str
+            The username to add
+
+        Returns
+        -------
+        The node id of the username, and whether it was added
+        """
+        key = self.fingerprint(username)
+        slot = self._slot(key)
+        if self._keys[slot]:
+            return self._ids[slot], False
+        node = self._size
+        self._keys[slot] = key
+        self._ids[slot] = node
+        self._size += 1
+        if 2 * self._size > len(self._keys):
+            self._grow()
+        return node, True
+
+    def __contains__(self, username: str) -> bool:
+        return self.get(username) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class FriendGraphCrawler:
+    def __init__(
+        self,
+        client: UntappdUserInfo,
+        directory: str,
+        max_depth: Optional[int] = 2,
+        max_nodes: Optional[int] = None,
+        max_workers: int = 4,
+        limit: Optional[int] = 25,
+    ) -> None:
+        """Crawls the friend graph breadth-first from seed users into a directory
+
+        Opening a directory holding an earlier crawl resumes it. Seed users are added with
+        add_seeds and the crawl is run with run; close the crawler when done, or use it as
+        a context manager.
+
+        Parameters
+        ----------
+        client: UntappdUserInfo
+            The client fetching friend lists, best given a RateLimiter
+        directory: str
+            The directory of the graph, created if it does not exist
+        max_depth: int, default=2
+            The number of friend hops from the seeds to expand, the users found at that
+            depth being kept as nodes without being expanded, None for no limit
+        max_nodes: int, default=None
+            The number of users to keep, friends found beyond it being left out along with
+            their edges, None for no limit
+        max_workers: int, default=4
+            The number of users expanded at once
+        limit: int, default=25
+            The number of friends requested per page
+        """
+        self.client = client
+        self.directory = directory
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_workers = max_workers
+        self.limit = limit
+        self.index = NodeIndex()
+        self.expanded = 0
+        self.skipped = 0
+        self.edges = 0
+        # The (node, depth, username) of the users to expand, in node order, and of the
+        # users to expand again after an error
+        self._frontier: Deque[Tuple[int, int, str]] = deque()
+        self._retry: Deque[Tuple[int, int, str]] = deque()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, name: str) -> str:
+        """Internal function to return the path of a file of the graph"""
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> None:
+        """Internal function to resume from the checkpoint, or start an empty graph"""
+        state = {}
+        if os.path.exists(self._path(STATE)):
+            with open(self._path(STATE)) as f:
+                state = json.load(f)
+        for name, key in ((NODES, "nodes_bytes"), (EDGES, "edges_bytes")):
+            # Drop whatever was written after the checkpoint
+            with open(self._path(name), "ab") as f:
+                f.truncate(state.get(key, 0))
+        start = state.get("next", 0)
+        with open(self._path(NODES), encoding="utf-8") as f:
+            for line in f:
+                depth, username = line.rstrip("\n").split("\t", 1)
+                node, _ = self.index.add(username)
+                if node >= start and self._expandable(int(depth)):
+                    self._frontier.append((node, int(depth), username))
+        self._retry.extend(tuple(unit) for unit in state.get("pending", ()))
+        self.expanded = state.get("expanded", 0)
+        self.skipped = state.get("skipped", 0)
+        self.edges = state.get("edges_bytes", 0) // 8
+        self._nodes_file = open(self._path(NODES), "ab")
+        self._edges_file = open(self._path(EDGES), "ab")
+
+    def _expandable(self, depth: int) -> bool:
+        """Internal function to check whether users at a depth are expanded"""
+        return self.max_depth is None or depth < self.max_depth
+
+    def _checkpoint(self, pending: Iterable[Tuple[int, int, str]]) -> None:
+        """Internal function to save the state once the files are written"""
+        self._nodes_file.flush()
+        self._edges_file.flush()
+        state = {
+            "next": self._frontier[0][0] if self._frontier else len(self.index),
+            "pending": [list(unit) for unit in pending],
+            "expanded": self.expanded,
+            "skipped": self.skipped,
+            "nodes_bytes": self._nodes_file.tell(),
+            "edges_bytes": self._edges_file.tell(),
+            "updated_at": time.time(),
+        }
+        path = self._path(STATE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(path + ".tmp", path)
+
+    def _add_node(self, username: str, depth: int) -> Optional[int]:
+        """Internal function to add a user, returning None if it is left out by max_nodes"""
+        node = self.index.get(username)
+        if node is not None:
+            return node
+        if self.max_nodes is not None and len(self.index) >= self.max_nodes:
+            return None
+        node, _ = self.index.add(username)
+        self._nodes_file.write(f"{depth}\t{username}\n".encode("utf-8"))
+        if self._expandable(depth):
+            self._frontier.append((node, depth, username))
+        return node
+
+    def add_seeds(self, usernames: Iterable[str]) -> int:
+        """Adds users to start the crawl from, at depth 0
+
+        Parameters
+        ----------
+        usernames: iterable of str
+            The users, those already in the graph being left as they are
+
+        Returns
+        -------
+        The number of users added
+        """
+        before = len(self.index)
+        for username in usernames:
+            self._add_node(username, 0)
+        self._checkpoint(self._retry)
+        return len(self.index) - before
+
+    def friends(self, username: str) -> List[str]:
+        """Returns the usernames of every friend of a user, walking all the pages"""
+        return [
+            item["user"]["user_name"]
+            for item in self.client.iter_friends(username, limit=self.limit)
+        ]
+
+    def _expand(self, node: int, depth: int, friends: List[str]) -> None:
+        """Internal function to add the friends of an expanded user to the graph"""
+        edges = array(_UINT32)
+        for username in friends:
+            friend = self._add_node(username, depth + 1)
+            if friend is not None:
+                edges.append(node)
+                edges.append(friend)
+        # The edge file is little-endian whatever the host, as read_graph reads it
+        if sys.byteorder == "big":
+            edges.byteswap()
+        edges.tofile(self._edges_file)
+        self.edges += len(edges) // 2
+        self.expanded += 1
+
+    def _pop(self) -> Optional[Tuple[int, int, str]]:
+        """Internal function to return the next user to expand, None if there is none yet"""
+        if self._retry:
+            return self._retry.popleft()
+        if self._frontier:
+            return self._frontier.popleft()
+        return None
+
+    def run(self, max_expansions: Optional[int] = None) -> Dict[str, int]:
+        """Expands users breadth-first until the frontier is empty
+
+        A user whose friends cannot be fetched because of a client error, such as a
+        private profile, is skipped. Any other error stops the crawl after the users being
+        expanded finish, and is raised; running again retries the user.
+
+        Parameters
+        ----------
+        max_expansions: int, default=None
+            Stop after expanding this many users, to crawl in steps (optional)
+
+        Returns
+        -------
+        A dictionary of the nodes, edges, users expanded and skipped, and users left in
+        the frontier
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        running = {}
+        error = None
+        expansions = 0
+        try:
+            while True:
+                while (
+                    error is None
+                    and len(running) < self.max_workers
+                    and (max_expansions is None or expansions < max_expansions)
+                ):
+                    unit = self._pop()
+                    if unit is None:
+                        break
+                    # A copy of the context, so the expansion keeps any deadline
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, self.friends, unit[2])] = unit
+                    expansions += 1
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    unit = running.pop(future)
+                    try:
+                        self._expand(unit[0], unit[1], future.result())
+                    except UntappdClientError:
+                        self.skipped += 1
+                    except Exception as e:
+                        self._retry.append(unit)
+                        error = error or e
+                self._checkpoint(list(self._retry) + list(running.values()))
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=False)
+        if error is not None:
+            raise error
+        return self.stats()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the nodes, edges, users expanded and skipped, and users left to expand"""
+        frontier = len(self._retry) + len(self._frontier)
+        return {
+            "nodes": len(self.index),
+            "edges": self.edges,
+            "expanded": self.expanded,
+            "skipped": self.skipped,
+            "frontier": frontier,
+        }
+
+    def close(self) -> None:
+        """Closes the files of the graph"""
+        self._nodes_file.close()
+        self._edges_file.close()
+
+    def __enter__(self) -> "FriendGraphCrawler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_graph(
+    directory: str,
+) -> Tuple[List[str], "numpy.ndarray", "numpy.ndarray"]:
+    """Loads a crawled friend graph as compressed sparse row arrays
+
+    Only the part of the files covered by the last checkpoint is read.
+
+    Parameters
+    ----------
+    directory: str
+        The directory of the graph
+
+    Returns
+    -------
+    The usernames by node id, and the indptr and indices arrays: the friends of node i
+    are indices[indptr[i]:indptr[i + 1]]
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Reading graphs requires numpy, install it with `pip install numpy`"
+        ) from e
+    with open(os.path.join(directory, STATE)) as f:
+        state = json.load(f)
+    with open(os.path.join(directory, NODES), "rb") as f:
+        data = f.read(state["nodes_bytes"]).decode("utf-8")
+    names = [line.split("\t", 1)[1] for line in data.splitlines()]
+    edges = numpy.fromfile(
+        os.path.join(directory, EDGES),
+        dtype="<u4",
+        count=state["edges_bytes"] // 4,
+    ).reshape(-1, 2)
+    order = numpy.argsort(edges[:, 0], kind="stable")
+    indices = edges[order, 1]
+    indptr = numpy.zeros(len(names) + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(edges[:, 0], minlength=len(names)), out=indptr[1:])
+    return names, indptr, indices
@@ -0,0 +1,118 @@
+"""Hedged reads, which cut tail latency by racing a second copy of a slow request"""
+
+import math
+import threading
+
+from collections import deque
+from typing import Dict, Optional
+
+from Untappd_Cache import is_write
+from Untappd_Retry import method_template
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.01,
+        max_extra: float = 0.05,
+        min_samples: int = 20,
+        samples: int = 200,
+    ) -> None:
+        """Decides when to send a duplicate of a read which is taking longer than usual
+
+        Every endpoint keeps its recent latencies. Once a read has been in flight for the
+        given percentile of them, a copy is sent and whichever answers first is used, so
+        only the slowest few requests are duplicated. Writes are never hedged.
+
+        Parameters
+        ----------
+        percentile: float, default=95.0
+            The percentile of recent latencies after which a read is hedged
+        min_delay: float, default=0.01
+            The shortest time to wait before hedging in seconds
+        max_extra: float, default=0.05
+            The largest share of requests which may be duplicated, capping the extra load
+        min_samples: int, default=20
+            The number of latencies an endpoint needs before its reads are hedged
+        samples: int, default=200
+            The number of recent latencies kept per endpoint
+        """
+        if not 0 < percentile < 100:
+            raise ValueError(
+                f"Hedge percentile is {percentile} whereas it must be between 0 and 100"
+            )
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.samples = samples
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hedges(method: str) -> bool:
+        """Returns whether requests of a method may be hedged, which only reads may"""
+        return not is_write(method)
+
+    def delay(self, method: str) -> Optional[float]:
+        """Counts a request and returns how long to wait before hedging it
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+
+        Returns
+        -------
+        The delay in seconds, or None if the endpoint has too few latencies to hedge it
+        """
+        with self._lock:
+            self.requests += 1
+            latencies = self._latencies.get(method_template(method))
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        index = min(math.ceil(len(ordered) * self.percentile / 100.0), len(ordered)) - 1
+        return max(ordered[index], self.min_delay)
+
+    def try_hedge(self) -> bool:
+        """Takes a hedge from the extra load allowed, returning False if it is spent"""
+        with self._lock:
+            if self.hedged + 1 > self.max_extra * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    def observe(self, method: str, seconds: float, hedge: bool = False) -> None:
+        """Records the latency of a completed request
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        seconds: float
+            The time from sending the request to receiving its response
+        hedge: bool, default=False
+            Whether the response came from the hedged copy
+        """
+        template = method_template(method)
+        with self._lock:
+            latencies = self._latencies.get(template)
+            if latencies is None:
+                latencies = self._latencies[template] = deque(maxlen=self.samples)
+            latencies.append(seconds)
+            if hedge:
+                self.hedge_wins += 1
+
+    def stats(self) -> Dict:
+        """Returns the number of requests, the number hedged and the number won by the hedge"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+            }
@@ -0,0 +1,87 @@
+"""Pluggable decoders parsing JSON response bodies straight from bytes
+
+orjson and msgspec parse the body without first copying it into a str, and several times
+faster than the standard library, so the default decoder uses whichever of them is
+installed and falls back to the json module otherwise. Every decoder raises ValueError
+for a body which is not valid JSON, and the backends are only imported on first use.
+"""
+
+import json
+
+from typing import Any, Callable
+
+# Backends tried in order by the "auto" decoder
+BACKENDS = ("orjson", "msgspec", "json")
+
+_default = None
+
+
+def _orjson() -> Callable[[bytes], Any]:
+    """Internal function to return the orjson decoder"""
+    import orjson
+
+    # orjson.JSONDecodeError derives from ValueError
+    return orjson.loads
+
+
+def _msgspec() -> Callable[[bytes], Any]:
+    """Internal function to return the msgspec decoder"""
+    import msgspec
+
+    decode = msgspec.json.Decoder().decode
+
+    def loads(body: bytes) -> Any:
+        try:
+            return decode(body)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return loads
+
+
+def _json() -> Callable[[bytes], Any]:
+    """Internal function to return the standard library decoder"""
+    # json.loads detects the encoding of bytes itself, but still decodes them to a str
+    return json.loads
+
+
+_FACTORIES = {"orjson": _orjson, "msgspec": _msgspec, "json": _json}
+
+
+def get_decoder(backend: str = "auto") -> Callable[[bytes], Any]:
+    """Returns a function parsing a JSON body from bytes
+
+    Parameters
+    ----------
+    backend: str, default="auto"
+        "orjson", "msgspec" or "json", or "auto" for the first of them which is installed
+
+    Returns
+    -------
+    A function taking the bytes of a body and returning the decoded value
+    """
+    if backend == "auto":
+        for name in BACKENDS:
+            try:
+                return _FACTORIES[name]()
+            except ImportError:
+                continue
+    if backend not in _FACTORIES:
+        raise ValueError(
+            f"Unknown JSON backend {backend!r}, expected one of {', '.join(BACKENDS)} or auto"
+        )
+    try:
+        return _FACTORIES[backend]()
+    except ImportError as e:
+        raise ImportError(
+            f"The {backend} JSON backend is not installed, install it with "
+            f"`pip install {backend}` or `pip install -r requirements-speedups.txt`"
+        ) from e
+
+
+def default_decoder() -> Callable[[bytes], Any]:
+    """Returns the decoder used by clients without one set, the fastest backend installed"""
+    global _default
+    if _default is None:
+        _default = get_decoder("auto")
+    return _default
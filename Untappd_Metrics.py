@@ -0,0 +1,307 @@
+"""Per-endpoint latency, size, error and quota metrics of Untappd API requests
+
+Metrics are kept per method template, such as "beer/info/{id}", and can be exported in
+the Prometheus text format or streamed to listeners as they are recorded. A client
+without metrics pays a single attribute check per request.
+"""
+
+import bisect
+import threading
+
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+from Untappd_Errors import UntappdError, parse_header_int
+from Untappd_Retry import method_template
+
+# Upper bounds of the latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _EndpointMetrics:
+    def __init__(self, buckets: int) -> None:
+        """Internal record of the metrics of one endpoint"""
+        self.statuses = {}
+        self.bucket_counts = [0] * (buckets + 1)
+        self.latency_sum = 0.0
+        self.bytes = 0
+        self.decodes = 0
+        self.decode_seconds = 0.0
+        self.errors = {}
+        self.ratelimit_limit = None
+        self.ratelimit_remaining = None
+
+
+class Metrics:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Collects metrics of the requests of any number of clients
+
+        Parameters
+        ----------
+        buckets: sequence of float, default=DEFAULT_BUCKETS
+            The upper bounds of the latency histogram buckets in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._endpoints = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[Dict], None]) -> None:
+        """Adds a callback receiving every event as it is recorded
+
+        Events are dictionaries with an "event" of "response", "decode" or "error", the
+        "endpoint" and "method", and the values recorded. Listeners are called on the
+        thread making the request, so should return quickly.
+
+        Parameters
+        ----------
+        listener: callable
+            The callback
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict], None]) -> None:
+        """Removes a callback added with add_listener"""
+        self._listeners.remove(listener)
+
+    def _endpoint(self, template: str) -> _EndpointMetrics:
+        """Internal function to return the metrics of an endpoint, to be called holding the lock"""
+        endpoint = self._endpoints.get(template)
+        if endpoint is None:
+            endpoint = self._endpoints[template] = _EndpointMetrics(len(self.buckets))
+        return endpoint
+
+    def _emit(self, event: Dict) -> None:
+        """Internal function to pass an event to the listeners"""
+        for listener in self._listeners:
+            listener(event)
+
+    def observe_response(
+        self,
+        method: str,
+        status: int,
+        headers: Optional[Mapping],
+        size: int,
+        seconds: float,
+    ) -> None:
+        """Records a response received
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        status: int
+            The HTTP status of the response
+        headers: mapping
+            The case-insensitive headers of the response
+        size: int
+            The size of the body in bytes
+        seconds: float
+            The time from sending the request to receiving the whole response
+        """
+        template = method_template(method)
+        # Malformed headers are skipped rather than failing a request which succeeded
+        limit = parse_header_int(headers, "X-Ratelimit-Limit")
+        remaining = parse_header_int(headers, "X-Ratelimit-Remaining")
+        with self._lock:
+            endpoint = self._endpoint(template)
+            endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+            endpoint.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            endpoint.latency_sum += seconds
+            endpoint.bytes += size
+            if limit is not None:
+                endpoint.ratelimit_limit = limit
+            if remaining is not None:
+                endpoint.ratelimit_remaining = remaining
+        if self._listeners:
+            self._emit(
+                {
+                    "event": "response",
+                    "endpoint": template,
+                    "method": method,
+                    "status": status,
+                    "seconds": seconds,
+                    "bytes": size,
+                    "ratelimit_limit": limit,
+                    "ratelimit_remaining": remaining,
+                }
+            )
+
+    def observe_decode(self, method: str, seconds: float) -> None:
+        """Records the time taken to decode a response
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        seconds: float
+            The time taken to decode the JSON body
+        """
+        template = method_template(method)
+        with self._lock:
+            endpoint = self._endpoint(template)
+            endpoint.decodes += 1
+            endpoint.decode_seconds += seconds
+        if self._listeners:
+            self._emit(
+                {
+                    "event": "decode",
+                    "endpoint": template,
+                    "method": method,
+                    "seconds": seconds,
+                }
+            )
+
+    def observe_error(self, method: str, error: UntappdError) -> None:
+        """Records a failed request
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        error: UntappdError
+            The error the request failed with
+        """
+        template = method_template(method)
+        name = type(error).__name__
+        with self._lock:
+            endpoint = self._endpoint(template)
+            endpoint.errors[name] = endpoint.errors.get(name, 0) + 1
+        if self._listeners:
+            self._emit(
+                {
+                    "event": "error",
+                    "endpoint": template,
+                    "method": method,
+                    "error": name,
+                    "status": error.status,
+                }
+            )
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Returns the metrics of every endpoint
+
+        Returns
+        -------
+        A dictionary keyed on endpoint of its requests, statuses, latency histogram,
+        bytes, decode time, errors and last reported rate limit
+        """
+        with self._lock:
+            result = {}
+            for template, endpoint in self._endpoints.items():
+                requests = sum(endpoint.statuses.values())
+                result[template] = {
+                    "requests": requests,
+                    "statuses": dict(endpoint.statuses),
+                    "latency_buckets": dict(
+                        zip(self.buckets + (float("inf"),), endpoint.bucket_counts)
+                    ),
+                    "latency_mean": (
+                        endpoint.latency_sum / requests if requests else None
+                    ),
+                    "bytes": endpoint.bytes,
+                    "decode_seconds": endpoint.decode_seconds,
+                    "errors": dict(endpoint.errors),
+                    "ratelimit_limit": endpoint.ratelimit_limit,
+                    "ratelimit_remaining": endpoint.ratelimit_remaining,
+                }
+            return result
+
+    def to_prometheus(self, prefix: str = "untappd") -> str:
+        """Returns the metrics in the Prometheus text exposition format
+
+        Parameters
+        ----------
+        prefix: str, default="untappd"
+            The prefix of the metric names
+
+        Returns
+        -------
+        The metrics as text, ready to serve at a /metrics endpoint
+        """
+        lines = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            def family(name: str, kind: str, help_text: str) -> None:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+            family(
+                "requests_total", "counter", "Responses received by endpoint and status"
+            )
+            for template, endpoint in endpoints:
+                for status, count in sorted(endpoint.statuses.items()):
+                    labels = _labels(endpoint=template, status=status)
+                    lines.append(f"{prefix}_requests_total{labels} {count}")
+            family(
+                "request_duration_seconds",
+                "histogram",
+                "Time from sending a request to receiving its response",
+            )
+            for template, endpoint in endpoints:
+                cumulative = 0
+                bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, endpoint.bucket_counts):
+                    cumulative += count
+                    labels = _labels(endpoint=template, le=bound)
+                    lines.append(
+                        f"{prefix}_request_duration_seconds_bucket{labels} {cumulative}"
+                    )
+                labels = _labels(endpoint=template)
+                lines.append(
+                    f"{prefix}_request_duration_seconds_sum{labels} {_number(endpoint.latency_sum)}"
+                )
+                lines.append(
+                    f"{prefix}_request_duration_seconds_count{labels} {cumulative}"
+                )
+            family(
+                "response_bytes_total", "counter", "Bytes of response bodies received"
+            )
+            for template, endpoint in endpoints:
+                lines.append(
+                    f"{prefix}_response_bytes_total{_labels(endpoint=template)} {endpoint.bytes}"
+                )
+            family("decode_seconds", "summary", "Time spent decoding JSON responses")
+            for template, endpoint in endpoints:
+                labels = _labels(endpoint=template)
+                lines.append(
+                    f"{prefix}_decode_seconds_sum{labels} {_number(endpoint.decode_seconds)}"
+                )
+                lines.append(
+                    f"{prefix}_decode_seconds_count{labels} {endpoint.decodes}"
+                )
+            family(
+                "errors_total", "counter", "Failed requests by endpoint and error class"
+            )
+            for template, endpoint in endpoints:
+                for name, count in sorted(endpoint.errors.items()):
+                    labels = _labels(endpoint=template, error=name)
+                    lines.append(f"{prefix}_errors_total{labels} {count}")
+            for name, help_text in (
+                ("ratelimit_limit", "Last X-Ratelimit-Limit reported"),
+                ("ratelimit_remaining", "Last X-Ratelimit-Remaining reported"),
+            ):
+                family(name, "gauge", help_text)
+                for template, endpoint in endpoints:
+                    value = getattr(endpoint, name)
+                    if value is not None:
+                        lines.append(
+                            f"{prefix}_{name}{_labels(endpoint=template)} {value}"
+                        )
+        return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    """Internal function to format a number for the Prometheus text format"""
+    return repr(float(value))
+
+
+def _labels(**labels) -> str:
+    """Internal function to format Prometheus labels, escaping their values"""
+    pairs: List[str] = []
+    for name, value in labels.items():
+        value = (
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
@@ -0,0 +1,360 @@
+"""Typed models of check-ins, beers, breweries, venues, users and badges
+
+Pass `model=True` to the feed, info and user list methods, or to their iterators, to get
+these in place of nested dictionaries. Each model keeps only the commonly used fields in
+__slots__, so a check-in takes a fraction of the memory of its dictionary, and strings
+repeated across check-ins, such as styles, brewery names, countries and cities, are
+interned so every model holding them shares one copy.
+"""
+
+import sys
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from Untappd_Pagination import parse_created_at
+
+
+def _intern(value: Any) -> Any:
+    """Internal function to intern a string, leaving other values as they are"""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class _Model:
+    # The first of the __slots__ of every model is its Untappd id
+    __slots__ = ()
+
+    def to_dict(self) -> Dict:
+        """Returns the fields of the model as a dictionary, nested models included"""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            result[name] = value.to_dict() if isinstance(value, _Model) else value
+        return result
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __hash__(self) -> int:
+        # Equal models have equal ids, so hashing the id keeps models usable in sets and
+        # as dictionary keys
+        return hash((type(self), getattr(self, self.__slots__[0])))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Brewery(_Model):
+    __slots__ = (
+        "brewery_id",
+        "brewery_name",
+        "brewery_type",
+        "country_name",
+        "city",
+        "state",
+    )
+
+    def __init__(
+        self,
+        brewery_id: int,
+        brewery_name: str,
+        brewery_type: Optional[str] = None,
+        country_name: Optional[str] = None,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+    ) -> None:
+        """A brewery"""
+        self.brewery_id = brewery_id
+        self.brewery_name = _intern(brewery_name)
+        self.brewery_type = _intern(brewery_type)
+        self.country_name = _intern(country_name)
+        self.city = _intern(city)
+        self.state = _intern(state)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Brewery":
+        """Returns the model of a brewery dictionary of a response"""
+        location = data.get("location") or {}
+        return cls(
+            data["brewery_id"],
+            data.get("brewery_name"),
+            data.get("brewery_type"),
+            data.get("country_name"),
+            location.get("brewery_city"),
+            location.get("brewery_state"),
+        )
+
+
+class Beer(_Model):
+    __slots__ = (
+        "bid",
+        "beer_name",
+        "beer_style",
+        "beer_abv",
+        "beer_ibu",
+        "rating_score",
+        "brewery",
+    )
+
+    def __init__(
+        self,
+        bid: int,
+        beer_name: str,
+        beer_style: Optional[str] = None,
+        beer_abv: Optional[float] = None,
+        beer_ibu: Optional[int] = None,
+        rating_score: Optional[float] = None,
+        brewery: Optional[Brewery] = None,
+    ) -> None:
+        """A beer, with the brewery it was brewed at when the response includes it"""
+        self.bid = bid
+        self.beer_name = _intern(beer_name)
+        self.beer_style = _intern(beer_style)
+        self.beer_abv = beer_abv
+        self.beer_ibu = beer_ibu
+        self.rating_score = rating_score
+        self.brewery = brewery
+
+    @classmethod
+    def from_dict(cls, data: Dict, brewery: Optional[Dict] = None) -> "Beer":
+        """Returns the model of a beer dictionary of a response
+
+        Parameters
+        ----------
+        data: dictionary
+            The beer
+        brewery: dictionary, default=None
+            The brewery of the beer, when the response has it next to the beer rather than
+            inside it (optional)
+        """
+        brewery = brewery or data.get("brewery")
+        return cls(
+            data["bid"],
+            data.get("beer_name"),
+            data.get("beer_style"),
+            data.get("beer_abv"),
+            data.get("beer_ibu"),
+            data.get("rating_score"),
+            Brewery.from_dict(brewery) if brewery else None,
+        )
+
+
+class Venue(_Model):
+    __slots__ = (
+        "venue_id",
+        "venue_name",
+        "primary_category",
+        "address",
+        "city",
+        "state",
+        "country",
+        "lat",
+        "lng",
+    )
+
+    def __init__(
+        self,
+        venue_id: int,
+        venue_name: str,
+        primary_category: Optional[str] = None,
+        address: Optional[str] = None,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        country: Optional[str] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+    ) -> None:
+        """A venue"""
+        self.venue_id = venue_id
+        self.venue_name = _intern(venue_name)
+        self.primary_category = _intern(primary_category)
+        self.address = _intern(address)
+        self.city = _intern(city)
+        self.state = _intern(state)
+        self.country = _intern(country)
+        self.lat = lat
+        self.lng = lng
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Venue":
+        """Returns the model of a venue dictionary of a response"""
+        location = data.get("location") or {}
+        return cls(
+            data["venue_id"],
+            data.get("venue_name"),
+            data.get("primary_category"),
+            location.get("venue_address"),
+            location.get("venue_city"),
+            location.get("venue_state"),
+            location.get("venue_country"),
+            location.get("lat"),
+            location.get("lng"),
+        )
+
+
+class User(_Model):
+    __slots__ = ("uid", "user_name", "first_name", "last_name", "location")
+
+    def __init__(
+        self,
+        uid: int,
+        user_name: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> None:
+        """A user"""
+        self.uid = uid
+        self.user_name = _intern(user_name)
+        self.first_name = _intern(first_name)
+        self.last_name = _intern(last_name)
+        self.location = _intern(location)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "User":
+        """Returns the model of a user dictionary of a response"""
+        return cls(
+            data["uid"],
+            data.get("user_name"),
+            data.get("first_name"),
+            data.get("last_name"),
+            data.get("location"),
+        )
+
+
+class Badge(_Model):
+    __slots__ = ("badge_id", "badge_name", "created_at")
+
+    def __init__(
+        self, badge_id: int, badge_name: str, created_at: Optional[str] = None
+    ) -> None:
+        """A badge earned by a user"""
+        self.badge_id = badge_id
+        self.badge_name = _intern(badge_name)
+        self.created_at = created_at
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Badge":
+        """Returns the model of a badge dictionary of a response"""
+        return cls(data["badge_id"], data.get("badge_name"), data.get("created_at"))
+
+
+class Checkin(_Model):
+    __slots__ = (
+        "checkin_id",
+        "created_at",
+        "checkin_comment",
+        "rating_score",
+        "user",
+        "beer",
+        "brewery",
+        "venue",
+    )
+
+    def __init__(
+        self,
+        checkin_id: int,
+        created_at: str,
+        checkin_comment: Optional[str] = None,
+        rating_score: Optional[float] = None,
+        user: Optional[User] = None,
+        beer: Optional[Beer] = None,
+        brewery: Optional[Brewery] = None,
+        venue: Optional[Venue] = None,
+    ) -> None:
+        """A check-in, with None for a venue the check-in was not made at"""
+        self.checkin_id = checkin_id
+        self.created_at = created_at
+        self.checkin_comment = checkin_comment
+        self.rating_score = rating_score
+        self.user = user
+        self.beer = beer
+        self.brewery = brewery
+        self.venue = venue
+
+    @property
+    def created(self) -> datetime:
+        """The time of the check-in as a timezone aware datetime"""
+        return parse_created_at(self.created_at)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Checkin":
+        """Returns the model of a check-in dictionary of a response"""
+        user = data.get("user")
+        beer = data.get("beer")
+        brewery = data.get("brewery")
+        # Untappd sends an empty list for a check-in without a venue
+        venue = data.get("venue")
+        return cls(
+            data["checkin_id"],
+            data.get("created_at"),
+            data.get("checkin_comment"),
+            data.get("rating_score"),
+            User.from_dict(user) if user else None,
+            Beer.from_dict(beer) if beer else None,
+            Brewery.from_dict(brewery) if brewery else None,
+            Venue.from_dict(venue) if venue else None,
+        )
+
+
+def checkin_models(data: Dict) -> List[Checkin]:
+    """Returns the check-ins of a feed response as models"""
+    items = data["response"]["checkins"]["items"]
+    return [Checkin.from_dict(item) for item in items]
+
+
+def listed_beer_model(item: Dict) -> Beer:
+    """Returns a beer of a wishlist or distinct beers response as a model"""
+    return Beer.from_dict(item["beer"], item.get("brewery"))
+
+
+def listed_beer_models(data: Dict) -> List[Beer]:
+    """Returns the beers of a wishlist or distinct beers response as models"""
+    return [listed_beer_model(item) for item in data["response"]["beers"]["items"]]
+
+
+def friend_model(item: Dict) -> User:
+    """Returns a friend of a friends response as a model"""
+    return User.from_dict(item["user"])
+
+
+def friend_models(data: Dict) -> List[User]:
+    """Returns the friends of a friends response as models"""
+    return [friend_model(item) for item in data["response"]["items"]]
+
+
+def badge_models(data: Dict) -> List[Badge]:
+    """Returns the badges of a badges response as models"""
+    return [Badge.from_dict(item) for item in data["response"]["items"]]
+
+
+def beer_model(data: Dict) -> Beer:
+    """Returns the beer of a beer info response as a model"""
+    return Beer.from_dict(data["response"]["beer"])
+
+
+def brewery_model(data: Dict) -> Brewery:
+    """Returns the brewery of a brewery info response as a model"""
+    return Brewery.from_dict(data["response"]["brewery"])
+
+
+def venue_model(data: Dict) -> Venue:
+    """Returns the venue of a venue info response as a model"""
+    return Venue.from_dict(data["response"]["venue"])
+
+
+def user_model(data: Dict) -> User:
+    """Returns the user of a user info response as a model"""
+    return User.from_dict(data["response"]["user"])
+
+
+def checkin_model(data: Dict) -> Checkin:
+    """Returns the check-in of a check-in info response as a model"""
+    return Checkin.from_dict(data["response"]["checkin"])
@@ -0,0 +1,113 @@
+"""Persistent name to id resolution store for the *_name methods"""
+
+import time
+
+from typing import Any, Optional, Tuple
+
+from Untappd_Store import SQLiteStore
+
+
+class NameResolutionStore(SQLiteStore):
+    schema = (
+        "CREATE TABLE IF NOT EXISTS names ("
+        "kind TEXT NOT NULL, key TEXT NOT NULL, value, resolved_at REAL NOT NULL, "
+        "PRIMARY KEY (kind, key))",
+    )
+
+    def __init__(
+        self, path: str, max_age: Optional[float] = 30 * 86400.0, timeout: float = 30.0
+    ) -> None:
+        """An SQLite store mapping beer, brewery and venue names to their Untappd ids
+
+        The store can be shared by many threads and worker processes.
+
+        Parameters
+        ----------
+        path: str
+            The path of the SQLite database, created if it does not exist
+        max_age: float, default=30 days
+            Seconds after which a resolved id is stale and looked up again, None to never expire
+        timeout: float, default=30.0
+            Seconds to wait for another process holding the write lock
+        """
+        self.max_age = max_age
+        super().__init__(path, timeout)
+
+    @staticmethod
+    def _normalize(key: Tuple[str, ...]) -> str:
+        """Internal function to normalize case and whitespace of the names in a key"""
+        return "\x1f".join(" ".join(str(part).split()).casefold() for part in key)
+
+    def get(self, kind: str, key: Tuple[str, ...]) -> Optional[Any]:
+        """Returns the resolved id of a name, or None if unknown or stale
+
+        Parameters
+        ----------
+        kind: str
+            The kind of name, such as "beer", "brewery" or "venue"
+        key: tuple
+            The names identifying the entity, such as (beer_name, brewery_name)
+
+        Returns
+        -------
+        The id of our entity
+        """
+        row = (
+            self._connect()
+            .execute(
+                "SELECT value, resolved_at FROM names WHERE kind = ? AND key = ?",
+                (kind, self._normalize(key)),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        if self.max_age is not None and time.time() - row[1] > self.max_age:
+            return None
+        return row[0]
+
+    def put(self, kind: str, key: Tuple[str, ...], value: Any) -> None:
+        """Stores the resolved id of a name
+
+        Parameters
+        ----------
+        kind: str
+            The kind of name, such as "beer", "brewery" or "venue"
+        key: tuple
+            The names identifying the entity, such as (beer_name, brewery_name)
+        value: int or str
+            The id of our entity
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO names (kind, key, value, resolved_at) VALUES (?, ?, ?, ?)",
+                (kind, self._normalize(key), value, time.time()),
+            )
+
+    def invalidate(
+        self, kind: Optional[str] = None, key: Optional[Tuple[str, ...]] = None
+    ) -> int:
+        """Removes resolved ids
+
+        Parameters
+        ----------
+        kind: str, default=None
+            Only remove names of this kind (optional)
+        key: tuple, default=None
+            Only remove this name, requires kind (optional)
+
+        Returns
+        -------
+        The number of names removed
+        """
+        with self._connect() as conn:
+            if kind is None:
+                cursor = conn.execute("DELETE FROM names")
+            elif key is None:
+                cursor = conn.execute("DELETE FROM names WHERE kind = ?", (kind,))
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM names WHERE kind = ? AND key = ?",
+                    (kind, self._normalize(key)),
+                )
+            return cursor.rowcount
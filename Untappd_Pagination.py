@@ -0,0 +1,331 @@
+"""Iterators walking the paginated Untappd API endpoints one item at a time
+
+Only one page is held in memory at a time. Iteration stops at the end of the results or
+at the first item failing a stop condition, and resume_token always holds the cursor to
+pass back in to continue right after the last item yielded.
+"""
+
+import contextvars
+import queue
+import threading
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def parse_created_at(value: str) -> datetime:
+    """Parses an Untappd timestamp, such as "Sat, 17 Oct 2026 18:04:11 +0000"
+
+    Parameters
+    ----------
+    value: str
+        The timestamp of an Untappd item
+
+    Returns
+    -------
+    A timezone aware datetime
+    """
+    from email.utils import parsedate_to_datetime
+
+    parsed = parsedate_to_datetime(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _get_path(data: Dict, path: List[str]) -> Any:
+    """Internal function to look up a nested key, returning None if any part is missing"""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+class _PageFailure:
+    def __init__(self, error: BaseException) -> None:
+        """Internal wrapper carrying an exception raised while prefetching pages"""
+        self.error = error
+
+
+_DONE = object()
+
+
+class PageIterator:
+    def __init__(
+        self,
+        fetch: Callable[[Optional[int]], Dict],
+        items_path: List[str],
+        resume_token: Optional[int] = None,
+        max_items: Optional[int] = None,
+        until: Optional[datetime] = None,
+        date_key: str = "created_at",
+        prefetch: int = 0,
+        model: Optional[Callable[[Dict], Any]] = None,
+    ) -> None:
+        """Base class iterating over the items of a paginated endpoint
+
+        Parameters
+        ----------
+        fetch: callable
+            Returns the response of the page starting at a cursor, None for the first page
+        items_path: list
+            The keys leading to the list of items in a response
+        resume_token: int, default=None
+            The cursor to start from, taken from the resume_token of an earlier iterator
+        max_items: int, default=None
+            Stop after this many items (optional)
+        until: datetime, default=None
+            Stop at the first item older than this, naive datetimes are taken as UTC (optional)
+        date_key: str, default="created_at"
+            The key of the timestamp of an item compared against until
+        prefetch: int, default=0
+            The number of pages to fetch ahead on a background thread while the current page
+            is consumed, 0 to fetch each page only when it is needed
+        model: callable, default=None
+            Converts each item before it is yielded, such as into a model of Untappd_Models
+            (optional)
+        """
+        if until is not None and until.tzinfo is None:
+            until = until.replace(tzinfo=timezone.utc)
+        self.fetch = fetch
+        self.items_path = items_path
+        self.resume_token = resume_token
+        self.max_items = max_items
+        self.until = until
+        self.date_key = date_key
+        self.prefetch = prefetch
+        self.model = model
+        self.pages = 0
+        self.items = 0
+        self._iterator = self._iterate()
+
+    def __iter__(self) -> "PageIterator":
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._iterator)
+
+    def close(self) -> None:
+        """Stops iterating"""
+        self._iterator.close()
+
+    def _fetch_page(self, cursor: Optional[int]) -> Dict:
+        """Internal function to fetch the page starting at a cursor"""
+        self.pages += 1
+        return self.fetch(cursor)
+
+    def _pages(self) -> Iterator[Tuple[List[Dict], Iterable[int]]]:
+        """Internal generator of the items of each page and the cursor following each item"""
+        raise NotImplementedError
+
+    def _stop(self, item: Dict) -> bool:
+        """Internal function to check the stop conditions against an item"""
+        if self.until is not None:
+            created_at = item.get(self.date_key)
+            if created_at and parse_created_at(created_at) < self.until:
+                return True
+        return False
+
+    def _prefetched_pages(self) -> Iterator[Tuple[List[Dict], Iterable[int]]]:
+        """Internal generator of the pages of _pages, fetched ahead on a background thread
+
+        Stopping the generator cancels the thread, which drops the page it is fetching. The
+        thread runs in a copy of the current context, so it keeps any deadline.
+        """
+        pages = queue.Queue(maxsize=self.prefetch)
+        cancelled = threading.Event()
+
+        def put(page) -> bool:
+            while not cancelled.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for page in self._pages():
+                    if cancelled.is_set() or not put(page):
+                        return
+                put(_DONE)
+            except BaseException as e:
+                put(_PageFailure(e))
+
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(produce,),
+            name="untappd-prefetch",
+            daemon=True,
+        )
+        thread.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is _DONE:
+                    return
+                if isinstance(page, _PageFailure):
+                    raise page.error
+                yield page
+        finally:
+            cancelled.set()
+
+    def _iterate(self) -> Iterator[Any]:
+        if self.max_items is not None and self.max_items <= 0:
+            return
+        pages = self._prefetched_pages() if self.prefetch > 0 else self._pages()
+        for items, cursors in pages:
+            for item, cursor in zip(items, cursors):
+                if self._stop(item):
+                    return
+                self.resume_token = cursor
+                self.items += 1
+                yield item if self.model is None else self.model(item)
+                if self.max_items is not None and self.items >= self.max_items:
+                    return
+
+
+class MaxIdIterator(PageIterator):
+    def __init__(
+        self,
+        fetch: Callable[[Optional[int]], Dict],
+        items_path: List[str] = ("response", "checkins", "items"),
+        resume_token: Optional[int] = None,
+        max_items: Optional[int] = None,
+        until: Optional[datetime] = None,
+        min_id: Optional[int] = None,
+        id_key: str = "checkin_id",
+        prefetch: int = 0,
+        page_size: Optional[int] = None,
+        model: Optional[Callable[[Dict], Any]] = None,
+    ) -> None:
+        """Iterates over a feed paginated by max_id, newest item first
+
+        Parameters
+        ----------
+        fetch: callable
+            Returns the response of the page starting at a max_id, None for the newest page
+        items_path: list, default=["response", "checkins", "items"]
+            The keys leading to the list of items in a response
+        resume_token: int, default=None
+            The max_id to start from, taken from the resume_token of an earlier iterator
+        max_items: int, default=None
+            Stop after this many items (optional)
+        until: datetime, default=None
+            Stop at the first item older than this (optional)
+        min_id: int, default=None
+            Stop at the first item whose id is at or below this watermark (optional)
+        id_key: str, default="checkin_id"
+            The key of the id of an item
+        prefetch: int, default=0
+            The number of pages to fetch ahead on a background thread (optional)
+        page_size: int, default=None
+            The number of items requested per page, a shorter page is taken as the last one
+            (optional)
+        model: callable, default=None
+            Converts each item before it is yielded (optional)
+        """
+        super().__init__(
+            fetch,
+            list(items_path),
+            resume_token,
+            max_items,
+            until,
+            prefetch=prefetch,
+            model=model,
+        )
+        self.min_id = min_id
+        self.id_key = id_key
+        self.page_size = page_size
+
+    def _stop(self, item: Dict) -> bool:
+        if self.min_id is not None and int(item[self.id_key]) <= int(self.min_id):
+            return True
+        return super()._stop(item)
+
+    def _pages(self) -> Iterator[Tuple[List[Dict], Iterable[int]]]:
+        max_id = self.resume_token
+        while True:
+            data = self._fetch_page(max_id)
+            items = _get_path(data, self.items_path) or []
+            if not items:
+                return
+            yield items, [int(item[self.id_key]) - 1 for item in items]
+            if self.page_size is not None and len(items) < self.page_size:
+                return
+            next_max_id = _get_path(data, ["response", "pagination", "max_id"])
+            if not next_max_id:
+                next_max_id = int(items[-1][self.id_key]) - 1
+            next_max_id = int(next_max_id)
+            if next_max_id < 1 or (max_id is not None and next_max_id >= int(max_id)):
+                return
+            max_id = next_max_id
+
+
+class OffsetIterator(PageIterator):
+    def __init__(
+        self,
+        fetch: Callable[[Optional[int]], Dict],
+        items_path: List[str],
+        resume_token: Optional[int] = None,
+        max_items: Optional[int] = None,
+        until: Optional[datetime] = None,
+        date_key: str = "created_at",
+        prefetch: int = 0,
+        model: Optional[Callable[[Dict], Any]] = None,
+        page_size: Optional[int] = None,
+    ) -> None:
+        """Iterates over a list paginated by offset
+
+        Parameters
+        ----------
+        fetch: callable
+            Returns the response of the page starting at an offset, None for the first page
+        items_path: list
+            The keys leading to the list of items in a response
+        resume_token: int, default=None
+            The offset to start from, taken from the resume_token of an earlier iterator
+        max_items: int, default=None
+            Stop after this many items (optional)
+        until: datetime, default=None
+            Stop at the first item older than this, only meaningful for lists sorted newest
+            first (optional)
+        date_key: str, default="created_at"
+            The key of the timestamp of an item compared against until
+        prefetch: int, default=0
+            The number of pages to fetch ahead on a background thread (optional)
+        model: callable, default=None
+            Converts each item before it is yielded (optional)
+        page_size: int, default=None
+            The number of items per page, a shorter page is taken as the last one. Defaults
+            to the size of the first page, which also holds when the server caps the limit
+            asked for (optional)
+        """
+        super().__init__(
+            fetch,
+            list(items_path),
+            resume_token,
+            max_items,
+            until,
+            date_key,
+            prefetch,
+            model,
+        )
+        self.page_size = page_size
+
+    def _pages(self) -> Iterator[Tuple[List[Dict], Iterable[int]]]:
+        offset = self.resume_token or 0
+        page_size = self.page_size
+        while True:
+            data = self._fetch_page(offset or None)
+            items = _get_path(data, self.items_path) or []
+            if not items:
+                return
+            yield items, range(offset + 1, offset + len(items) + 1)
+            offset += len(items)
+            if page_size is None:
+                page_size = len(items)
+            elif len(items) < page_size:
+                return
@@ -0,0 +1,331 @@
+"""Columnar archives of check-in histories as partitioned Parquet files
+
+CheckinArchiveWriter consumes check-ins as they are paged in, from iterators such as
+`iter_user_feed(username)`, feed responses or models, and writes them to Parquet files in
+hive style partitions, by year of check-in unless told otherwise. Rows are buffered per
+partition and written out as a row group whenever a buffer is full, so memory is bounded by
+the row group size and number of open partitions however long the history is. Columns
+repeated across check-ins, such as styles, breweries, venues and cities, are dictionary
+encoded, and every row group keeps the minimum and maximum of each column.
+
+read_archive and open_archive read an archive back with column and predicate pushdown:
+only the columns asked for are read, row groups and partitions the filters rule out are
+skipped, and files are memory-mapped. pyarrow is only imported when an archive is first
+written or read.
+"""
+
+import os
+import uuid
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from Untappd_Frame import CHECKIN_COLUMNS, CREATED_AT_FORMAT, checkin_rows
+
+if TYPE_CHECKING:
+    import pyarrow
+    import pyarrow.dataset
+
+# Columns derived from created_at which check-ins can also be partitioned by
+DERIVED_PARTITIONS = ("year", "month")
+
+_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), 1
+    )
+}
+
+_CREATED_AT = [name for name, _ in CHECKIN_COLUMNS].index("created_at")
+
+
+def _pyarrow():
+    """Internal function to import pyarrow, with a helpful error if it is not installed"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet archives require pyarrow, install it with `pip install pyarrow` or "
+            "`pip install -r requirements-parquet.txt`"
+        ) from e
+    return pyarrow
+
+
+def checkin_schema() -> "pyarrow.Schema":
+    """Returns the Arrow schema of archived check-ins, the columns of CHECKIN_COLUMNS"""
+    pa = _pyarrow()
+    types = {
+        "id": pa.int64(),
+        "float": pa.float64(),
+        "datetime": pa.timestamp("s", tz="UTC"),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "string": pa.string(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in CHECKIN_COLUMNS])
+
+
+def _array(pa, values: Tuple, kind: str) -> "pyarrow.Array":
+    """Internal function to build a typed Arrow array from the values of a column"""
+    if kind == "id":
+        return pa.array(values, pa.int64())
+    if kind == "float":
+        return pa.array(values, pa.float64())
+    if kind == "datetime":
+        return pa.compute.strptime(
+            pa.array(values, pa.string()),
+            format=CREATED_AT_FORMAT,
+            unit="s",
+            error_is_null=True,
+        ).cast(pa.timestamp("s", tz="UTC"))
+    if kind == "category":
+        return pa.array(values, pa.string()).dictionary_encode()
+    return pa.array(values, pa.string())
+
+
+class CheckinArchiveWriter:
+    def __init__(
+        self,
+        root: str,
+        partition_by: Sequence[str] = ("year",),
+        row_group_size: int = 65536,
+        rows_per_file: int = 1048576,
+        max_open_partitions: int = 16,
+        compression: str = "zstd",
+    ) -> None:
+        """Writer appending check-ins to a partitioned Parquet archive
+
+        Every writer adds new files with a name of its own, so an archive is appended to by
+        writing into the same root again, from later runs or from several processes at
+        once. Use it as a context manager, or call close, so the last rows are written.
+
+        Parameters
+        ----------
+        root: str
+            The directory of the archive, created if it does not exist
+        partition_by: sequence of str, default=("year",)
+            The columns to partition by, of CHECKIN_COLUMNS or year and month of the
+            check-in, giving directories such as root/year=2024/. Pass () for none
+        row_group_size: int, default=65536
+            Rows buffered per partition before they are written as a row group
+        rows_per_file: int, default=1048576
+            Rows written to a file before the partition moves on to a new one
+        max_open_partitions: int, default=16
+            Partitions buffered and open at once, beyond which the least recently written
+            one is written out and its file closed, so memory stays under
+            max_open_partitions times row_group_size rows
+        compression: str, default="zstd"
+            The Parquet compression codec
+        """
+        names = [name for name, _ in CHECKIN_COLUMNS]
+        for column in partition_by:
+            if column not in names and column not in DERIVED_PARTITIONS:
+                raise ValueError(f"Cannot partition by unknown column {column}")
+        if row_group_size < 1 or rows_per_file < row_group_size:
+            raise ValueError(
+                "row_group_size must be positive and no larger than rows_per_file"
+            )
+        if max_open_partitions < 1:
+            raise ValueError("max_open_partitions must be positive")
+        self.root = root
+        self.partition_by = tuple(partition_by)
+        self.row_group_size = row_group_size
+        self.rows_per_file = rows_per_file
+        self.max_open_partitions = max_open_partitions
+        self.compression = compression
+        self.rows_written = 0
+        self._indexes = [
+            names.index(column) if column in names else column
+            for column in self.partition_by
+        ]
+        self._schema = checkin_schema()
+        self._name = uuid.uuid4().hex
+        self._buffers: Dict[Tuple, List[Tuple]] = {}
+        # The open writer of each partition and the rows written to it
+        self._writers: Dict[Tuple, Any] = {}
+        # Partitions with a buffer or an open writer, least recently written first
+        self._open: Dict[Tuple, None] = {}
+        self._file_rows: Dict[Tuple, int] = {}
+        self._files: Dict[Tuple, int] = defaultdict(int)
+        os.makedirs(root, exist_ok=True)
+
+    def _partition(self, row: Tuple) -> Tuple:
+        """Internal function to return the values of the partition columns of a row"""
+        if not self._indexes:
+            return ()
+        values = []
+        for index in self._indexes:
+            if index == "year" or index == "month":
+                # "Mon, 01 Jan 2024 00:00:00 +0000", read without parsing the whole time
+                parts = (row[_CREATED_AT] or "").split()
+                if len(parts) < 4:
+                    values.append(None)
+                elif index == "year":
+                    values.append(int(parts[3]))
+                else:
+                    values.append(_MONTHS.get(parts[2]))
+            else:
+                values.append(row[index])
+        return tuple(values)
+
+    def _directory(self, partition: Tuple) -> str:
+        """Internal function to return the directory of a partition"""
+        parts = [
+            # Hive's name for a missing value, which readers turn back into null
+            f"{column}="
+            + ("__HIVE_DEFAULT_PARTITION__" if value is None else quote(str(value), ""))
+            for column, value in zip(self.partition_by, partition)
+        ]
+        return os.path.join(self.root, *parts)
+
+    def _flush(self, partition: Tuple) -> None:
+        """Internal function to write the buffered rows of a partition as a row group"""
+        rows = self._buffers.pop(partition, None)
+        if not rows:
+            return
+        pa = _pyarrow()
+        columns = list(zip(*rows))
+        batch = pa.record_batch(
+            [
+                _array(pa, values, kind)
+                for values, (_, kind) in zip(columns, CHECKIN_COLUMNS)
+            ],
+            schema=self._schema,
+        )
+        writer = self._writers.get(partition)
+        if writer is None:
+            directory = self._directory(partition)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(
+                directory, f"part-{self._name}-{self._files[partition]:05d}.parquet"
+            )
+            self._files[partition] += 1
+            writer = pa.parquet.ParquetWriter(
+                path, self._schema, compression=self.compression
+            )
+            self._writers[partition] = writer
+            self._file_rows[partition] = 0
+        writer.write_batch(batch, row_group_size=self.row_group_size)
+        self._file_rows[partition] += len(rows)
+        self.rows_written += len(rows)
+        if self._file_rows[partition] >= self.rows_per_file:
+            self._writers.pop(partition).close()
+
+    def write(self, source: Any) -> int:
+        """Appends check-ins to the archive, consuming the source lazily
+
+        Parameters
+        ----------
+        source: dictionary, iterable of dictionaries or iterable of Checkin
+            A feed response, a list of responses, an iterator of check-ins such as
+            iter_user_feed, or Checkin models
+
+        Returns
+        -------
+        The number of check-ins taken from the source
+        """
+        count = 0
+        size = self.row_group_size
+        last: Any = None
+        buffer: List[Tuple] = []
+        for row in checkin_rows(source):
+            partition = self._partition(row)
+            if partition != last:
+                buffer = self._use(partition)
+                last = partition
+            buffer.append(row)
+            count += 1
+            if len(buffer) >= size:
+                self._flush(partition)
+                buffer = self._buffers[partition] = []
+        return count
+
+    def _use(self, partition: Tuple) -> List[Tuple]:
+        """Internal function to mark a partition as the most recently written one
+
+        Closes the least recently written partitions beyond max_open_partitions, and
+        returns the buffer of the partition.
+        """
+        self._open.pop(partition, None)
+        self._open[partition] = None
+        while len(self._open) > self.max_open_partitions:
+            self._close(next(iter(self._open)))
+        return self._buffers.setdefault(partition, [])
+
+    def _close(self, partition: Tuple) -> None:
+        """Internal function to write out a partition and close its file"""
+        self._flush(partition)
+        writer = self._writers.pop(partition, None)
+        if writer is not None:
+            writer.close()
+        self._open.pop(partition, None)
+
+    def flush(self) -> None:
+        """Writes the rows buffered in every partition, leaving the files open"""
+        for partition in list(self._buffers):
+            self._flush(partition)
+
+    def close(self) -> None:
+        """Writes the buffered rows and closes the files of the archive"""
+        for partition in list(self._open):
+            self._close(partition)
+
+    def __enter__(self) -> "CheckinArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_archive(root: str) -> "pyarrow.dataset.Dataset":
+    """Returns an archive as a pyarrow dataset, for scanning it lazily
+
+    Parameters
+    ----------
+    root: str
+        The directory of the archive
+
+    Returns
+    -------
+    A dataset with the columns of CHECKIN_COLUMNS and the partition columns
+    """
+    _pyarrow()
+    import pyarrow.dataset
+
+    return pyarrow.dataset.dataset(root, format="parquet", partitioning="hive")
+
+
+def read_archive(
+    root: str,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Any] = None,
+    memory_map: bool = True,
+) -> "pyarrow.Table":
+    """Reads check-ins of an archive, only the columns and row groups needed
+
+    Parameters
+    ----------
+    root: str
+        The directory of the archive
+    columns: sequence of str, default=None
+        The columns to read, every column if None (optional)
+    filters: list of tuples or pyarrow expression, default=None
+        Predicates such as [("year", ">=", 2023), ("beer_style", "=", "Stout - Imperial")],
+        which skip the partitions and row groups that cannot match (optional)
+    memory_map: bool, default=True
+        Whether to memory-map the files rather than read them
+
+    Returns
+    -------
+    A pyarrow Table, turned into a DataFrame with to_pandas()
+    """
+    pa = _pyarrow()
+    return pa.parquet.read_table(
+        root,
+        columns=list(columns) if columns is not None else None,
+        filters=filters,
+        memory_map=memory_map,
+        partitioning="hive",
+    )
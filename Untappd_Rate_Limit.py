@@ -0,0 +1,183 @@
+"""Rate limit aware request pacing for the Untappd API
+
+Untappd gives every key an hourly budget and reports it on each response through the
+X-Ratelimit-Limit and X-Ratelimit-Remaining headers. RateLimiter schedules requests so
+the remaining budget is spread evenly over the rest of the window, letting a client use
+its whole quota without ever being refused.
+"""
+
+import threading
+import time
+
+from typing import Callable, Dict, Mapping, Optional
+
+from Untappd_Errors import parse_header_int
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        limit: int = 100,
+        window: float = 3600.0,
+        burst: int = 5,
+        margin: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """A thread-safe token bucket pacing requests against the Untappd rate limit
+
+        Each request is given a send time one interval after the previous one, where the
+        interval is the time left in the window divided by the requests left in the budget.
+        Up to burst requests may be sent early after an idle period.
+
+        Parameters
+        ----------
+        limit: int, default=100
+            The number of requests allowed per window until a response reports the real limit
+        window: float, default=3600.0
+            The length of the rate limit window in seconds
+        burst: int, default=5
+            The number of requests that may be sent back to back after an idle period
+        margin: float, default=1.0
+            Seconds to wait past the modelled end of a window before spending the next
+            budget, allowing for the server's window starting a little later than ours
+        clock: callable, default=time.monotonic
+            The clock used for pacing, in seconds
+        """
+        self.limit = limit
+        self.window = window
+        self.burst = burst
+        self.margin = margin
+        self.clock = clock
+        self.remaining = limit
+        self.window_end = None
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self._anchored = False
+        self._next_send = None
+        self._window_start = None
+        self._stale_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _interval(self, start: float) -> float:
+        """Internal function to return the spacing of requests that spends the budget evenly"""
+        return max(self.window_end - start, 0.0) / max(self.remaining, 1)
+
+    def reserve(self) -> float:
+        """Reserves a request, returning the number of seconds to wait before sending it
+
+        Returns
+        -------
+        The delay in seconds
+        """
+        with self._lock:
+            now = self.clock()
+            if self.window_end is None:
+                self.window_end = now + self.window
+                self._next_send = now
+                self._window_start = now
+            send_at = max(self._next_send, now)
+            if send_at >= self.window_end or self.remaining < 1:
+                # Wait for the window to end if the budget is spent, then start a new one
+                send_at = max(send_at, self.window_end + self.margin)
+                self._window_start = send_at
+                self.window_end = send_at + self.window
+                self.remaining = self.limit
+                self._stale_in_flight += self.in_flight
+                self.in_flight = 0
+                self._anchored = False
+            interval = self._interval(send_at)
+            self._next_send = send_at + interval
+            # Bursts may not start before the window does, or the old budget is charged
+            send_at = max(
+                send_at - (self.burst - 1) * interval, self._window_start, now
+            )
+            self.remaining -= 1
+            self.in_flight += 1
+            self.requests += 1
+            wait = send_at - now
+            if wait > 0:
+                self.throttled += 1
+                self.waited += wait
+            return wait
+
+    def peek(self) -> float:
+        """Returns the number of seconds a request reserved now would wait, without reserving it"""
+        with self._lock:
+            now = self.clock()
+            if self.window_end is None:
+                return 0.0
+            send_at = max(self._next_send, now)
+            if send_at >= self.window_end or self.remaining < 1:
+                return max(send_at, self.window_end + self.margin) - now
+            interval = self._interval(send_at)
+            send_at = max(
+                send_at - (self.burst - 1) * interval, self._window_start, now
+            )
+            return send_at - now
+
+    def wait(self) -> None:
+        """Reserves a request and sleeps until it may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, headers: Optional[Mapping], status: int = 200) -> None:
+        """Updates the budget from the rate limit headers of a response
+
+        Parameters
+        ----------
+        headers: mapping
+            The case-insensitive headers of the response
+        status: int, default=200
+            The HTTP status of the response
+        """
+        with self._lock:
+            if self._stale_in_flight > 0:
+                # The response to a request of the previous window says nothing about this one
+                self._stale_in_flight -= 1
+                return
+            self.in_flight = max(self.in_flight - 1, 0)
+            now = self.clock()
+            if not self._anchored:
+                # The server's window started no later than its first response arrived
+                self.window_end = max(self.window_end, now + self.window)
+                self._anchored = True
+            # Malformed headers are skipped rather than failing a request which succeeded
+            limit = parse_header_int(headers, "X-Ratelimit-Limit")
+            if limit is not None:
+                self.limit = limit
+            remaining = parse_header_int(headers, "X-Ratelimit-Remaining")
+            if remaining is not None:
+                unreserved = remaining - self.in_flight
+                if unreserved > self.remaining + self.limit // 2:
+                    # The server started a new window before we expected
+                    self.window_end = now + self.window
+                self.remaining = unreserved
+            if status == 429:
+                self.remaining = 0
+
+    def release(self) -> None:
+        """Releases a reservation whose request got no response"""
+        with self._lock:
+            if self._stale_in_flight > 0:
+                self._stale_in_flight -= 1
+            else:
+                self.in_flight = max(self.in_flight - 1, 0)
+
+    def state(self) -> Dict:
+        """Returns a snapshot of the modelled budget and pacing counters"""
+        with self._lock:
+            now = self.clock()
+            window_end = self.window_end
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "in_flight": self.in_flight,
+                "window_reset_in": None if window_end is None else window_end - now,
+                "interval": None if window_end is None else self._interval(now),
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited": self.waited,
+            }
@@ -0,0 +1,312 @@
+"""Retries with jittered exponential backoff and per-endpoint circuit breakers
+
+A RetryPolicy decides whether and when a failed request is sent again. Reads are retried
+on any retryable error. Writes are only retried when Untappd certainly did not process
+them, such as after a 429 or a refused connection, unless they are idempotent, so a
+check-in, comment or toast is never posted twice.
+
+CircuitBreakers keep one breaker per endpoint. After failure_threshold consecutive server
+or connection failures a breaker opens and its requests fail fast with CircuitOpenError,
+until reset_timeout has passed and a single trial request succeeds.
+"""
+
+import random
+import threading
+import time
+
+from typing import Callable, Dict, Optional
+
+from Untappd_Cache import WRITE_INVALIDATIONS, is_write, write_endpoint
+from Untappd_Errors import (
+    CircuitOpenError,
+    UntappdConnectionError,
+    UntappdDeadlineError,
+    UntappdDecodeError,
+    UntappdError,
+    UntappdServerError,
+)
+
+# Writes which have the same effect when applied twice
+IDEMPOTENT_WRITES = (
+    "user/wishlist/add",
+    "user/wishlist/delete",
+    "friend/accept/",
+    "friend/reject/",
+    "friend/remove/",
+    "checkin/deletecomment/",
+)
+
+
+def method_template(method: str) -> str:
+    """Returns the endpoint of a method, with the id in its third path segment replaced by {id}
+
+    Parameters
+    ----------
+    method: str
+        Untappd API method, such as "beer/info/1"
+
+    Returns
+    -------
+    The endpoint, such as "beer/info/{id}"
+    """
+    # Writes without an id, such as "user/wishlist/add", are endpoints of their own
+    if method in WRITE_INVALIDATIONS:
+        return method
+    parts = method.split("/")
+    if len(parts) > 2:
+        parts[2] = "{id}"
+        del parts[3:]
+    return "/".join(parts)
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 60.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Decides whether and when to retry a failed request
+
+        Retries wait a random time up to base_delay * 2 ** (attempt - 1), capped at
+        max_delay. When the server says how long to wait, through Retry-After or
+        X-Ratelimit-Reset, the retry waits that long plus a little jitter, and is not made
+        at all if that is longer than max_delay.
+
+        Parameters
+        ----------
+        max_attempts: int, default=4
+            The number of times a request may be sent, including the first
+        base_delay: float, default=0.5
+            The backoff of the first retry in seconds
+        max_delay: float, default=60.0
+            The longest time to wait before a retry in seconds
+        rng: random.Random, default=None
+            The random number generator used for jitter (optional)
+        """
+        if max_attempts < 1:
+            raise ValueError(
+                f"Retry policy max_attempts is {max_attempts} whereas a request is sent at least once"
+            )
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._rng = rng or random.Random()
+
+    @staticmethod
+    def is_safe_to_retry(method: str, error: UntappdError) -> bool:
+        """Returns whether a failed request may be sent again without applying a write twice
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        error: UntappdError
+            The error the request failed with
+
+        Returns
+        -------
+        True if the error is retryable and the method is a read, an idempotent write or was
+        certainly not processed
+        """
+        if not error.retryable:
+            return False
+        if not is_write(method) or not error.sent:
+            return True
+        return write_endpoint(method, IDEMPOTENT_WRITES) is not None
+
+    def delay(self, method: str, attempt: int, error: UntappdError) -> Optional[float]:
+        """Returns the seconds to wait before retrying a failed request, or None to give up
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        attempt: int
+            The number of times the request has been sent
+        error: UntappdError
+            The error the request failed with
+
+        Returns
+        -------
+        The delay in seconds, or None if the request should not be retried
+        """
+        if attempt >= self.max_attempts or not self.is_safe_to_retry(method, error):
+            return None
+        if error.retry_after is not None:
+            if error.retry_after > self.max_delay:
+                return None
+            delay = error.retry_after + self._rng.uniform(0.0, self.base_delay)
+        else:
+            backoff = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+            delay = self._rng.uniform(0.0, backoff)
+        self.retries += 1
+        return delay
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """A circuit breaker for one endpoint, see CircuitBreakers
+
+        Parameters
+        ----------
+        failure_threshold: int, default=5
+            The number of consecutive failures which open the breaker
+        reset_timeout: float, default=30.0
+            Seconds an open breaker fails fast before letting a trial request through
+        clock: callable, default=time.monotonic
+            The clock used for timing, in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def counts(error: UntappdError) -> bool:
+        """Returns whether an error is a sign of the endpoint being degraded
+
+        Client errors and rate limiting are answers from a healthy server, so only server,
+        connection and decode errors count.
+        """
+        return isinstance(
+            error, (UntappdServerError, UntappdConnectionError, UntappdDecodeError)
+        )
+
+    def before_request(self, method: str) -> None:
+        """Raises CircuitOpenError if a request may not be sent now
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+        """
+        with self._lock:
+            if self.state == "closed":
+                return
+            wait = self.opened_at + self.reset_timeout - self.clock()
+            if wait <= 0 and not self._trial:
+                self.state = "half_open"
+                self._trial = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError(
+            f"{method} is not sent while the circuit breaker of {method_template(method)} is open",
+            method,
+            retry_after=max(wait, 0.0),
+            sent=False,
+        )
+
+    def record_success(self) -> None:
+        """Records a request which succeeded, closing the breaker"""
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial = False
+
+    def record_failure(self, error: UntappdError) -> None:
+        """Records a request which failed, opening the breaker after enough failures
+
+        Parameters
+        ----------
+        error: UntappdError
+            The error the request failed with
+        """
+        if isinstance(error, CircuitOpenError):
+            return
+        if isinstance(error, UntappdDeadlineError):
+            # Our own deadline says nothing about the endpoint
+            self.release()
+            return
+        with self._lock:
+            if not self.counts(error):
+                # The server answered, so it is not degraded
+                self.failures = 0
+                if self.state == "half_open":
+                    self.state = "closed"
+                    self._trial = False
+                return
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = self.clock()
+                self._trial = False
+
+    def release(self) -> None:
+        """Releases the trial of a half open breaker whose request ended without an answer"""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+                self._trial = False
+
+
+class CircuitBreakers:
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """One circuit breaker per endpoint, so one degraded endpoint does not stop the others
+
+        Endpoints are method templates, so "beer/info/1" and "beer/info/2" share a breaker.
+
+        Parameters
+        ----------
+        failure_threshold: int, default=5
+            The number of consecutive failures which open a breaker
+        reset_timeout: float, default=30.0
+            Seconds an open breaker fails fast before letting a trial request through
+        clock: callable, default=time.monotonic
+            The clock used for timing, in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker_for(self, method: str) -> CircuitBreaker:
+        """Returns the circuit breaker of a method's endpoint
+
+        Parameters
+        ----------
+        method: str
+            Untappd API method
+
+        Returns
+        -------
+        The CircuitBreaker of the endpoint
+        """
+        template = method_template(method)
+        with self._lock:
+            breaker = self._breakers.get(template)
+            if breaker is None:
+                breaker = self._breakers[template] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self.clock
+                )
+            return breaker
+
+    def state(self) -> Dict:
+        """Returns the state, consecutive failures and rejections of every endpoint's breaker"""
+        with self._lock:
+            return {
+                template: {
+                    "state": breaker.state,
+                    "failures": breaker.failures,
+                    "rejected": breaker.rejected,
+                }
+                for template, breaker in self._breakers.items()
+            }
@@ -0,0 +1,289 @@
+"""Adaptive polling of many venue, beer and brewery feeds within a request budget
+
+Every feed has an estimated check-in arrival rate. Feeds are kept in a priority queue
+keyed on the time their expected number of new check-ins reaches a common target, so
+busy feeds are polled often and quiet ones rarely. The target is chosen so that polling
+every feed at that yield spends the request budget, which maximizes the check-ins
+captured per request.
+"""
+
+import heapq
+import itertools
+import time
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from Untappd_Errors import CircuitOpenError, UntappdDeadlineError, UntappdError
+from Untappd_Pagination import parse_created_at
+from Untappd_Sync import FeedSync
+
+
+def _transient(error: Exception) -> bool:
+    """Internal function to check whether a failed poll may succeed later as it is"""
+    return isinstance(error, UntappdError) and (
+        error.retryable or isinstance(error, (CircuitOpenError, UntappdDeadlineError))
+    )
+
+
+class FeedStats:
+    def __init__(self, kind: str, entity_id: str, rate: Optional[float]) -> None:
+        """Polling statistics of one feed
+
+        Parameters
+        ----------
+        kind: str
+            The kind of feed, "venue", "beer" or "brewery"
+        entity_id: str
+            The id of the venue, beer or brewery
+        rate: float
+            The estimated check-ins per second, None if not yet known
+        """
+        self.kind = kind
+        self.entity_id = entity_id
+        self.rate = rate
+        self.last_poll = None
+        self.next_poll = None
+        self.polls = 0
+        self.checkins = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict:
+        """Returns the statistics as a dictionary"""
+        return {
+            "kind": self.kind,
+            "entity_id": self.entity_id,
+            "rate_per_hour": None if self.rate is None else self.rate * 3600.0,
+            "last_poll": self.last_poll,
+            "next_poll": self.next_poll,
+            "polls": self.polls,
+            "checkins": self.checkins,
+            "checkins_per_poll": self.checkins / self.polls if self.polls else None,
+            "errors": self.errors,
+        }
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        sync: FeedSync,
+        budget: int = 100,
+        window: float = 3600.0,
+        min_interval: float = 60.0,
+        max_interval: float = 86400.0,
+        smoothing: float = 0.3,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Schedules feed polls by their expected number of new check-ins
+
+        Parameters
+        ----------
+        sync: FeedSync
+            The incremental sync used to poll feeds
+        budget: int, default=100
+            The number of requests the scheduler may spend per window
+        window: float, default=3600.0
+            The length of the budget window in seconds
+        min_interval: float, default=60.0
+            The shortest time between two polls of one feed, in seconds
+        max_interval: float, default=86400.0
+            The longest time between two polls of one feed, in seconds
+        smoothing: float, default=0.3
+            The weight of the newest observation in the moving average of arrival rates
+        clock: callable, default=time.time
+            The clock used for scheduling, in seconds
+        """
+        self.sync = sync
+        self.budget = budget
+        self.window = window
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.clock = clock
+        self.polls = 0
+        self.checkins = 0
+        self._feeds = {}
+        self._queue = []
+        self._counter = itertools.count()
+        self._total_rate = 0.0
+
+    def add(self, kind: str, entity_id: str, rate: Optional[float] = None) -> None:
+        """Adds a feed to poll, due immediately
+
+        Parameters
+        ----------
+        kind: str
+            The kind of feed, "venue", "beer" or "brewery"
+        entity_id: str
+            The id of the venue, beer or brewery
+        rate: float, default=None
+            A prior estimate of its check-ins per second (optional)
+        """
+        key = (kind, str(entity_id))
+        if key in self._feeds:
+            return
+        stats = FeedStats(kind, str(entity_id), rate)
+        self._feeds[key] = stats
+        self._total_rate += rate or 0.0
+        self._push(stats, self.clock())
+
+    def remove(self, kind: str, entity_id: str) -> None:
+        """Stops polling a feed
+
+        Parameters
+        ----------
+        kind: str
+            The kind of feed, "venue", "beer" or "brewery"
+        entity_id: str
+            The id of the venue, beer or brewery
+        """
+        stats = self._feeds.pop((kind, str(entity_id)), None)
+        if stats is not None:
+            self._total_rate -= stats.rate or 0.0
+
+    @property
+    def target(self) -> float:
+        """The expected number of new check-ins per poll that spends the budget"""
+        return self.window * self._total_rate / self.budget
+
+    def _push(self, stats: FeedStats, due: float) -> None:
+        """Internal function to queue the next poll of a feed"""
+        stats.next_poll = due
+        heapq.heappush(
+            self._queue, (due, next(self._counter), stats.kind, stats.entity_id)
+        )
+
+    def _due(self, stats: FeedStats) -> float:
+        """Internal function to return when a feed is expected to have target new check-ins"""
+        if not stats.rate:
+            interval = self.max_interval
+        else:
+            interval = self.target / stats.rate
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        return stats.last_poll + interval
+
+    def _observe(self, stats: FeedStats, checkins: List[Dict], now: float) -> None:
+        """Internal function to update the arrival rate of a feed after a poll"""
+        observed = None
+        if stats.last_poll is not None:
+            observed = len(checkins) / max(now - stats.last_poll, 1e-9)
+        elif len(checkins) > 1:
+            # The first poll backfills history, so estimate from the spread of timestamps
+            try:
+                times = [parse_created_at(c["created_at"]) for c in checkins]
+                span = (max(times) - min(times)).total_seconds()
+                if span > 0:
+                    observed = (len(checkins) - 1) / span
+            except (KeyError, TypeError, ValueError):
+                observed = None
+        if observed is None:
+            if stats.rate is None:
+                observed = 0.0
+            else:
+                return
+        old = stats.rate or 0.0
+        if stats.rate is None:
+            stats.rate = observed
+        else:
+            stats.rate = (1 - self.smoothing) * stats.rate + self.smoothing * observed
+        self._total_rate += stats.rate - old
+
+    def next_due(self) -> Optional[float]:
+        """Returns the time the next feed is due, or None if there are no feeds"""
+        while self._queue:
+            due, _, kind, entity_id = self._queue[0]
+            stats = self._feeds.get((kind, entity_id))
+            if stats is not None and stats.next_poll == due:
+                return due
+            heapq.heappop(self._queue)
+        return None
+
+    def run_once(self) -> Optional[Tuple[str, str, List[Dict]]]:
+        """Polls the feed due soonest, if any is due
+
+        Returns
+        -------
+        The kind and id of the feed polled and its new check-ins, or None if no feed was due
+        """
+        now = self.clock()
+        due = self.next_due()
+        if due is None or due > now:
+            return None
+        _, _, kind, entity_id = heapq.heappop(self._queue)
+        stats = self._feeds[(kind, entity_id)]
+        try:
+            checkins = self.sync.poll(kind, entity_id)
+        except Exception:
+            stats.errors += 1
+            self._push(stats, now + self.min_interval)
+            raise
+        finally:
+            stats.polls += 1
+            self.polls += 1
+        stats.checkins += len(checkins)
+        self.checkins += len(checkins)
+        self._observe(stats, checkins, now)
+        stats.last_poll = now
+        self._push(stats, self._due(stats))
+        return kind, entity_id, checkins
+
+    def run(
+        self,
+        on_checkins: Callable[[str, str, List[Dict]], None],
+        duration: Optional[float] = None,
+        on_error: Optional[Callable[[str, str, Exception], None]] = None,
+    ) -> None:
+        """Polls feeds as they become due, spending at most budget requests per window
+
+        Each poll is followed by a pause of window / budget seconds for every request it
+        made, counted by the FeedSync, so polls walking several pages spend their share of
+        the budget. Give the client a RateLimiter to also pace the retries of a request.
+
+        A failed poll is counted in the errors of its feed and retried after min_interval.
+        Rate limit, server, connection and deadline errors and open circuits are expected
+        to pass and are only counted; any other error is passed to on_error, or raised if
+        it is None.
+
+        Parameters
+        ----------
+        on_checkins: callable
+            Called with the kind, id and new check-ins of every feed polled
+        duration: float, default=None
+            Seconds to run for, None to run forever
+        on_error: callable, default=None
+            Called with the kind, id and error of every poll failing with an error which is
+            not transient, to keep polling the other feeds (optional)
+        """
+        spacing = self.window / self.budget
+        stop_at = None if duration is None else self.clock() + duration
+        while stop_at is None or self.clock() < stop_at:
+            due = self.next_due()
+            if due is None:
+                return
+            now = self.clock()
+            if due > now:
+                sleep = due - now
+                if stop_at is not None:
+                    sleep = min(sleep, max(stop_at - now, 0.0))
+                time.sleep(sleep)
+                continue
+            started = now
+            requests = self.sync.requests
+            _, _, kind, entity_id = self._queue[0]
+            try:
+                result = self.run_once()
+            except Exception as e:
+                result = None
+                if not _transient(e):
+                    if on_error is None:
+                        raise
+                    on_error(kind, entity_id, e)
+            if result is not None:
+                on_checkins(*result)
+            cost = max(self.sync.requests - requests, 1)
+            wait = started + cost * spacing - self.clock()
+            if wait > 0:
+                time.sleep(wait)
+
+    def feed_stats(self) -> List[Dict]:
+        """Returns the polling statistics of every feed"""
+        return [stats.as_dict() for stats in self._feeds.values()]
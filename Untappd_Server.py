@@ -0,0 +1,659 @@
+"""A local stand-in for the Untappd API v4, for testing clients without spending quota
+
+It answers the search, info, feed, user list and write endpoints the clients call with
+deterministic synthetic data, paginates feeds by max_id and min_id and user lists by
+offset, applies Untappd's rate limiting, and can inject latency and errors. Point a
+client at it by setting its url:
+
+    with FakeUntappdServer(rate_limit=100, window=60) as server:
+        client = UntappdGeneralInfo("id", "secret")
+        client.url = server.url
+
+or run it standalone with `python Untappd_Server.py --port 8080`.
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# The time of the newest check-in of every feed, so responses do not depend on the clock
+_NEWEST = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# The number of venues, and the id of the newest check-in of the local pub feeds
+_VENUES = 800
+_PUB_NEWEST = 1000000
+
+_STYLES = ("IPA - American", "Stout - Imperial", "Lager - Helles", "Sour - Gose")
+
+
+def _seed(key: str) -> int:
+    """Internal function to derive a stable number from a string"""
+    return zlib.crc32(key.encode("utf-8"))
+
+
+class FakeUntappdServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate_limit: int = 100,
+        window: float = 3600.0,
+        latency: float = 0.0,
+        tail_latency: float = 0.0,
+        tail_rate: float = 0.0,
+        error_rate: float = 0.0,
+        feed_size: int = 300,
+        list_size: int = 120,
+        seed: int = 0,
+        friend_pool: int = 0,
+    ) -> None:
+        """An HTTP server answering Untappd API requests with Untappd's rate limiting
+
+        Each client id or access token gets rate_limit requests per fixed window, reported
+        through the X-Ratelimit-Limit and X-Ratelimit-Remaining headers, and is answered
+        with a 429 and a Retry-After header once the budget is spent.
+
+        Parameters
+        ----------
+        host: str, default="127.0.0.1"
+            The host to listen on
+        port: int, default=0
+            The port to listen on, 0 to pick a free one
+        rate_limit: int, default=100
+            The number of requests allowed per window for each key
+        window: float, default=3600.0
+            The length of the rate limit window in seconds
+        latency: float, default=0.0
+            Seconds to wait before answering each request
+        tail_latency: float, default=0.0
+            Extra seconds to wait before answering the slow requests
+        tail_rate: float, default=0.0
+            The share of requests which are slow
+        error_rate: float, default=0.0
+            The share of requests answered with a 503 error page
+        feed_size: int, default=300
+            The number of check-ins in every feed
+        list_size: int, default=120
+            The number of items in every user list, such as badges and friends
+        seed: int, default=0
+            The seed of the random injected latency and errors
+        friend_pool: int, default=0
+            The number of users, user0 onwards, friends are drawn from, so friend lists
+            overlap as in a real social graph, 0 for friends unique to each user
+        """
+        super().__init__((host, port), _FakeUntappdHandler)
+        self.rate_limit = rate_limit
+        self.window = window
+        self.latency = latency
+        self.tail_latency = tail_latency
+        self.tail_rate = tail_rate
+        self.error_rate = error_rate
+        self.feed_size = feed_size
+        self.list_size = list_size
+        self.friend_pool = friend_pool
+        self.requests = 0
+        self.rejected = 0
+        self.injected_errors = 0
+        self._rng = random.Random(seed)
+        self._budgets = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """The base url to set on a client"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v4/"
+
+    def start(self) -> "FakeUntappdServer":
+        """Starts serving on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving and closes the socket"""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeUntappdServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def spend(self, key: str) -> Tuple[bool, int, float]:
+        """Spends one request of a key's budget
+
+        Parameters
+        ----------
+        key: str
+            The client id or access token of the request
+
+        Returns
+        -------
+        Whether the request is allowed, the number of requests left in the window and the
+        seconds until the window resets
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            window_end, remaining = self._budgets.get(key, (0.0, 0))
+            if now >= window_end:
+                window_end, remaining = now + self.window, self.rate_limit
+            if remaining < 1:
+                self.rejected += 1
+                return False, 0, window_end - now
+            self._budgets[key] = (window_end, remaining - 1)
+            return True, remaining - 1, window_end - now
+
+    def inject(self) -> Tuple[float, bool]:
+        """Draws the injected latency and error of a request
+
+        Returns
+        -------
+        The seconds to wait before answering and whether to answer with an error
+        """
+        with self._lock:
+            delay = self.latency
+            if self.tail_rate and self._rng.random() < self.tail_rate:
+                delay += self.tail_latency
+            error = bool(self.error_rate) and self._rng.random() < self.error_rate
+            if error:
+                self.injected_errors += 1
+        return delay, error
+
+    def handle_api(self, verb: str, method: str, query: Dict) -> Tuple[int, Dict]:
+        """Answers an API request, override to serve other responses
+
+        Parameters
+        ----------
+        verb: str
+            The HTTP verb of the request
+        method: str
+            The Untappd API method, such as "beer/info/1"
+        query: dict
+            The query parameters of the request, with the last value of each key
+
+        Returns
+        -------
+        The HTTP status and the response body
+        """
+        parts = method.strip("/").split("/")
+        if verb == "POST":
+            return _ok({"result": "success"})
+        route = "/".join(parts[:2])
+        entity = parts[2] if len(parts) > 2 else ""
+        try:
+            if route == "thepub/local" and "lat" in query and "lng" in query:
+                return _ok(self.pub_feed(query))
+            if route in _FEEDS:
+                if route in ("user/checkin", "user/checkins") and not entity:
+                    entity = "self"
+                return _ok(self.feed(route + "/" + entity, query))
+            if route in _INFO:
+                return _ok(_INFO[route](entity))
+            if route in _LISTS:
+                return _ok(_LISTS[route](self, entity or "self", query))
+            if route in _SEARCHES:
+                return _ok(_SEARCHES[route](query.get("q", "")))
+            if route == "beer/trending":
+                beers = [
+                    {"beer": _beer(i), "brewery": _brewery(i)} for i in range(1, 11)
+                ]
+                return _ok(
+                    {
+                        "macro": {"count": 5, "items": beers[:5]},
+                        "micro": {"count": 5, "items": beers[5:]},
+                    }
+                )
+            if route in ("user/pending", "notifications"):
+                return _ok({"count": 0, "items": []})
+        except ValueError as e:
+            return _error(400, "invalid_param", str(e))
+        return _error(404, "invalid_endpoint", f"{method} is not emulated")
+
+    def feed(self, key: str, query: Dict) -> Dict:
+        """Returns a page of a check-in feed, paginated by max_id and min_id
+
+        Parameters
+        ----------
+        key: str
+            The feed, such as "beer/checkins/1"
+        query: dict
+            The query parameters of the request
+
+        Returns
+        -------
+        The response of the page
+        """
+        seed = _seed(key)
+        step = 1 + seed % 13
+        newest = seed % 100000 + step * self.feed_size
+        limit = min(int(query.get("limit") or 25), 50)
+        max_id = int(query.get("max_id") or newest)
+        min_id = int(query.get("min_id") or 0)
+        # Check-in ids descend from newest in steps of step, so find the first at most max_id
+        top = newest - ((newest - min(max_id, newest)) + step - 1) // step * step
+        ids = []
+        checkin_id = top
+        while len(ids) < limit and checkin_id > max(
+            min_id, newest - step * self.feed_size
+        ):
+            ids.append(checkin_id)
+            checkin_id -= step
+        items = [
+            _checkin(checkin_id, (newest - checkin_id) // step, key)
+            for checkin_id in ids
+        ]
+        next_max_id = ids[-1] - 1 if len(ids) == limit else ""
+        return {
+            "pagination": {"max_id": next_max_id},
+            "checkins": {"count": len(items), "items": items},
+        }
+
+    def pub_feed(self, query: Dict) -> Dict:
+        """Returns a page of the check-ins around a location, newest first
+
+        Check-in ids descend by one through every venue in turn, and the last
+        20 * feed_size of them are recent enough to be in the feed. Only those at venues
+        within the radius, in miles and at most 25, of lat and lng are returned.
+
+        Parameters
+        ----------
+        query: dict
+            The query parameters of the request
+
+        Returns
+        -------
+        The response of the page
+        """
+        lat, lng = float(query["lat"]), float(query["lng"])
+        radius = min(float(query.get("radius") or 25), 25.0)
+        limit = min(int(query.get("limit") or 25), 25)
+        max_id = min(int(query.get("max_id") or _PUB_NEWEST), _PUB_NEWEST)
+        min_id = max(int(query.get("min_id") or 0), _PUB_NEWEST - 20 * self.feed_size)
+        near = [
+            _miles(lat, lng, *_venue_location(venue_id)) <= radius
+            for venue_id in range(1, _VENUES + 1)
+        ]
+        items = []
+        checkin_id = max_id
+        while len(items) < limit and checkin_id > min_id:
+            if near[checkin_id % _VENUES]:
+                items.append(
+                    _checkin(checkin_id, (_PUB_NEWEST - checkin_id) // 100, "thepub")
+                )
+            checkin_id -= 1
+        next_max_id = items[-1]["checkin_id"] - 1 if len(items) == limit else ""
+        return {
+            "pagination": {"max_id": next_max_id},
+            "checkins": {"count": len(items), "items": items},
+        }
+
+    def _page(self, key: str, query: Dict, item) -> Tuple[int, List[Dict]]:
+        """Internal function to return the total and a page of a list paginated by offset"""
+        offset = int(query.get("offset") or 0)
+        limit = min(int(query.get("limit") or 25), 50)
+        end = min(offset + limit, self.list_size)
+        return self.list_size, [item(i, key) for i in range(offset, end)]
+
+    def _badges(self, username: str, query: Dict) -> Dict:
+        """Internal function to return a page of a user's badges"""
+        total, items = self._page(
+            username,
+            query,
+            lambda i, key: {
+                "badge_id": _seed(key) % 1000 + i,
+                "badge_name": f"Badge {i}",
+                "created_at": _created_at(i * 3),
+            },
+        )
+        return {"count": len(items), "total_count": total, "items": items}
+
+    def _friends(self, username: str, query: Dict) -> Dict:
+        """Internal function to return a page of a user's friends"""
+        total, items = self._page(
+            username,
+            query,
+            lambda i, key: {
+                "friendship_hash": f"{_seed(key):x}{i}",
+                "user": _user(
+                    f"user{_seed(f'{key}/{i}') % self.friend_pool}"
+                    if self.friend_pool
+                    else f"{key}_friend{i}"
+                ),
+            },
+        )
+        return {"count": len(items), "found": total, "items": items}
+
+    def _wishlist(self, username: str, query: Dict) -> Dict:
+        """Internal function to return a page of a user's wishlist"""
+        total, items = self._page(
+            username,
+            query,
+            lambda i, key: {
+                "created_at": _created_at(i * 5),
+                "beer": _beer(_seed(key) % 5000 + i),
+                "brewery": _brewery(_seed(key) % 97 + i),
+            },
+        )
+        return {"total_count": total, "beers": {"count": len(items), "items": items}}
+
+    def _distinct_beers(self, username: str, query: Dict) -> Dict:
+        """Internal function to return a page of a user's distinct beers"""
+        total, items = self._page(
+            username,
+            query,
+            lambda i, key: {
+                "first_checkin_id": _seed(key) % 100000 + i,
+                "recent_created_at": _created_at(i * 7),
+                "count": 1 + i % 3,
+                "beer": _beer(_seed(key) % 5000 + i),
+                "brewery": _brewery(_seed(key) % 97 + i),
+            },
+        )
+        return {"total_count": total, "beers": {"count": len(items), "items": items}}
+
+
+def _ok(response: Dict) -> Tuple[int, Dict]:
+    """Internal function to wrap a response in Untappd's envelope"""
+    return 200, {"meta": {"code": 200}, "response": response}
+
+
+def _error(status: int, error_type: str, detail: str) -> Tuple[int, Dict]:
+    """Internal function to return an error in Untappd's envelope"""
+    return status, {
+        "meta": {"code": status, "error_type": error_type, "error_detail": detail}
+    }
+
+
+def _number(entity_id: str) -> int:
+    """Internal function to parse a numeric id"""
+    if not entity_id.isdigit():
+        raise ValueError(f"{entity_id!r} is not a valid id")
+    return int(entity_id)
+
+
+def _created_at(hours_ago: int) -> str:
+    """Internal function to format a time in Untappd's RFC 2822 style"""
+    return format_datetime(_NEWEST - timedelta(hours=hours_ago))
+
+
+def _brewery(brewery_id: int) -> Dict:
+    """Internal function to return a synthetic brewery"""
+    return {
+        "brewery_id": brewery_id,
+        "brewery_name": f"Brewery {brewery_id}",
+        "brewery_type": "Micro Brewery",
+        "country_name": "United States",
+        "location": {"brewery_city": "Portland", "brewery_state": "OR"},
+    }
+
+
+def _beer(bid: int) -> Dict:
+    """Internal function to return a synthetic beer"""
+    return {
+        "bid": bid,
+        "beer_name": f"Beer {bid}",
+        "beer_style": _STYLES[bid % len(_STYLES)],
+        "beer_abv": round(4.0 + bid % 80 / 10.0, 1),
+        "beer_ibu": bid % 100,
+        "rating_score": round(3.0 + bid % 20 / 10.0, 2),
+    }
+
+
+def _venue_location(venue_id: int) -> Tuple[float, float]:
+    """Internal function to return the latitude and longitude of a venue, around Portland"""
+    return (
+        45.35 + _seed(f"venue{venue_id}/lat") % 3000 / 10000.0,
+        -122.85 + _seed(f"venue{venue_id}/lng") % 4000 / 10000.0,
+    )
+
+
+def _miles(lat: float, lng: float, other_lat: float, other_lng: float) -> float:
+    """Internal function to return the distance between two points in miles"""
+    lat, lng, other_lat, other_lng = map(math.radians, (lat, lng, other_lat, other_lng))
+    a = (
+        math.sin((other_lat - lat) / 2) ** 2
+        + math.cos(lat) * math.cos(other_lat) * math.sin((other_lng - lng) / 2) ** 2
+    )
+    return 2 * 3958.8 * math.asin(math.sqrt(a))
+
+
+def _venue(venue_id: int) -> Dict:
+    """Internal function to return a synthetic venue"""
+    lat, lng = _venue_location(venue_id)
+    return {
+        "venue_id": venue_id,
+        "venue_name": f"Venue {venue_id}",
+        "primary_category": "Bar",
+        "location": {
+            "venue_address": f"{venue_id} Main Street",
+            "venue_city": "Portland",
+            "lat": lat,
+            "lng": lng,
+        },
+    }
+
+
+def _user(username: str) -> Dict:
+    """Internal function to return a synthetic user"""
+    return {
+        "uid": _seed(username) % 10000000,
+        "user_name": username,
+        "first_name": username.capitalize(),
+        "last_name": "",
+        "location": "Portland, OR",
+    }
+
+
+def _checkin(checkin_id: int, age: int, feed: str) -> Dict:
+    """Internal function to return a check-in of a feed, consistent with the feed's entity"""
+    kind, _, entity = feed.partition("/checkins/")
+    bid = int(entity) if kind == "beer" and entity.isdigit() else checkin_id % 5000 + 1
+    venue_id = (
+        int(entity)
+        if kind == "venue" and entity.isdigit()
+        else checkin_id % _VENUES + 1
+    )
+    brewery_id = int(entity) if kind == "brewery" and entity.isdigit() else bid % 97 + 1
+    username = (
+        feed.split("/")[-1] if feed.startswith("user/") else f"user{checkin_id % 1000}"
+    )
+    return {
+        "checkin_id": checkin_id,
+        "created_at": _created_at(age),
+        "checkin_comment": "",
+        "rating_score": (checkin_id % 9 + 1) / 2.0,
+        "user": _user(username),
+        "beer": _beer(bid),
+        "brewery": _brewery(brewery_id),
+        "venue": _venue(venue_id),
+    }
+
+
+def _search_beers(q: str) -> Dict:
+    """Internal function to return beer search results, the first named exactly q"""
+    seed = _seed(q.casefold())
+    items = []
+    for i in range(10):
+        beer = _beer(seed % 5000 + i + 1)
+        beer["beer_name"] = q if i == 0 else f"{q} {i}"
+        brewery = _brewery(seed % 97 + 1)
+        items.append({"checkin_count": 100 - i, "beer": beer, "brewery": brewery})
+    return {"found": len(items), "beers": {"count": len(items), "items": items}}
+
+
+def _search_breweries(q: str) -> Dict:
+    """Internal function to return brewery search results, the first named exactly q"""
+    seed = _seed(q.casefold())
+    items = []
+    for i in range(10):
+        brewery = _brewery(seed % 5000 + i + 1)
+        brewery["brewery_name"] = q if i == 0 else f"{q} {i}"
+        items.append({"brewery": brewery})
+    return {"found": len(items), "brewery": {"count": len(items), "items": items}}
+
+
+def _search_venues(q: str) -> Dict:
+    """Internal function to return venue search results, the first named exactly q"""
+    seed = _seed(q.casefold())
+    items = []
+    for i in range(10):
+        venue = _venue(seed % 5000 + i + 1)
+        venue["venue_name"] = q if i == 0 else f"{q} {i}"
+        items.append({"venue": venue})
+    return {"found": len(items), "venues": {"count": len(items), "items": items}}
+
+
+_FEEDS = (
+    "checkin/recent",
+    "thepub/local",
+    "user/checkin",
+    "user/checkins",
+    "venue/checkins",
+    "beer/checkins",
+    "brewery/checkins",
+)
+
+_INFO = {
+    "beer/info": lambda entity: {"beer": _beer(_number(entity))},
+    "brewery/info": lambda entity: {"brewery": _brewery(_number(entity))},
+    "venue/info": lambda entity: {"venue": _venue(_number(entity))},
+    "venue/foursquare_lookup": lambda entity: {
+        "venue": {"count": 1, "items": [_venue(_seed(entity) % 5000 + 1)]}
+    },
+    "user/info": lambda entity: {"user": _user(entity or "self")},
+    "checkin/view": lambda entity: {
+        "checkin": _checkin(_number(entity), 0, "checkin/view")
+    },
+}
+
+_LISTS = {
+    "user/badges": FakeUntappdServer._badges,
+    "user/friends": FakeUntappdServer._friends,
+    "user/wishlist": FakeUntappdServer._wishlist,
+    "user/beers": FakeUntappdServer._distinct_beers,
+}
+
+_SEARCHES = {
+    "search/beer": _search_beers,
+    "search/brewery": _search_breweries,
+    "search/venue": _search_venues,
+}
+
+_ERROR_PAGE = (
+    b"<html><head><title>503 Service Temporarily Unavailable</title></head>"
+    b"<body><h1>503 Service Temporarily Unavailable</h1></body></html>"
+)
+
+
+class _FakeUntappdHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _handle(self, verb: str) -> None:
+        server = self.server
+        delay, inject_error = server.inject()
+        if delay:
+            time.sleep(delay)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        key = query.get("access_token") or query.get("client_id", "")
+        allowed, remaining, reset = server.spend(key)
+        content_type = "application/json; charset=utf-8"
+        if not allowed:
+            status, payload = _error(
+                429, "invalid_limit", "You have exceeded the rate limit"
+            )
+            body = json.dumps(payload).encode("utf-8")
+        elif inject_error:
+            status, body, content_type = 503, _ERROR_PAGE, "text/html"
+        else:
+            method = parts.path.split("/v4/", 1)[-1]
+            status, payload = server.handle_api(verb, method, query)
+            body = json.dumps(payload).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Ratelimit-Limit", str(server.rate_limit))
+            self.send_header("X-Ratelimit-Remaining", str(remaining))
+            if not allowed:
+                self.send_header("Retry-After", str(max(int(reset + 0.999), 1)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the request, such as after a timeout
+            self.close_connection = True
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the server in the foreground until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rate-limit", type=int, default=100)
+    parser.add_argument("--window", type=float, default=3600.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--tail-latency", type=float, default=0.0)
+    parser.add_argument("--tail-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--feed-size", type=int, default=300)
+    parser.add_argument("--list-size", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--friend-pool", type=int, default=0)
+    args = parser.parse_args(argv)
+    server = FakeUntappdServer(
+        args.host,
+        args.port,
+        args.rate_limit,
+        args.window,
+        args.latency,
+        args.tail_latency,
+        args.tail_rate,
+        args.error_rate,
+        args.feed_size,
+        args.list_size,
+        args.seed,
+        args.friend_pool,
+    )
+    print(f"Serving the Untappd API stand-in at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
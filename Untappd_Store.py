@@ -0,0 +1,50 @@
+"""Base class of the SQLite backed stores"""
+
+import os
+import sqlite3
+import threading
+
+from typing import Tuple
+
+
+class SQLiteStore:
+    # The statements creating the tables of the store, run when it is opened
+    schema: Tuple[str, ...] = ()
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """Base class of stores kept in an SQLite database
+
+        The database is opened in WAL mode with a busy timeout so it can be shared by many
+        threads and worker processes. Each thread and process opens its own connection.
+
+        Parameters
+        ----------
+        path: str
+            The path of the SQLite database, created if it does not exist
+        timeout: float, default=30.0
+            Seconds to wait for another process holding the write lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            for statement in self.schema:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Internal function to return the connection of the current thread and process"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self) -> None:
+        """Closes the connection of the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,151 @@
+"""Incremental sync of venue, beer and brewery feeds using min_id watermarks"""
+
+import time
+
+from typing import Dict, List, Optional
+
+from Untappd_Feed import UntappdFeed
+from Untappd_Store import SQLiteStore
+
+
+class WatermarkStore(SQLiteStore):
+    schema = (
+        "CREATE TABLE IF NOT EXISTS watermarks ("
+        "kind TEXT NOT NULL, entity_id TEXT NOT NULL, min_id INTEGER NOT NULL, "
+        "updated_at REAL NOT NULL, PRIMARY KEY (kind, entity_id))",
+    )
+
+    def get(self, kind: str, entity_id: str) -> Optional[int]:
+        """Returns the id of the newest check-in seen for an entity, or None if never synced
+
+        Parameters
+        ----------
+        kind: str
+            The kind of feed, "venue", "beer" or "brewery"
+        entity_id: str
+            The id of the venue, beer or brewery
+
+        Returns
+        -------
+        The watermark of our entity
+        """
+        row = (
+            self._connect()
+            .execute(
+                "SELECT min_id FROM watermarks WHERE kind = ? AND entity_id = ?",
+                (kind, str(entity_id)),
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def put(self, kind: str, entity_id: str, min_id: int) -> None:
+        """Stores the id of the newest check-in seen for an entity
+
+        Parameters
+        ----------
+        kind: str
+            The kind of feed, "venue", "beer" or "brewery"
+        entity_id: str
+            The id of the venue, beer or brewery
+        min_id: int
+            The id of the newest check-in seen
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO watermarks (kind, entity_id, min_id, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (kind, str(entity_id), int(min_id), time.time()),
+            )
+
+    def remove(self, kind: str, entity_id: str) -> None:
+        """Forgets the watermark of an entity, so its next sync starts over
+
+        Parameters
+        ----------
+        kind: str
+            The kind of feed, "venue", "beer" or "brewery"
+        entity_id: str
+            The id of the venue, beer or brewery
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM watermarks WHERE kind = ? AND entity_id = ?",
+                (kind, str(entity_id)),
+            )
+
+
+class FeedSync:
+    def __init__(
+        self,
+        client: UntappdFeed,
+        store: WatermarkStore,
+        limit: int = 25,
+        backfill: Optional[int] = 25,
+    ) -> None:
+        """Fetches only the check-ins of venue, beer and brewery feeds newer than the last sync
+
+        Each entity keeps the id of the newest check-in seen as its watermark. A poll asks
+        Untappd for check-ins above the watermark and walks further pages only while they
+        are full, so a poll with fewer than limit new check-ins costs one request. The
+        pages requested by every poll so far are counted in requests.
+
+        Parameters
+        ----------
+        client: UntappdFeed
+            The client used to fetch feeds
+        store: WatermarkStore
+            The store keeping the watermarks across restarts
+        limit: int, default=25
+            Number of check-ins to fetch per request
+        backfill: int, default=25
+            The number of check-ins to fetch when first syncing an entity, None for its
+            whole history
+        """
+        self.client = client
+        self.store = store
+        self.limit = limit
+        self.backfill = backfill
+        self.requests = 0
+        self._feeds = {
+            "venue": client.iter_venue_feed,
+            "beer": client.iter_beer_feed,
+            "brewery": client.iter_brewery_feed,
+        }
+
+    def poll(self, kind: str, entity_id: str) -> List[Dict]:
+        """Returns the check-ins of an entity's feed newer than its watermark, newest first
+
+        The watermark is only moved once every new check-in has been fetched, so a failed
+        poll is retried in full by the next one.
+
+        Parameters
+        ----------
+        kind: str
+            The kind of feed, "venue", "beer" or "brewery"
+        entity_id: str
+            The id of the venue, beer or brewery
+
+        Returns
+        -------
+        A list of the new check-in dictionaries
+        """
+        if kind not in self._feeds:
+            raise ValueError(
+                f"Feed kind is {kind} whereas only {', '.join(self._feeds)} can be synced"
+            )
+        watermark = self.store.get(kind, entity_id)
+        iterator = self._feeds[kind](
+            str(entity_id),
+            limit=self.limit,
+            min_id=watermark,
+            max_items=self.backfill if watermark is None else None,
+        )
+        try:
+            checkins = list(iterator)
+        finally:
+            self.requests += iterator.pages
+        if checkins:
+            newest = max(int(checkin["checkin_id"]) for checkin in checkins)
+            self.store.put(kind, entity_id, newest)
+        return checkins
@@ -0,0 +1,272 @@
+"""Pluggable transports sending the HTTP requests of the blocking clients
+
+Urllib3Transport sends requests over the network and is the default. RecordingTransport
+wraps another transport and saves every exchange to a cassette, a JSON lines file, and
+ReplayTransport answers requests from a cassette in-process, so runs can be repeated
+offline without spending quota. Credentials are never written to cassettes.
+
+urllib3 is only imported once a transport is used, so async clients sending requests with
+aiohttp never load it.
+"""
+
+import json
+import threading
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+if TYPE_CHECKING:
+    import urllib3
+
+# Connect and read timeouts of every request in seconds, which deadlines can only shorten
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 30.0
+
+# Query parameters holding credentials, left out of cassettes and request matching
+AUTH_PARAMS = ("client_id", "client_secret", "access_token")
+
+# Response headers kept in cassettes, along with every X-Ratelimit-* header
+RECORDED_HEADERS = (
+    "Content-Type",
+    "X-Ratelimit-Limit",
+    "X-Ratelimit-Remaining",
+    "X-Ratelimit-Reset",
+    "Retry-After",
+)
+
+
+class _Headers(Mapping):
+    def __init__(self, headers: Optional[Mapping] = None) -> None:
+        """Internal read-only mapping of response headers with case-insensitive names"""
+        self._headers = {
+            name.lower(): (name, value) for name, value in (headers or {}).items()
+        }
+
+    def __getitem__(self, name: str) -> str:
+        return self._headers[name.lower()][1]
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._headers
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self._headers.values())
+
+    def __len__(self) -> int:
+        return len(self._headers)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+def _recorded_headers(headers: Mapping) -> Dict[str, str]:
+    """Internal function to return the headers of a response kept in a cassette"""
+    recorded = {name: headers[name] for name in RECORDED_HEADERS if name in headers}
+    for name, value in headers.items():
+        if name.lower().startswith("x-ratelimit-"):
+            recorded.setdefault(name, value)
+    return recorded
+
+
+class Urllib3Transport:
+    def __init__(self, pool: Optional["urllib3.PoolManager"] = None) -> None:
+        """Sends requests over a urllib3 connection pool
+
+        Parameters
+        ----------
+        pool: urllib3.PoolManager, default=None
+            The pool to send requests on, a new one without retries, created on first use, if None
+        """
+        self._pool = pool
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> "urllib3.PoolManager":
+        """The connection pool requests are sent on"""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    import urllib3
+
+                    self._pool = urllib3.PoolManager(
+                        maxsize=10,
+                        retries=False,
+                        timeout=urllib3.Timeout(
+                            connect=CONNECT_TIMEOUT, read=READ_TIMEOUT
+                        ),
+                    )
+        return self._pool
+
+    def request(
+        self,
+        verb: str,
+        url: str,
+        fields: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Mapping, bytes]:
+        """Sends a request and returns its response
+
+        Parameters
+        ----------
+        verb: str
+            The HTTP verb of the request
+        url: str
+            The full url of the request
+        fields: dictionary, default=None
+            Fields sent with the request (optional)
+        timeout: float, default=None
+            Seconds left to complete the request in, None for the default timeouts
+
+        Returns
+        -------
+        The status, headers and body of the response
+        """
+        pool = self.pool
+        from urllib3 import Timeout
+
+        timeout = Timeout(total=timeout, connect=CONNECT_TIMEOUT, read=READ_TIMEOUT)
+        if fields:
+            response = pool.request(verb, url, fields=fields, timeout=timeout)
+        else:
+            response = pool.request(verb, url, timeout=timeout)
+        return response.status, response.headers, response.data
+
+
+def request_key(verb: str, url: str, fields: Optional[Dict]) -> str:
+    """Returns the key matching a request to its recording, which leaves out credentials
+
+    Parameters
+    ----------
+    verb: str
+        The HTTP verb of the request
+    url: str
+        The full url of the request
+    fields: dictionary
+        Fields sent with the request
+
+    Returns
+    -------
+    The key of the request
+    """
+    parts = urlsplit(url)
+    method = parts.path.split("/v4/", 1)[-1]
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in AUTH_PARAMS
+    )
+    fields = sorted((str(name), str(value)) for name, value in (fields or {}).items())
+    return json.dumps([verb, method, query, fields])
+
+
+class RecordingTransport:
+    def __init__(self, path: str, transport: Optional[Urllib3Transport] = None) -> None:
+        """Sends requests through another transport and appends every exchange to a cassette
+
+        Parameters
+        ----------
+        path: str
+            The path of the cassette, appended to if it exists
+        transport: Urllib3Transport, default=None
+            The transport sending the requests, a new Urllib3Transport if None
+        """
+        self.path = path
+        self.transport = transport or Urllib3Transport()
+        self.recorded = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        verb: str,
+        url: str,
+        fields: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Mapping, bytes]:
+        """Sends a request and records its response, see Urllib3Transport.request"""
+        status, headers, body = self.transport.request(verb, url, fields, timeout)
+        exchange = {
+            "key": request_key(verb, url, fields),
+            "status": status,
+            "headers": _recorded_headers(headers),
+            "body": body.decode("utf-8", "surrogateescape"),
+        }
+        line = json.dumps(exchange) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.recorded += 1
+        return status, headers, body
+
+    def close(self) -> None:
+        """Closes the cassette"""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "RecordingTransport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ReplayTransport:
+    def __init__(self, path: str) -> None:
+        """Answers requests from a cassette written by RecordingTransport, without any network
+
+        Requests are matched on their verb, method, parameters and fields, ignoring
+        credentials. A request recorded several times gets its responses in the order they
+        were recorded, then the last one again. A request never recorded gets a 404.
+
+        Parameters
+        ----------
+        path: str
+            The path of the cassette
+        """
+        self.path = path
+        self.replayed = 0
+        self.misses = 0
+        self._exchanges: Dict[str, List[Tuple[int, Dict, bytes]]] = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                exchange = json.loads(line)
+                self._exchanges.setdefault(exchange["key"], []).append(
+                    (
+                        exchange["status"],
+                        exchange["headers"],
+                        exchange["body"].encode("utf-8", "surrogateescape"),
+                    )
+                )
+
+    def request(
+        self,
+        verb: str,
+        url: str,
+        fields: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Mapping, bytes]:
+        """Returns the recorded response of a request, see Urllib3Transport.request"""
+        key = request_key(verb, url, fields)
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                self.misses += 1
+                body = json.dumps(
+                    {
+                        "meta": {
+                            "code": 404,
+                            "error_type": "not_recorded",
+                            "error_detail": f"No recorded response for {key}",
+                        }
+                    }
+                ).encode("utf-8")
+                return 404, _Headers(), body
+            position = self._positions.get(key, 0)
+            self._positions[key] = min(position + 1, len(exchanges) - 1)
+            self.replayed += 1
+        status, headers, body = exchanges[position]
+        return status, _Headers(headers), body
@@ -1,13 +1,27 @@
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Union
 
 from UntappdAPI import UntappdAPI
+from Untappd_Models import (
+    Badge,
+    Beer,
+    User,
+    badge_models,
+    friend_model,
+    friend_models,
+    listed_beer_model,
+    listed_beer_models,
+)
+from Untappd_Pagination import OffsetIterator
 
 
 class UntappdUserInfo(UntappdAPI):
     def __init__(self, client_id: str, client_secret: str) -> None:
         super().__init__(client_id, client_secret)
 
-    def user_badges(self, username: str, offset: Optional[int] = None) -> Dict:
+    def user_badges(
+        self, username: str, offset: Optional[int] = None, model: bool = False
+    ) -> Union[Dict, List[Badge]]:
         """Returns a dictionary of the users badges
 
         Parameters
@@ -16,21 +30,27 @@ class UntappdUserInfo(UntappdAPI):
             The username of the user
         offset: int, default=None
             The numeric offset where the results start (optional)
+        model: bool, default=False
+            Return the badges as a list of Badge models (optional)
 
         Returns
         -------
-        A dictionary of the users' badges
+        A dictionary of the users' badges, or a list of Badge if model is True
         """
         method = "user/badges/" + username
         auth = self._get_access_token()
         params = {}
         if offset:
             params["offset"] = offset
-        return self._do_get(method, auth, params)
+        return self._do_get(method, auth, params, model=badge_models if model else None)
 
     def user_friends(
-        self, username: str, offset: Optional[int] = None, limit: Optional[int] = None
-    ) -> Dict:
+        self,
+        username: str,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[User]]:
         """Returns a dictionary of the users' friends
 
         Parameters
@@ -41,10 +61,12 @@ class UntappdUserInfo(UntappdAPI):
             The numeric offset where the results start (optional)
         limit: int, default=None
             Number of results to return (optional)
+        model: bool, default=False
+            Return the friends as a list of User models (optional)
 
         Returns
         -------
-        A dictionary of the users' friends
+        A dictionary of the users' friends, or a list of User if model is True
         """
         method = "user/friends/" + username
         auth = self._get_api_auth_token()
@@ -53,11 +75,17 @@ class UntappdUserInfo(UntappdAPI):
             params["offset"] = offset
         if limit:
             params["limit"] = limit
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=friend_models if model else None
+        )
 
     def user_wishlist(
-        self, username: str, sort: Optional[str] = None, offset: Optional[int] = None
-    ) -> Dict:
+        self,
+        username: str,
+        sort: Optional[str] = None,
+        offset: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Beer]]:
         """Returns a dictionary of the users wishlisted beers
 
         Parameters
@@ -68,10 +96,12 @@ class UntappdUserInfo(UntappdAPI):
             The value by which to sort the list (optional)
         offset: int, default=None
             The numeric offset where the results start (optional)
+        model: bool, default=False
+            Return the beers as a list of Beer models, with their breweries (optional)
 
         Returns
         -------
-        A dictionary of the users' wishlisted beers
+        A dictionary of the users' wishlisted beers, or a list of Beer if model is True
         """
         method = "user/wishlist/" + username
         auth = self._get_api_auth_token()
@@ -80,11 +110,17 @@ class UntappdUserInfo(UntappdAPI):
             params["sort"] = sort
         if offset:
             params["offset"] = offset
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=listed_beer_models if model else None
+        )
 
     def user_distinct_beers(
-        self, username: str, sort: Optional[str] = None, offset: Optional[int] = None
-    ):
+        self,
+        username: str,
+        sort: Optional[str] = None,
+        offset: Optional[int] = None,
+        model: bool = False,
+    ) -> Union[Dict, List[Beer]]:
         """Returns a list of the distinct beers a user has had
 
         Parameters
@@ -95,10 +131,12 @@ class UntappdUserInfo(UntappdAPI):
             The value by which to sort the list (optional)
         offset: int, default=None
             The numeric offset where the results start (optional)
+        model: bool, default=False
+            Return the beers as a list of Beer models, with their breweries (optional)
 
         Returns
         -------
-        A dictionary of the distinct beers a users has had
+        A dictionary of the distinct beers a users has had, or a list of Beer if model is True
         """
         method = "user/beers/" + username
         auth = self._get_api_auth_token()
@@ -107,10 +145,174 @@ class UntappdUserInfo(UntappdAPI):
             params["sort"] = sort
         if offset:
             params["offset"] = offset
-        return self._do_get(method, auth, params)
+        return self._do_get(
+            method, auth, params, model=listed_beer_models if model else None
+        )
 
     def user_notifications(self) -> Dict:
         """Returns a dictionary of notifications for a user"""
         method = "notifications"
         auth = self._get_access_token()
         return self._do_get(method, auth, {}, None)
+
+    def iter_badges(
+        self,
+        username: str,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> OffsetIterator:
+        """Iterates over the badges of a user one badge at a time
+
+        Parameters
+        ----------
+        username: str
+            The username of the user
+        max_items: int, default=None
+            Stop after this many badges (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Badge models instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of badge dictionaries, or of Badge if model is True
+        """
+        return OffsetIterator(
+            lambda offset: self.user_badges(username, offset),
+            ["response", "items"],
+            resume_token=resume_token,
+            prefetch=prefetch,
+            max_items=max_items,
+            model=Badge.from_dict if model else None,
+        )
+
+    def iter_friends(
+        self,
+        username: str,
+        limit: Optional[int] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> OffsetIterator:
+        """Iterates over the friends of a user one friend at a time
+
+        Parameters
+        ----------
+        username: str
+            The username of the user
+        limit: int, default=None
+            Number of results to fetch per request (optional)
+        max_items: int, default=None
+            Stop after this many friends (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield User models instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of friend dictionaries, or of User if model is True
+        """
+        return OffsetIterator(
+            lambda offset: self.user_friends(username, offset, limit),
+            ["response", "items"],
+            resume_token=resume_token,
+            prefetch=prefetch,
+            max_items=max_items,
+            model=friend_model if model else None,
+        )
+
+    def iter_wishlist(
+        self,
+        username: str,
+        sort: Optional[str] = None,
+        until: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> OffsetIterator:
+        """Iterates over the wishlisted beers of a user one beer at a time
+
+        Parameters
+        ----------
+        username: str
+            The username of the user
+        sort: str, default=None
+            The value by which to sort the list (optional)
+        until: datetime, default=None
+            Stop at the first beer wishlisted before this, when sorted newest first (optional)
+        max_items: int, default=None
+            Stop after this many beers (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Beer models, with their breweries, instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of wishlisted beer dictionaries, or of Beer if model is True
+        """
+        return OffsetIterator(
+            lambda offset: self.user_wishlist(username, sort, offset),
+            ["response", "beers", "items"],
+            resume_token=resume_token,
+            prefetch=prefetch,
+            max_items=max_items,
+            until=until,
+            model=listed_beer_model if model else None,
+        )
+
+    def iter_distinct_beers(
+        self,
+        username: str,
+        sort: Optional[str] = None,
+        until: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        resume_token: Optional[int] = None,
+        prefetch: int = 0,
+        model: bool = False,
+    ) -> OffsetIterator:
+        """Iterates over the distinct beers a user has had one beer at a time
+
+        Parameters
+        ----------
+        username: str
+            The username of the user
+        sort: str, default=None
+            The value by which to sort the list (optional)
+        until: datetime, default=None
+            Stop at the first beer last had before this, when sorted newest first (optional)
+        max_items: int, default=None
+            Stop after this many beers (optional)
+        resume_token: int, default=None
+            The resume_token of an earlier iterator to continue from (optional)
+        prefetch: int, default=0
+            The number of pages to fetch ahead while the current page is consumed (optional)
+        model: bool, default=False
+            Yield Beer models, with their breweries, instead of dictionaries (optional)
+
+        Returns
+        -------
+        An iterator of distinct beer dictionaries, or of Beer if model is True
+        """
+        return OffsetIterator(
+            lambda offset: self.user_distinct_beers(username, sort, offset),
+            ["response", "beers", "items"],
+            resume_token=resume_token,
+            prefetch=prefetch,
+            max_items=max_items,
+            until=until,
+            date_key="recent_created_at",
+            model=listed_beer_model if model else None,
+        )
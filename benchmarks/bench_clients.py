@@ -0,0 +1,172 @@
+"""Benchmark of every client class against the local stand-in server
+
+Measures the requests per second and latency percentiles of representative calls of
+UntappdAPI, UntappdFeed, UntappdGeneralInfo, UntappdUserInfo, UntappdFriends and
+UntappdUserActions, the memory allocated per call, the cost of decoding large feed
+payloads, and the overhead of resolving names to ids. Run with
+`python benchmarks/bench_clients.py --output results.json`, and pass an earlier file to
+`--compare` to see the change.
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import common  # noqa: F401, sets up the import path
+
+from UntappdAPI import UntappdAPI  # noqa: E402
+from Untappd_Feed import UntappdFeed  # noqa: E402
+from Untappd_Friends import UntappdFriends  # noqa: E402
+from Untappd_General_Info import UntappdGeneralInfo  # noqa: E402
+from Untappd_Name_Store import NameResolutionStore  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+from Untappd_User_Actions import UntappdUserActions  # noqa: E402
+from Untappd_User_Info import UntappdUserInfo  # noqa: E402
+
+
+def client(cls, server: FakeUntappdServer, auth: bool = False):
+    """Returns a client of a class pointed at the server"""
+    result = cls("benchmark", "secret")
+    result.url = server.url
+    if auth:
+        result.set_auth("token")
+    return result
+
+
+def allocated_per_call(call: Callable[[int], object], calls: int = 20) -> float:
+    """Returns the median peak of memory allocated by a call in KiB"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(calls):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call(i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return common.percentile(peaks, 50) / 1024.0
+
+
+def cases(server: FakeUntappdServer, store: NameResolutionStore) -> Dict[str, Callable]:
+    """Returns the calls to benchmark by name, each taking the index of the call"""
+    api = client(UntappdAPI, server)
+    feed = client(UntappdFeed, server, auth=True)
+    info = client(UntappdGeneralInfo, server)
+    stored = client(UntappdGeneralInfo, server)
+    stored.set_name_store(store)
+    user = client(UntappdUserInfo, server, auth=True)
+    friends = client(UntappdFriends, server, auth=True)
+    actions = client(UntappdUserActions, server, auth=True)
+    return {
+        "UntappdAPI.beer_search": lambda i: api.beer_search(f"Beer {i % 50}"),
+        "UntappdAPI.venue_search": lambda i: api.venue_search(f"Venue {i % 50}"),
+        "UntappdAPI.beer_trending": lambda i: api.beer_trending(),
+        "UntappdFeed.beer_feed_id": lambda i: feed.beer_feed_id(
+            str(i % 50 + 1), limit=50
+        ),
+        "UntappdFeed.user_feed": lambda i: feed.user_feed(f"user{i % 50}", limit=50),
+        "UntappdGeneralInfo.beer_info_id": lambda i: info.beer_info_id(str(i + 1)),
+        "UntappdGeneralInfo.user_info": lambda i: info.user_info(f"user{i}"),
+        "UntappdGeneralInfo.beer_info_name": lambda i: info.beer_info_name(
+            f"Beer {i}", "Brewery"
+        ),
+        "UntappdGeneralInfo.beer_info_name[store]": lambda i: stored.beer_info_name(
+            f"Beer {i % 10}", "Brewery"
+        ),
+        "UntappdUserInfo.user_badges": lambda i: user.user_badges(f"user{i % 50}"),
+        "UntappdUserInfo.user_distinct_beers": lambda i: user.user_distinct_beers(
+            f"user{i % 50}"
+        ),
+        "UntappdFriends.pending_friends": lambda i: friends.pending_friends(),
+        "UntappdFriends.request_friend": lambda i: friends.request_friend(f"user{i}"),
+        "UntappdUserActions.toast": lambda i: actions.toast(str(i + 1)),
+        "UntappdUserActions.add_comment": lambda i: actions.add_comment(
+            str(i + 1), "Cheers"
+        ),
+    }
+
+
+def concurrent(server: FakeUntappdServer, calls: int, threads: int) -> Dict:
+    """Returns the throughput of beer_info_id called from several threads"""
+    info = client(UntappdGeneralInfo, server)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda i: info.beer_info_id(str(i + 1)), range(calls)))
+    elapsed = time.perf_counter() - started
+    return {
+        "name": f"UntappdGeneralInfo.beer_info_id[{threads} threads]",
+        "calls": calls,
+        "per_second": calls / elapsed,
+    }
+
+
+def decode(server: FakeUntappdServer) -> List[Dict]:
+    """Returns the cost of decoding feed payloads of increasing size"""
+    info = client(UntappdGeneralInfo, server)
+    page = server.feed("beer/checkins/1", {"limit": "50"})
+    results = []
+    for pages in (1, 10, 40):
+        items = page["checkins"]["items"] * pages
+        body = json.dumps(
+            {
+                "meta": {"code": 200},
+                "response": {"checkins": {"count": len(items), "items": items}},
+            }
+        ).encode("utf-8")
+        runs = max(5, 200 // pages)
+        started = time.perf_counter()
+        for _ in range(runs):
+            info._decode("beer/checkins/1", 200, {}, body)
+        seconds = (time.perf_counter() - started) / runs
+        results.append(
+            {
+                "name": f"decode feed {len(body) // 1024} KiB",
+                "bytes": len(body),
+                "ms": seconds * 1e3,
+                "mb_per_second": len(body) / seconds / 1e6,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--calls", type=int, default=300, help="calls per case")
+    args.add_argument("--threads", type=int, default=8)
+    args = args.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as directory, FakeUntappdServer(
+        rate_limit=10**9, window=3600
+    ) as server:
+        store = NameResolutionStore(os.path.join(directory, "names.db"))
+        for name, call in cases(server, store).items():
+            result = {"name": name}
+            result.update(common.time_calls(call, args.calls))
+            result["alloc_kib_per_call"] = allocated_per_call(call)
+            results.append(result)
+        by_name = {result["name"]: result for result in results}
+        results.append(
+            {
+                "name": "name resolution overhead",
+                "p50_ms": by_name["UntappdGeneralInfo.beer_info_name"]["p50_ms"]
+                - by_name["UntappdGeneralInfo.beer_info_id"]["p50_ms"],
+                "p50_ms_with_store": by_name[
+                    "UntappdGeneralInfo.beer_info_name[store]"
+                ]["p50_ms"]
+                - by_name["UntappdGeneralInfo.beer_info_id"]["p50_ms"],
+            }
+        )
+        results.append(concurrent(server, args.calls * 4, args.threads))
+        results.extend(decode(server))
+        store.close()
+    common.report("clients", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark of resumable crawls with Untappd_Crawl against the local server
+
+Crawls the feeds, distinct beers and badges of many users by walking the iterators
+directly and with CrawlRunner on one and several workers, to measure the cost of
+checkpointing every page, then crawls again failing halfway through and resuming from the
+store, counting the requests against those of the uninterrupted crawl. Run with
+`python benchmarks/bench_crawl.py --users 200 --output results.json`.
+"""
+
+import os
+import tempfile
+import time
+
+from typing import Dict, List, Tuple
+
+import common
+
+from Untappd_Crawl import ENDPOINTS, CrawlRunner, CrawlStore  # noqa: E402
+from Untappd_Feed import UntappdFeed  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+from Untappd_User_Info import UntappdUserInfo  # noqa: E402
+
+
+class Stop(Exception):
+    """Raised by the sink to stop a crawl as a crash would"""
+
+
+def clients(server: FakeUntappdServer) -> List:
+    """Returns a feed and a user info client pointed at the server"""
+    result = []
+    for cls in (UntappdFeed, UntappdUserInfo):
+        client = cls("benchmark", "secret")
+        client.url = server.url
+        client.set_auth("token")
+        result.append(client)
+    return result
+
+
+def units(users: int) -> List[Tuple[str, str]]:
+    """Returns the work units of a crawl of users"""
+    return [
+        (endpoint, f"user{i}")
+        for i in range(users)
+        for endpoint in ("user_feed", "user_distinct_beers", "user_badges")
+    ]
+
+
+def plain(server: FakeUntappdServer, users: int) -> Dict:
+    """Returns the time and requests of walking every unit with the iterators alone"""
+    feed, user_info = clients(server)
+    requests = server.requests
+    started = time.perf_counter()
+    for endpoint, entity_id in units(users):
+        method, takes_limit = ENDPOINTS[endpoint]
+        client = feed if hasattr(feed, method) else user_info
+        kwargs = {"limit": 50} if takes_limit else {}
+        for _ in getattr(client, method)(entity_id, **kwargs):
+            pass
+    seconds = time.perf_counter() - started
+    return {"seconds": seconds, "requests": server.requests - requests}
+
+
+def crawl(server: FakeUntappdServer, users: int, workers: int, stop: int) -> Dict:
+    """Returns the time and requests of a crawl, stopped after stop pages and resumed"""
+    path = tempfile.mktemp(suffix=".db")
+    store = CrawlStore(path)
+    store.add(units(users))
+    handed = [0]
+
+    def sink(endpoint: str, entity_id: str, items: List) -> None:
+        handed[0] += 1
+        if handed[0] == stop:
+            raise Stop()
+
+    requests = server.requests
+    started = time.perf_counter()
+    runner = CrawlRunner(clients(server), store, sink, workers, 50)
+    results = list(runner.run())
+    stopped = store.progress()
+    # A fresh runner, as after a restart, picks the crawl up from the store
+    runner = CrawlRunner(clients(server), store, sink, workers, 50)
+    results += list(runner.run(retry_failed=True))
+    seconds = time.perf_counter() - started
+    progress = store.progress()
+    store.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return {
+        "seconds": seconds,
+        "requests": server.requests - requests,
+        "done_when_stopped": stopped["done"],
+        "done": progress["done"],
+        "items": progress["items"],
+    }
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--users", type=int, default=200)
+    args.add_argument("--workers", type=int, default=4)
+    args = args.parse_args()
+    results = []
+    with FakeUntappdServer(rate_limit=10**9) as server:
+        baseline = plain(server, args.users)
+        results.append(dict(name="iterators, one at a time", **baseline))
+        for workers, stop, name in (
+            (1, 0, "CrawlRunner 1 worker"),
+            (args.workers, 0, f"CrawlRunner {args.workers} workers"),
+            (
+                args.workers,
+                1000,
+                f"CrawlRunner {args.workers} workers, failed and resumed",
+            ),
+        ):
+            result = crawl(server, args.users, workers, stop)
+            result["extra_requests"] = result["requests"] - baseline["requests"]
+            results.append(dict(name=name, **result))
+    common.report("crawl", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark of converting check-ins to DataFrames with Untappd_Frame
+
+Compares checkins_to_frame with the per-row flattening users wrote by hand,
+pd.json_normalize followed by typing the columns, on check-ins decoded from feed pages of
+the local stand-in server. Run with
+`python benchmarks/bench_frame.py --checkins 1000000 --output results.json`.
+"""
+
+import json
+import time
+
+from typing import Dict, List
+
+import common
+
+from Untappd_Frame import checkins_to_frame  # noqa: E402
+from Untappd_Models import Checkin  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+
+
+def decoded_checkins(checkins: int) -> List[Dict]:
+    """Returns a number of decoded check-ins, made of 20000 distinct ones repeated"""
+    with FakeUntappdServer() as server:
+        pages = [
+            server.handle_api("GET", f"user/checkin/user{i}", {"limit": "50"})[1]
+            for i in range(400)
+        ]
+    # Decode the pages again so no strings are shared between check-ins
+    pages = json.loads(json.dumps(pages))
+    items = [item for page in pages for item in page["response"]["checkins"]["items"]]
+    return (items * (checkins // len(items) + 1))[:checkins]
+
+
+def json_normalize(items: List[Dict]):
+    """The hand-written flattening: pd.json_normalize, then typing the columns"""
+    import pandas as pd
+
+    frame = pd.json_normalize(items)
+    frame["created_at"] = pd.to_datetime(
+        frame["created_at"], format="%a, %d %b %Y %H:%M:%S %z", utc=True
+    )
+    for column in ("beer.beer_style", "brewery.brewery_name", "venue.venue_name"):
+        frame[column] = frame[column].astype("category")
+    return frame
+
+
+def measure(name: str, convert, items: List) -> Dict:
+    """Returns the time and memory of converting items"""
+    started = time.perf_counter()
+    frame = convert(items)
+    seconds = time.perf_counter() - started
+    return {
+        "name": name,
+        "rows": len(frame),
+        "seconds": seconds,
+        "seconds_per_million": seconds / len(items) * 1e6,
+        "frame_mb": frame.memory_usage(deep=True).sum() / 1e6,
+    }
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--checkins", type=int, default=1000000)
+    args.add_argument(
+        "--baseline-checkins",
+        type=int,
+        default=100000,
+        help="check-ins converted with json_normalize, which is much slower",
+    )
+    args = args.parse_args()
+    items = decoded_checkins(args.checkins)
+    results = [
+        measure(
+            f"json_normalize {args.baseline_checkins}",
+            json_normalize,
+            items[: args.baseline_checkins],
+        ),
+        measure(f"checkins_to_frame {len(items)}", checkins_to_frame, items),
+    ]
+    models = [Checkin.from_dict(item) for item in items]
+    results.append(
+        measure(f"checkins_to_frame {len(models)} models", checkins_to_frame, models)
+    )
+    common.report("frame", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
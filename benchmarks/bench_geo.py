@@ -0,0 +1,94 @@
+"""Benchmark of area coverage with Untappd_Geo against the local server
+
+Counts the circles covering a metro-sized bounding box at several radii, then collects
+every check-in of the box from the local stand-in server's pub feed with PubAreaFeed,
+splitting busy circles after one and several full pages and only paging, and reports the
+requests made, the check-ins found against those the server holds in the box and the
+check-ins returned by more than one circle. Run with
+`python benchmarks/bench_geo.py --output results.json`.
+"""
+
+import time
+
+from typing import Dict, List, Set
+
+import common
+
+import Untappd_Server  # noqa: E402
+
+from Untappd_Feed import UntappdFeed  # noqa: E402
+from Untappd_Geo import MAX_RADIUS, PubAreaFeed, cover_bbox  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+
+# The box the stand-in server spreads its venues over
+BBOX = (45.35, -122.85, 45.65, -122.45)
+
+
+def coverings() -> List[Dict]:
+    """Returns the number of circles covering the box at several radii"""
+    results = []
+    for radius in (MAX_RADIUS, 10, 5, 2, 1):
+        started = time.perf_counter()
+        tiles = cover_bbox(*BBOX, radius=radius)
+        results.append(
+            {
+                "name": f"covering, radius {radius}",
+                "circles": len(tiles),
+                "seconds": time.perf_counter() - started,
+            }
+        )
+    return results
+
+
+def expected(server: FakeUntappdServer) -> Set[int]:
+    """Returns the ids of the check-ins the server holds in the box"""
+    south, west, north, east = BBOX
+    newest = Untappd_Server._PUB_NEWEST
+    result = set()
+    for checkin_id in range(newest, newest - 20 * server.feed_size, -1):
+        lat, lng = Untappd_Server._venue_location(
+            checkin_id % Untappd_Server._VENUES + 1
+        )
+        if south <= lat <= north and west <= lng <= east:
+            result.add(checkin_id)
+    return result
+
+
+def collect(
+    server: FakeUntappdServer, truth: Set[int], name: str, workers: int, **kwargs
+) -> Dict:
+    """Returns the requests and check-ins of collecting the box"""
+    client = UntappdFeed("benchmark", "secret")
+    client.url = server.url
+    feed = PubAreaFeed(client, max_workers=workers, **kwargs)
+    started = time.perf_counter()
+    found = [item["checkin_id"] for item in feed.checkins(BBOX)]
+    seconds = time.perf_counter() - started
+    assert len(found) == len(set(found))
+    return dict(
+        name=name,
+        seconds=seconds,
+        checkins=len(found),
+        missed=len(truth - set(found)),
+        **feed.stats(),
+    )
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--workers", type=int, default=8)
+    args = args.parse_args()
+    results = coverings()
+    with FakeUntappdServer(rate_limit=10**9) as server:
+        truth = expected(server)
+        for name, kwargs in (
+            ("split on the first full page", {"max_pages": 1}),
+            ("split after 4 full pages", {"max_pages": 4}),
+            ("page only", {"min_radius": MAX_RADIUS}),
+        ):
+            results.append(collect(server, truth, name, args.workers, **kwargs))
+    common.report("geo", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
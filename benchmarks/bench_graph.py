@@ -0,0 +1,106 @@
+"""Benchmark of friend graph crawls with Untappd_Graph
+
+Measures the memory per username of NodeIndex against a set of the usernames, and the
+users expanded per second by FriendGraphCrawler with one and several workers, against the
+local stand-in server answering with a latency and drawing friends from a shared pool of
+users. Run with `python benchmarks/bench_graph.py --usernames 1000000 --output results.json`.
+"""
+
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from typing import Dict, List
+
+import common
+
+from Untappd_Graph import FriendGraphCrawler, NodeIndex, read_graph  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+from Untappd_User_Info import UntappdUserInfo  # noqa: E402
+
+
+def held(build) -> int:
+    """Returns the bytes held by what build returns"""
+    tracemalloc.start()
+    kept = build()  # noqa: F841
+    result = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result
+
+
+def visited(usernames: int) -> List[Dict]:
+    """Returns the memory and time of keeping usernames in a set and in a NodeIndex"""
+    names = [f"beer_lover_{i}" for i in range(usernames)]
+
+    def index() -> NodeIndex:
+        result = NodeIndex()
+        for name in names:
+            result.add(name)
+        return result
+
+    results = []
+    for name, build in (("set", lambda: set(names)), ("NodeIndex", index)):
+        started = time.perf_counter()
+        build()
+        seconds = time.perf_counter() - started
+        size = held(build)
+        results.append(
+            {
+                "name": f"{usernames} usernames in a {name}",
+                "mb": size / 1e6,
+                "bytes_per_username": size / usernames,
+                "seconds": seconds,
+            }
+        )
+    # A set only holds references, so count the strings it keeps alive too
+    strings = held(lambda: [f"beer_lover_{i}" for i in range(usernames)])
+    results[0]["mb"] += strings / 1e6
+    results[0]["bytes_per_username"] += strings / usernames
+    return results
+
+
+def crawl(server: FakeUntappdServer, workers: int, depth: int) -> Dict:
+    """Returns the rate of a crawl of the friend graph from one user"""
+    client = UntappdUserInfo("benchmark", "secret")
+    client.url = server.url
+    directory = tempfile.mkdtemp()
+    try:
+        requests = server.requests
+        started = time.perf_counter()
+        with FriendGraphCrawler(client, directory, depth, max_workers=workers) as graph:
+            graph.add_seeds(["user0"])
+            stats = graph.run()
+        seconds = time.perf_counter() - started
+        names, indptr, indices = read_graph(directory)
+        assert len(names) == stats["nodes"] and len(indices) == stats["edges"]
+    finally:
+        shutil.rmtree(directory)
+    return {
+        "name": f"crawl depth {depth}, {workers} workers",
+        "nodes": stats["nodes"],
+        "edges": stats["edges"],
+        "requests": server.requests - requests,
+        "seconds": seconds,
+        "expanded_per_second": stats["expanded"] / seconds,
+    }
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--usernames", type=int, default=1000000)
+    args.add_argument("--latency", type=float, default=0.02, help="seconds per request")
+    args.add_argument("--depth", type=int, default=2)
+    args.add_argument("--workers", type=int, default=8)
+    args = args.parse_args()
+    results = visited(args.usernames)
+    with FakeUntappdServer(
+        rate_limit=10**9, latency=args.latency, list_size=25, friend_pool=20000
+    ) as server:
+        for workers in (1, args.workers):
+            results.append(crawl(server, workers, args.depth))
+    common.report("graph", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
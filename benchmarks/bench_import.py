@@ -0,0 +1,117 @@
+"""Benchmark of the time and memory taken to import the client modules
+
+Every module is imported in fresh interpreters, timing only the import itself, and the
+heavy dependencies it pulled in are listed, so a change making a client load pandas,
+urllib3 or a thread pool at import time shows up. Run with
+`python benchmarks/bench_import.py --output results.json`, and pass `--check` to exit with
+an error if any module loads a dependency it should only load on first use.
+"""
+
+import json
+import subprocess
+import sys
+
+from typing import Dict, List
+
+import common
+
+MODULES = (
+    "UntappdAPI",
+    "Untappd_Feed",
+    "Untappd_General_Info",
+    "Untappd_User_Info",
+    "Untappd_Friends",
+    "Untappd_User_Actions",
+    "Untappd_Async",
+    "Untappd_Sync",
+    "Untappd_Scheduler",
+    "Untappd_Models",
+    "Untappd_Frame",
+    "Untappd_Parquet",
+    "Untappd_Crawl",
+    "Untappd_Graph",
+    "Untappd_Geo",
+)
+
+# Dependencies only loaded by the features needing them, never by importing a client
+DEFERRED = (
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "orjson",
+    "msgspec",
+    "aiohttp",
+    "urllib3",
+    "concurrent.futures",
+    "email.utils",
+    "sqlite3",
+    "http.server",
+)
+
+_CHILD = """
+import json, resource, sys, time
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss
+deferred = {deferred!r}
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_kib": rss,
+    "modules": len(sys.modules),
+    "loaded": [name for name in deferred if name in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, runs: int) -> Dict:
+    """Returns the median import time and memory of a module over runs fresh interpreters"""
+    samples: List[Dict] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(module=module, deferred=DEFERRED)],
+            cwd=common.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(json.loads(output))
+    return {
+        "name": f"import {module}",
+        "ms": common.percentile([sample["seconds"] for sample in samples], 50) * 1e3,
+        "rss_kib": common.percentile([sample["rss_kib"] for sample in samples], 50),
+        "modules": samples[0]["modules"],
+        "loaded": samples[0]["loaded"],
+    }
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--runs", type=int, default=10, help="interpreters per module")
+    args.add_argument(
+        "--check",
+        action="store_true",
+        help="fail if a client module imports a deferred dependency",
+    )
+    args = args.parse_args()
+    results = [measure(module, args.runs) for module in MODULES]
+    common.report("import", results, args.output, args.compare)
+    # asyncio itself loads concurrent.futures, and FeedSync and the crawls keep their
+    # state in sqlite3
+    allowed = {"Untappd_Async": ("concurrent.futures",), "Untappd_Sync": ("sqlite3",)}
+    allowed["Untappd_Scheduler"] = allowed["Untappd_Crawl"] = allowed["Untappd_Sync"]
+    failures = [
+        f"{result['name']} loads {name}"
+        for module, result in zip(MODULES, results)
+        for name in result["loaded"]
+        if name not in allowed.get(module, ())
+    ]
+    for failure in failures:
+        print(failure)
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
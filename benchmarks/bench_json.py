@@ -0,0 +1,83 @@
+"""Benchmark of the JSON decoders on feed and distinct beer payloads
+
+Compares the original `json.loads(body.decode("utf-8"))` with every backend of
+Untappd_Json which is installed, on pages of the local stand-in server joined into
+payloads from tens of KB to a few MB. Run with
+`python benchmarks/bench_json.py --output results.json`.
+"""
+
+import json
+import timeit
+
+from typing import Callable, Dict, List
+
+import common
+
+from Untappd_Json import BACKENDS, get_decoder  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+
+
+def payloads(server: FakeUntappdServer) -> Dict[str, bytes]:
+    """Returns response bodies by name, made of pages of the stand-in server"""
+    checkins = server.handle_api("GET", "beer/checkins/1", {"limit": "50"})[1]
+    beers = server.handle_api("GET", "user/beers/benchmark", {"limit": "50"})[1]
+    result = {}
+    for pages in (1, 10, 50):
+        items = checkins["response"]["checkins"]["items"] * pages
+        body = dict(
+            checkins, response={"checkins": {"count": len(items), "items": items}}
+        )
+        result[f"feed x{pages}"] = json.dumps(body).encode("utf-8")
+        items = beers["response"]["beers"]["items"] * pages
+        body = dict(
+            beers,
+            response={
+                "total_count": len(items),
+                "beers": {"count": len(items), "items": items},
+            },
+        )
+        result[f"distinct beers x{pages}"] = json.dumps(body).encode("utf-8")
+    return result
+
+
+def decoders() -> Dict[str, Callable[[bytes], object]]:
+    """Returns the decoders to compare by name, leaving out backends not installed"""
+    result = {"json.loads(decode)": lambda body: json.loads(body.decode("utf-8"))}
+    for backend in BACKENDS:
+        try:
+            result[backend] = get_decoder(backend)
+        except ImportError:
+            print(f"{backend} is not installed, skipped")
+    return result
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--seconds", type=float, default=0.5, help="time per case")
+    args = args.parse_args()
+    with FakeUntappdServer() as server:
+        bodies = payloads(server)
+    candidates = decoders()
+    results: List[Dict] = []
+    for payload, body in bodies.items():
+        expected = json.loads(body)
+        for name, decode in candidates.items():
+            assert decode(body) == expected
+            runs = max(
+                1, int(args.seconds / timeit.timeit(lambda: decode(body), number=1))
+            )
+            seconds = (
+                min(timeit.repeat(lambda: decode(body), number=runs, repeat=3)) / runs
+            )
+            results.append(
+                {
+                    "name": f"{payload} ({len(body) // 1024} KiB) {name}",
+                    "ms": seconds * 1e3,
+                    "mb_per_second": len(body) / seconds / 1e6,
+                }
+            )
+    common.report("json", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
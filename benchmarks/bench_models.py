@@ -0,0 +1,80 @@
+"""Benchmark of the memory and access time of check-in models against dictionaries
+
+Decodes feed pages of the local stand-in server, as the clients do, and keeps the
+check-ins either as the decoded dictionaries or as Checkin models of Untappd_Models.
+Run with `python benchmarks/bench_models.py --checkins 1000000 --output results.json`.
+"""
+
+import gc
+import json
+import time
+import timeit
+import tracemalloc
+
+from typing import Callable, Dict, List
+
+import common
+
+from Untappd_Json import default_decoder  # noqa: E402
+from Untappd_Models import Checkin  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+
+
+def pages(server: FakeUntappdServer, checkins: int) -> List[bytes]:
+    """Returns encoded feed pages of 50 check-ins from many users, checkins in total"""
+    result = []
+    for i in range(0, checkins, 50):
+        page = server.handle_api(
+            "GET", f"user/checkin/user{i // 50 % 1000}", {"limit": "50"}
+        )[1]
+        result.append(json.dumps(page).encode("utf-8"))
+    return result
+
+
+def keep(bodies: List[bytes], convert: Callable[[Dict], object]) -> List:
+    """Returns the check-ins of the pages, each converted"""
+    decode = default_decoder()
+    kept = []
+    for body in bodies:
+        items = decode(body)["response"]["checkins"]["items"]
+        kept.extend(convert(item) for item in items)
+    return kept
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--checkins", type=int, default=200000)
+    args = args.parse_args()
+    with FakeUntappdServer() as server:
+        bodies = pages(server, args.checkins)
+    results = []
+    for name, convert in (("dict", lambda item: item), ("Checkin", Checkin.from_dict)):
+        gc.collect()
+        started = time.perf_counter()
+        keep(bodies, convert)
+        build = time.perf_counter() - started
+        gc.collect()
+        tracemalloc.start()
+        kept = keep(bodies, convert)
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        if name == "dict":
+            access = lambda: [c["beer"]["beer_style"] for c in kept]  # noqa: E731
+        else:
+            access = lambda: [c.beer.beer_style for c in kept]  # noqa: E731
+        seconds = min(timeit.repeat(access, number=1, repeat=3))
+        results.append(
+            {
+                "name": f"{len(kept)} check-ins as {name}",
+                "held_mb": held / 1e6,
+                "bytes_per_checkin": held / len(kept),
+                "build_seconds": build,
+                "access_ns": seconds / len(kept) * 1e9,
+            }
+        )
+        del kept
+    common.report("models", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
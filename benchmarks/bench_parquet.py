@@ -0,0 +1,124 @@
+"""Benchmark of writing check-in histories to Parquet archives and reading them back
+
+Streams check-ins decoded from feed pages of the local stand-in server through
+CheckinArchiveWriter, measuring the write rate and the peak memory of the Python objects
+and of Arrow, for histories of growing length so the memory can be seen to stay flat, then
+times reading the whole archive against reading two columns of one partition. Run with
+`python benchmarks/bench_parquet.py --checkins 1000000 --output results.json`.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from typing import Dict, Iterator, List
+
+import common
+
+from Untappd_Parquet import CheckinArchiveWriter, read_archive  # noqa: E402
+from Untappd_Server import FakeUntappdServer  # noqa: E402
+
+
+def decoded_checkins() -> List[Dict]:
+    """Returns 20000 distinct decoded check-ins"""
+    with FakeUntappdServer() as server:
+        pages = [
+            server.handle_api("GET", f"user/checkin/user{i}", {"limit": "50"})[1]
+            for i in range(400)
+        ]
+    pages = json.loads(json.dumps(pages))
+    return [item for page in pages for item in page["response"]["checkins"]["items"]]
+
+
+def history(items: List[Dict], count: int) -> Iterator[Dict]:
+    """Returns an iterator over a history of count check-ins, the items repeated"""
+    return itertools.islice(itertools.cycle(items), count)
+
+
+def size(root: str) -> int:
+    """Returns the bytes of the files of an archive"""
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(root)
+        for name in names
+    )
+
+
+def write(root: str, items: List[Dict], count: int, row_group_size: int) -> Dict:
+    """Returns the time and peak memory of writing count check-ins to an archive
+
+    The time is of a first run, and the memory of a second one under tracemalloc, which
+    slows Python down.
+    """
+    import pyarrow
+
+    started = time.perf_counter()
+    with CheckinArchiveWriter(root, row_group_size=row_group_size) as writer:
+        writer.write(history(items, count))
+    seconds = time.perf_counter() - started
+    archive = size(root)
+    shutil.rmtree(root)
+    pool = pyarrow.default_memory_pool()
+    tracemalloc.start()
+    with CheckinArchiveWriter(root, row_group_size=row_group_size) as writer:
+        writer.write(history(items, count))
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "name": f"write {count}",
+        "seconds": seconds,
+        "checkins_per_second": count / seconds,
+        "python_peak_mb": python_peak / 1e6,
+        "arrow_peak_mb": pool.max_memory() / 1e6,
+        "archive_mb": archive / 1e6,
+    }
+
+
+def read(root: str, name: str, **kwargs) -> Dict:
+    """Returns the time of reading an archive"""
+    started = time.perf_counter()
+    table = read_archive(root, **kwargs)
+    seconds = time.perf_counter() - started
+    return {"name": name, "rows": table.num_rows, "ms": seconds * 1e3}
+
+
+def main() -> None:
+    args = common.parser(__doc__.splitlines()[0])
+    args.add_argument("--checkins", type=int, default=1000000)
+    args.add_argument("--row-group-size", type=int, default=65536)
+    args = args.parse_args()
+    items = decoded_checkins()
+    results: List[Dict] = []
+    root = tempfile.mkdtemp()
+    try:
+        for count in (args.checkins // 10, args.checkins):
+            shutil.rmtree(root)
+            results.append(write(root, items, count, args.row_group_size))
+        results.append(read(root, f"read {args.checkins} all columns"))
+        results.append(
+            read(
+                root,
+                "read checkin_id and beer_style of 2023",
+                columns=["checkin_id", "beer_style"],
+                filters=[("year", "=", 2023)],
+            )
+        )
+        results.append(
+            read(
+                root,
+                "read checkin_id of one style",
+                columns=["checkin_id"],
+                filters=[("beer_style", "=", "Stout - Imperial")],
+            )
+        )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    common.report("parquet", results, args.output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark of venue resolution on large synthetic venue search payloads
+
+Compares the original pd.concat loop of UntappdAPI._find_venue_id with the single pass
+ranking it was replaced by. Run with `python benchmarks/bench_venue_resolution.py`.
+"""
+
+import os
+import sys
+import timeit
+
+from typing import Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from UntappdAPI import UntappdAPI  # noqa: E402
+
+
+def make_payload(count: int) -> Dict:
+    """Returns a venue search response with count venues, the last of which is the target"""
+    items = [
+        {
+            "venue_id": i,
+            "venue_name": f"Venue {i}",
+            "venue_address": f"{i} Main Street",
+            "categories": {"count": 1, "items": [{"category_name": "Bar"}]},
+        }
+        for i in range(count)
+    ]
+    return {"response": {"venues": {"count": count, "items": items}}}
+
+
+def concat_loop(data: Dict, address: str) -> str:
+    """The original implementation of UntappdAPI._find_venue_id"""
+    import pandas as pd
+
+    address_df = pd.DataFrame()
+    for j in range(data["response"]["venues"]["count"]):
+        address_df = pd.concat(
+            [
+                address_df,
+                pd.DataFrame.from_dict(data["response"]["venues"]["items"][j]),
+            ]
+        )
+    return address_df.loc[address_df["venue_address"] == address]["venue_id"].iloc[0]
+
+
+def main() -> None:
+    print(
+        f"{'venues':>8} {'concat loop (ms)':>18} {'single pass (ms)':>18} {'speedup':>9}"
+    )
+    for count in (10, 100, 1000, 5000):
+        data = make_payload(count)
+        address = f"{count - 1} Main Street"
+        expected = UntappdAPI._venue_id_from_search(data, f"Venue {count - 1}", address)
+        assert concat_loop(data, address) == expected
+        runs = max(1, 2000 // count)
+        old = timeit.timeit(lambda: concat_loop(data, address), number=runs) / runs
+        new = timeit.timeit(
+            lambda: UntappdAPI._venue_id_from_search(
+                data, f"Venue {count - 1}", address
+            ),
+            number=runs * 10,
+        ) / (runs * 10)
+        print(f"{count:>8} {old * 1e3:>18.3f} {new * 1e3:>18.3f} {old / new:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Helpers shared by the benchmarks: timing statistics and machine-readable results
+
+Every benchmark can write its results as JSON with `--output`, tagged with the commit and
+environment they were measured on, and compare them with an earlier file with
+`--compare`, so runs on different commits can be diffed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Returns the q-th percentile of samples, by the nearest rank"""
+    ordered = sorted(samples)
+    index = min(
+        max(int(round(q / 100.0 * len(ordered) + 0.5)) - 1, 0), len(ordered) - 1
+    )
+    return ordered[index]
+
+
+def time_calls(call: Callable[[int], object], calls: int) -> Dict:
+    """Calls call(i) for i in range(calls) and returns its throughput and latency percentiles"""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(calls):
+        t = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": calls,
+        "per_second": calls / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p90_ms": percentile(latencies, 90) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Returns the commit of the working tree, None outside a git checkout"""
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            or None
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    """Returns an argument parser with the --output and --compare options of every benchmark"""
+    result = argparse.ArgumentParser(description=description)
+    result.add_argument("--output", help="write the results as JSON to this path")
+    result.add_argument(
+        "--compare", help="compare with the results of an earlier --output"
+    )
+    return result
+
+
+def report(
+    benchmark: str,
+    results: List[Dict],
+    output: Optional[str] = None,
+    compare: Optional[str] = None,
+) -> Dict:
+    """Prints results as a table, writes them as JSON and compares them with earlier ones
+
+    Parameters
+    ----------
+    benchmark: str
+        The name of the benchmark
+    results: list of dict
+        One dictionary of metrics per case, each with a "name"
+    output: str, default=None
+        The path to write the JSON results to (optional)
+    compare: str, default=None
+        The path of earlier JSON results to compare with (optional)
+
+    Returns
+    -------
+    The JSON document of the results
+    """
+    document = {
+        "benchmark": benchmark,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+    earlier = {}
+    if compare:
+        with open(compare, encoding="utf-8") as f:
+            earlier = {result["name"]: result for result in json.load(f)["results"]}
+    for result in results:
+        metrics = []
+        for key, value in result.items():
+            if key == "name" or not isinstance(value, (int, float)):
+                continue
+            text = f"{key}={value:.4g}"
+            before = earlier.get(result["name"], {}).get(key)
+            if (
+                key not in ("calls", "bytes")
+                and isinstance(before, (int, float))
+                and before
+            ):
+                text += f" ({value / before:.2f}x)"
+            metrics.append(text)
+        print(f"{result['name']:<40} " + " ".join(metrics))
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    return document
@@ -0,0 +1,87 @@
+import unittest
+
+from UntappdAPI import UntappdAPI
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Server import FakeUntappdServer
+
+
+def _search(*venues):
+    """Returns a venue search response of (venue_id, venue_name, venue_address) tuples"""
+    return {
+        "response": {
+            "venues": {
+                "items": [
+                    {
+                        "venue": {
+                            "venue_id": venue_id,
+                            "venue_name": name,
+                            "location": {"venue_address": address},
+                        }
+                    }
+                    for venue_id, name, address in venues
+                ]
+            }
+        }
+    }
+
+
+class TestAddressMatching(unittest.TestCase):
+    """Test matching venues by address as whole words."""
+
+    def contains(self, address, other):
+        return UntappdAPI._address_contains(
+            UntappdAPI._normalize_address(address), UntappdAPI._normalize_address(other)
+        )
+
+    def test_normalize(self):
+        """Test that case, punctuation and abbreviations are normalized."""
+        self.assertEqual(
+            UntappdAPI._normalize_address("1 North Main Street, Suite 4."),
+            "1 n main st ste 4",
+        )
+
+    def test_whole_words(self):
+        """Test that addresses only contain others as runs of whole words."""
+        self.assertTrue(self.contains("1 Main Street, Portland", "1 Main St"))
+        self.assertTrue(self.contains("1 Main St", "1 Main Street, Portland"))
+        self.assertFalse(self.contains("1 Mainland Street", "1 Main Street"))
+        self.assertFalse(self.contains("1 Main Street", "1 Street Main"))
+        self.assertFalse(self.contains("", "1 Main Street"))
+
+    def test_house_numbers(self):
+        """Test that house numbers must be the same, not merely contained."""
+        self.assertFalse(self.contains("11 Main Street", "1 Main Street"))
+        self.assertFalse(self.contains("1 Main Street", "11 Main Street"))
+        self.assertFalse(self.contains("1 Main Street", "Main Street"))
+        self.assertTrue(self.contains("Main Street Station", "Main Street"))
+
+    def test_rank_venues(self):
+        """Test that exact addresses rank first, then contained ones, then by name."""
+        data = _search(
+            (1, "Other Bar", "11 Main Street"),
+            (2, "Other Bar", "1 Main Street, Portland"),
+            (3, "The Bar", "1 Main Street, Portland"),
+            (4, "Other Bar", "1 Main St."),
+            (5, "The Bar", "1 Mainland Street"),
+        )
+        ranked = UntappdAPI._rank_venues(data, "the  bar", "1 Main Street")
+        self.assertEqual([venue["venue_id"] for venue in ranked], [4, 3, 2])
+
+    def test_no_match(self):
+        """Test that a search without a venue at the address fails clearly."""
+        data = _search((1, "The Bar", "11 Main Street"))
+        with self.assertRaises(ValueError):
+            UntappdAPI._venue_id_from_search(data, "The Bar", "1 Main Street")
+
+    def test_find_venue_id(self):
+        """Test that a venue is found by name and address against the server."""
+        with FakeUntappdServer(rate_limit=10**9) as server:
+            client = UntappdGeneralInfo("id", "secret")
+            client.url = server.url
+            items = client.venue_search("Bar")["response"]["venues"]["items"]
+            venue = items[3]["venue"]
+            address = venue["location"]["venue_address"].upper() + ", Portland"
+            self.assertEqual(client._find_venue_id("Bar", address), venue["venue_id"])
+            number = address.split()[0]
+            with self.assertRaises(ValueError):
+                client._find_venue_id("Bar", number + "0 Main Street")
@@ -0,0 +1,124 @@
+import asyncio
+import importlib.util
+import time
+import unittest
+
+from Untappd_Feed import UntappdFeed
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Rate_Limit import RateLimiter
+from Untappd_Retry import CircuitBreakers, RetryPolicy
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Info import UntappdUserInfo
+
+
+def _client(cls, url: str):
+    """Returns a client of cls authorized as a user"""
+    client = cls("id", "secret")
+    client.url = url
+    client.set_auth("token")
+    return client
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiohttp"), "requires aiohttp")
+class TestAsyncClients(unittest.TestCase):
+    """Test the asyncio clients against the fake server."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_results_match_blocking_clients(self):
+        """Test that awaited calls return what the blocking clients return."""
+        from Untappd_Async import (
+            AsyncUntappdFeed,
+            AsyncUntappdGeneralInfo,
+            AsyncUntappdUserInfo,
+        )
+
+        calls = [
+            (UntappdGeneralInfo, AsyncUntappdGeneralInfo, "beer_info_id", ("7",)),
+            (UntappdGeneralInfo, AsyncUntappdGeneralInfo, "brewery_info_id", ("3",)),
+            (UntappdUserInfo, AsyncUntappdUserInfo, "user_badges", ("someone",)),
+            (UntappdFeed, AsyncUntappdFeed, "user_feed", ("someone",)),
+        ]
+
+        async def run_async():
+            results = []
+            for _, cls, name, args in calls:
+                async with _client(cls, self.server.url) as client:
+                    results.append(await getattr(client, name)(*args))
+            return results
+
+        expected = [
+            getattr(_client(cls, self.server.url), name)(*args)
+            for cls, _, name, args in calls
+        ]
+        self.assertEqual(asyncio.run(run_async()), expected)
+
+    def test_session_is_reused(self):
+        """Test that every request of a client goes through one session until it is closed."""
+        from Untappd_Async import AsyncUntappdGeneralInfo
+
+        async def run():
+            client = _client(AsyncUntappdGeneralInfo, self.server.url)
+            await client.beer_info_id("1")
+            session = client._session
+            await asyncio.gather(*(client.beer_info_id(str(i)) for i in range(10)))
+            self.assertIs(client._session, session)
+            await client.close()
+            self.assertTrue(session.closed)
+            self.assertIsNone(client._session)
+
+        asyncio.run(run())
+
+    def test_iterators_raise_type_error(self):
+        """Test that the iter_* helpers of the blocking clients are refused."""
+        from Untappd_Async import AsyncUntappdFeed, AsyncUntappdUserInfo
+
+        for client, name in (
+            (AsyncUntappdFeed("id", "secret"), "iter_user_feed"),
+            (AsyncUntappdFeed("id", "secret"), "iter_venue_feed"),
+            (AsyncUntappdUserInfo("id", "secret"), "iter_badges"),
+            (AsyncUntappdUserInfo("id", "secret"), "iter_friends"),
+        ):
+            with self.subTest(name=name), self.assertRaises(TypeError):
+                getattr(client, name)("someone")
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiohttp"), "requires aiohttp")
+class TestAsyncCancellation(unittest.TestCase):
+    """Test that cancelling a request propagates as is and gives back what it held."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9, latency=1.0).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_cancellation_propagates_unclassified(self):
+        """Test that a cancelled request is neither classified, retried nor counted as a failure."""
+        from Untappd_Async import AsyncUntappdGeneralInfo
+
+        limiter = RateLimiter(limit=10**6)
+        breakers = CircuitBreakers(failure_threshold=1)
+        retry_policy = RetryPolicy(max_attempts=4, base_delay=0.0)
+
+        async def run():
+            async with _client(AsyncUntappdGeneralInfo, self.server.url) as client:
+                client.set_rate_limiter(limiter)
+                client.set_circuit_breakers(breakers)
+                client.set_retry_policy(retry_policy)
+                task = asyncio.ensure_future(client.beer_info_id("1"))
+                await asyncio.sleep(0.1)
+                task.cancel()
+                started = time.monotonic()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                return time.monotonic() - started
+
+        self.assertLess(asyncio.run(run()), 0.5)
+        self.assertEqual(limiter.state()["in_flight"], 0)
+        self.assertEqual(retry_policy.retries, 0)
+        self.assertEqual(breakers.breaker_for("beer/info/1").state, "closed")
@@ -0,0 +1,175 @@
+import asyncio
+import importlib.util
+import threading
+import time
+import unittest
+
+from Untappd_Batch import run_batch, run_batch_async
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Server import FakeUntappdServer
+
+
+class _Lookup:
+    """A lookup recording its keys and the most lookups running at once"""
+
+    def __init__(self, delay: float = 0.01, failing: str = "") -> None:
+        self.delay = delay
+        self.failing = failing
+        self.keys = []
+        self.running = 0
+        self.most = 0
+        self._lock = threading.Lock()
+
+    def enter(self, key):
+        with self._lock:
+            self.keys.append(key)
+            self.running += 1
+            self.most = max(self.most, self.running)
+
+    def leave(self, key):
+        with self._lock:
+            self.running -= 1
+        if key == self.failing:
+            raise ValueError(f"No {key}")
+        return {"key": key}
+
+    def __call__(self, key):
+        self.enter(key)
+        time.sleep(self.delay)
+        return self.leave(key)
+
+    async def run_async(self, key):
+        self.enter(key)
+        await asyncio.sleep(self.delay)
+        return self.leave(key)
+
+
+def _collect_async(lookup, keys, max_workers):
+    async def collect():
+        return [r async for r in run_batch_async(lookup, keys, max_workers)]
+
+    return asyncio.run(collect())
+
+
+class TestRunBatch(unittest.TestCase):
+    """Test the thread pool batches."""
+
+    def test_keys_are_deduplicated(self):
+        """Test that each distinct key is looked up once."""
+        lookup = _Lookup()
+        results = list(run_batch(lookup, [1, "1", 2, 3, 2, 3], max_workers=2))
+        self.assertEqual(sorted(lookup.keys), ["1", "2", "3"])
+        self.assertEqual(sorted(result.key for result in results), ["1", "2", "3"])
+
+    def test_errors_are_per_item(self):
+        """Test that a failed lookup is yielded with its error and the batch carries on."""
+        lookup = _Lookup(failing="2")
+        results = {r.key: r for r in run_batch(lookup, ["1", "2", "3"], max_workers=2)}
+        self.assertIsInstance(results["2"].error, ValueError)
+        self.assertIsNone(results["2"].result)
+        self.assertEqual(results["3"].result, {"key": "3"})
+        self.assertIsNone(results["3"].error)
+
+    def test_workers_are_bounded(self):
+        """Test that at most max_workers lookups run at once."""
+        lookup = _Lookup()
+        self.assertEqual(len(list(run_batch(lookup, range(40), max_workers=4))), 40)
+        self.assertEqual(lookup.most, 4)
+
+    def test_client_batch(self):
+        """Test a batch of beer lookups against the fake server."""
+        with FakeUntappdServer(rate_limit=10**9) as server:
+            client = UntappdGeneralInfo("id", "secret")
+            client.url = server.url
+            results = list(client.beer_info_many(["1", "2", "2", "3"]))
+            self.assertEqual(server.requests, 3)
+        self.assertEqual(
+            sorted(r.result["response"]["beer"]["bid"] for r in results), [1, 2, 3]
+        )
+
+
+class TestRunBatchAsync(unittest.TestCase):
+    """Test the asyncio batches."""
+
+    def test_keys_are_deduplicated(self):
+        """Test that each distinct key is looked up once."""
+        lookup = _Lookup()
+        results = _collect_async(lookup.run_async, [1, "1", 2, 3, 2, 3], 2)
+        self.assertEqual(sorted(lookup.keys), ["1", "2", "3"])
+        self.assertEqual(sorted(result.key for result in results), ["1", "2", "3"])
+
+    def test_errors_are_per_item(self):
+        """Test that a failed lookup is yielded with its error and the batch carries on."""
+        lookup = _Lookup(failing="2")
+        results = {r.key: r for r in _collect_async(lookup.run_async, "123", 2)}
+        self.assertIsInstance(results["2"].error, ValueError)
+        self.assertEqual(results["3"].result, {"key": "3"})
+
+    def test_workers_are_bounded(self):
+        """Test that at most max_workers lookups are in flight at once."""
+        lookup = _Lookup()
+        self.assertEqual(len(_collect_async(lookup.run_async, range(40), 4)), 40)
+        self.assertEqual(lookup.most, 4)
+
+    def test_results_stream(self):
+        """Test that results are yielded as they complete, before the slowest one."""
+
+        async def lookup(key):
+            await asyncio.sleep(1.0 if key == "slow" else 0.0)
+            return {"key": key}
+
+        async def first():
+            batch = run_batch_async(lookup, ["slow", "1", "2"], 3)
+            started = time.monotonic()
+            result = await batch.__anext__()
+            elapsed = time.monotonic() - started
+            await batch.aclose()
+            return result, elapsed
+
+        result, elapsed = asyncio.run(first())
+        self.assertNotEqual(result.key, "slow")
+        self.assertLess(elapsed, 0.5)
+
+    def test_closing_cancels_lookups(self):
+        """Test that closing the iterator early cancels the lookups in flight."""
+        cancelled = []
+        completed = []
+
+        async def lookup(key):
+            try:
+                await asyncio.sleep(0.0 if key == "0" else 10.0)
+            except asyncio.CancelledError:
+                cancelled.append(key)
+                raise
+            completed.append(key)
+            return {"key": key}
+
+        async def first():
+            batch = run_batch_async(lookup, map(str, range(10)), 4)
+            started = time.monotonic()
+            result = await batch.__anext__()
+            await batch.aclose()
+            return result, time.monotonic() - started
+
+        result, elapsed = asyncio.run(first())
+        self.assertEqual(result.key, "0")
+        self.assertLess(elapsed, 5.0)
+        self.assertEqual(completed, ["0"])
+        self.assertEqual(sorted(cancelled)[:3], ["1", "2", "3"])
+
+    @unittest.skipUnless(importlib.util.find_spec("aiohttp"), "requires aiohttp")
+    def test_client_batch(self):
+        """Test a batch of beer lookups on an async client against the fake server."""
+        from Untappd_Async import AsyncUntappdGeneralInfo
+
+        async def collect(url):
+            async with AsyncUntappdGeneralInfo("id", "secret") as client:
+                client.url = url
+                return [r async for r in client.beer_info_many(["1", "2", "2", "3"])]
+
+        with FakeUntappdServer(rate_limit=10**9) as server:
+            results = asyncio.run(collect(server.url))
+            self.assertEqual(server.requests, 3)
+        self.assertEqual(
+            sorted(r.result["response"]["beer"]["bid"] for r in results), [1, 2, 3]
+        )
@@ -0,0 +1,70 @@
+import time
+import unittest
+
+from Untappd_Cache import ResponseCache, is_write
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Actions import UntappdUserActions
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the expiry and invalidation of cached responses."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9).start()
+        self.reader = UntappdGeneralInfo("id", "secret")
+        self.writer = UntappdUserActions("id", "secret")
+        for client in (self.reader, self.writer):
+            client.url = self.server.url
+            client.set_auth("token")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def set_cache(self, cache):
+        self.reader.set_cache(cache)
+        self.writer.set_cache(cache)
+
+    def test_hit_is_not_sent(self):
+        """Test that a second read of a cached method is answered from the cache."""
+        self.set_cache(ResponseCache())
+        first = self.reader.beer_info_id("1")
+        requests = self.server.requests
+        self.assertIs(self.reader.beer_info_id("1"), first)
+        self.assertEqual(self.server.requests, requests)
+        self.assertEqual(self.reader.cache.hits, 1)
+
+    def test_entry_expires(self):
+        """Test that a response is sent for again once its TTL has passed."""
+        self.set_cache(ResponseCache(ttls={"beer/info/": 0.05}))
+        self.reader.beer_info_id("1")
+        time.sleep(0.1)
+        requests = self.server.requests
+        self.reader.beer_info_id("1")
+        self.assertEqual(self.server.requests - requests, 1)
+
+    def test_write_invalidates(self):
+        """Test that a check-in makes the cached beer information stale."""
+        self.set_cache(ResponseCache())
+        self.reader.beer_info_id("1")
+        self.writer.checkin(0, "UTC", "1")
+        requests = self.server.requests
+        self.reader.beer_info_id("1")
+        self.assertEqual(self.server.requests - requests, 1)
+
+    def test_write_keeps_unrelated_entries(self):
+        """Test that a toast leaves cached beer information in place."""
+        self.set_cache(ResponseCache())
+        self.reader.beer_info_id("1")
+        self.writer.toast("1")
+        requests = self.server.requests
+        self.reader.beer_info_id("1")
+        self.assertEqual(self.server.requests, requests)
+
+    def test_writes_are_matched_exactly(self):
+        """Test that reads named like a write endpoint are not writes."""
+        self.assertTrue(is_write("checkin/add"))
+        self.assertTrue(is_write("checkin/toast/1"))
+        self.assertTrue(is_write("user/wishlist/add"))
+        self.assertFalse(is_write("user/wishlist/addison"))
+        self.assertFalse(is_write("beer/info/1"))
@@ -0,0 +1,159 @@
+import asyncio
+import importlib.util
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from Untappd_Coalesce import SingleFlight
+from Untappd_Deadline import deadline
+from Untappd_Errors import UntappdDeadlineError
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Server import FakeUntappdServer
+
+KEY = ("beer/info/1", "client_id", (), ())
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test coalescing across threads."""
+
+    def test_identical_gets_send_one_request(self):
+        """Test that concurrent identical reads share one request to the server."""
+        with FakeUntappdServer(rate_limit=10**9, latency=0.3) as server:
+            client = UntappdGeneralInfo("id", "secret")
+            client.url = server.url
+            client.set_coalescing(SingleFlight())
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(
+                    executor.map(lambda _: client.beer_info_id("1"), range(8))
+                )
+            self.assertEqual(server.requests, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(client.coalescer.stats(), {"leaders": 1, "coalesced": 7})
+
+    def test_follower_deadline(self):
+        """Test that a follower stops waiting at its own deadline and the leader carries on."""
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            time.sleep(0.5)
+            return {"beer": 1}
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(flight.do, KEY, fetch)
+            started.wait()
+            begun = time.monotonic()
+            with self.assertRaises(UntappdDeadlineError), deadline(0.1):
+                flight.do(KEY, fetch)
+            self.assertLess(time.monotonic() - begun, 0.4)
+            self.assertEqual(leader.result(), {"beer": 1})
+
+    def test_error_is_shared(self):
+        """Test that the waiters get the error of the request they waited for."""
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("Failed")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(flight.do, KEY, fetch)
+            started.wait()
+            with self.assertRaises(ValueError):
+                flight.do(KEY, fetch)
+            self.assertIsInstance(leader.exception(), ValueError)
+
+
+class TestSingleFlightAsync(unittest.TestCase):
+    """Test coalescing within an event loop."""
+
+    @unittest.skipUnless(importlib.util.find_spec("aiohttp"), "requires aiohttp")
+    def test_identical_gets_send_one_request(self):
+        """Test that concurrent identical reads share one request to the server."""
+        from Untappd_Async import AsyncUntappdGeneralInfo
+
+        async def run(url):
+            async with AsyncUntappdGeneralInfo("id", "secret") as client:
+                client.url = url
+                client.set_coalescing(SingleFlight())
+                return await asyncio.gather(
+                    *(client.beer_info_id("1") for _ in range(8))
+                )
+
+        with FakeUntappdServer(rate_limit=10**9, latency=0.3) as server:
+            results = asyncio.run(run(server.url))
+            self.assertEqual(server.requests, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_follower_deadline(self):
+        """Test that a follower stops waiting at its own deadline and the leader carries on."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.5)
+            return {"beer": 1}
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do_async(KEY, fetch))
+            await asyncio.sleep(0)
+            begun = time.monotonic()
+            with self.assertRaises(UntappdDeadlineError):
+                await flight.do_async(KEY, fetch, timeout=0.1)
+            self.assertLess(time.monotonic() - begun, 0.4)
+            self.assertEqual(await leader, {"beer": 1})
+
+        asyncio.run(run())
+
+    def test_cancelling_leader_keeps_followers(self):
+        """Test that cancelling the first caller leaves the others waiting for the response."""
+        flight = SingleFlight()
+        fetches = []
+
+        async def fetch():
+            fetches.append(1)
+            await asyncio.sleep(0.2)
+            return {"beer": 1}
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do_async(KEY, fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do_async(KEY, fetch))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            self.assertEqual(await follower, {"beer": 1})
+
+        asyncio.run(run())
+        self.assertEqual(len(fetches), 1)
+
+    def test_request_cancelled_once_abandoned(self):
+        """Test that the request is cancelled once every caller has given up on it."""
+        flight = SingleFlight()
+
+        async def run():
+            cancelled = asyncio.Event()
+
+            async def fetch():
+                try:
+                    await asyncio.sleep(10.0)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            callers = [
+                asyncio.ensure_future(flight.do_async(KEY, fetch)) for _ in range(2)
+            ]
+            await asyncio.sleep(0.05)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.wait_for(cancelled.wait(), 1.0)
+
+        asyncio.run(run())
+        self.assertEqual(flight.stats(), {"leaders": 1, "coalesced": 1})
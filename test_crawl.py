@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from collections import defaultdict
+
+from Untappd_Crawl import DONE, FAILED, CrawlRunner, CrawlStore
+from Untappd_Feed import UntappdFeed
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Info import UntappdUserInfo
+
+
+def _client(cls, url: str):
+    """Returns a client of cls authorized as a user"""
+    client = cls("id", "secret")
+    client.url = url
+    client.set_auth("token")
+    return client
+
+
+class TestCrawlResume(unittest.TestCase):
+    """Test that a crawl stopped part way resumes without handing over a page twice."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CrawlStore(os.path.join(self.directory.name, "crawl.db"))
+        self.items = defaultdict(list)
+
+    def tearDown(self):
+        self.directory.cleanup()
+        self.server.stop()
+
+    def sink(self, endpoint, entity_id, items):
+        self.items[(endpoint, entity_id)].extend(
+            item.get("checkin_id", item.get("badge_id")) for item in items
+        )
+
+    def test_resume_after_sink_error(self):
+        """Test that a unit whose sink raised resumes from its last checkpoint."""
+        units = [
+            (e, f"user{i}") for i in range(3) for e in ("user_feed", "user_badges")
+        ]
+        self.assertEqual(self.store.add(units), 6)
+        self.assertEqual(self.store.add(units), 0)
+        calls = 0
+
+        def crashing(endpoint, entity_id, items):
+            nonlocal calls
+            calls += 1
+            if calls == 5:
+                raise RuntimeError("Sink failed")
+            self.sink(endpoint, entity_id, items)
+
+        clients = [_client(c, self.server.url) for c in (UntappdFeed, UntappdUserInfo)]
+        runner = CrawlRunner(clients, self.store, crashing, max_workers=2, limit=50)
+        results = list(runner.run())
+        self.assertEqual(sum(1 for result in results if result.error), 1)
+        self.assertEqual(self.store.progress()[FAILED], 1)
+        runner.sink = self.sink
+        self.assertEqual(list(runner.run()), [])
+        results = list(runner.run(retry_failed=True))
+        self.assertEqual(len(results), 1)
+        self.assertIsNone(results[0].error)
+        progress = self.store.progress()
+        self.assertEqual(progress[DONE], 6)
+        self.assertEqual(progress["items"], sum(map(len, self.items.values())))
+        for key, ids in self.items.items():
+            self.assertEqual(len(ids), len(set(ids)), key)
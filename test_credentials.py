@@ -0,0 +1,64 @@
+import unittest
+
+from Untappd_Credentials import CredentialPool
+from Untappd_Errors import UntappdRateLimitError
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Server import FakeUntappdServer
+
+KEYS = [("first", "secret1"), ("second", "secret2"), ("third", "secret3")]
+
+
+class TestCredentialPool(unittest.TestCase):
+    """Test that requests rotate through the keys of a pool."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=5).start()
+        self.client = UntappdGeneralInfo("first", "secret1")
+        self.client.url = self.server.url
+        self.pool = CredentialPool(KEYS, limit=5)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def requests_by_key(self):
+        return {
+            state.get("client_id", state.get("access_token")): state["requests"]
+            for state in self.pool.state()
+        }
+
+    def test_keys_are_taken_in_turn(self):
+        """Test that idle keys are acquired round robin."""
+        order = [self.pool.acquire().split("&")[0] for _ in range(6)]
+        self.assertEqual(
+            order,
+            ["client_id=first", "client_id=second", "client_id=third"] * 2,
+        )
+
+    def test_pool_exceeds_one_key_budget(self):
+        """Test that a pool of three keys sends three times the budget of one key."""
+        for beer_id in range(5):
+            self.client.beer_info_id(str(beer_id))
+        with self.assertRaises(UntappdRateLimitError):
+            self.client.beer_info_id("5")
+        self.server.stop()
+        self.server = FakeUntappdServer(rate_limit=5).start()
+        self.client.url = self.server.url
+        self.client.set_credential_pool(self.pool)
+        for beer_id in range(15):
+            self.client.beer_info_id(str(beer_id))
+        self.assertEqual(self.server.rejected, 0)
+        self.assertEqual(self.requests_by_key(), {"first": 5, "second": 5, "third": 5})
+        for client_id, client_secret in KEYS:
+            auth = f"client_id={client_id}&client_secret={client_secret}"
+            self.assertGreater(self.pool.rate_limiter_for(auth).peek(), 0)
+
+    def test_access_token_is_pinned(self):
+        """Test that requests made with a user's access token keep it and its budget."""
+        self.client.set_credential_pool(self.pool)
+        self.client.set_auth("user-access-token")
+        for beer_id in range(4):
+            self.client.beer_info_id(str(beer_id))
+        self.assertEqual(
+            self.requests_by_key(),
+            {"first": 0, "second": 0, "third": 0, "user-acc...": 4},
+        )
@@ -0,0 +1,107 @@
+import importlib.util
+import unittest
+
+from Untappd_Feed import UntappdFeed
+from Untappd_Frame import (
+    BEER_COLUMNS,
+    CHECKIN_COLUMNS,
+    beers_to_frame,
+    checkins_to_frame,
+    to_frame,
+)
+from Untappd_Models import checkin_models
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Info import UntappdUserInfo
+
+
+@unittest.skipUnless(importlib.util.find_spec("pandas"), "requires pandas")
+class TestFrames(unittest.TestCase):
+    """Test converting responses to typed DataFrames."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeUntappdServer(rate_limit=10**9).start()
+        feed = UntappdFeed("id", "secret")
+        feed.url = cls.server.url
+        feed.set_auth("token")
+        cls.feed = feed.user_feed("someone", limit=25)
+        user_info = UntappdUserInfo("id", "secret")
+        user_info.url = cls.server.url
+        user_info.set_auth("token")
+        cls.beers = user_info.user_distinct_beers("someone")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def assertKinds(self, frame, columns):
+        import pandas as pd
+
+        self.assertEqual(list(frame.columns), [name for name, _ in columns])
+        for name, kind in columns:
+            dtype = frame[name].dtype
+            if kind == "id":
+                self.assertEqual(dtype, pd.Int64Dtype(), name)
+            elif kind == "datetime":
+                self.assertIsInstance(dtype, pd.DatetimeTZDtype, name)
+                self.assertEqual(str(dtype.tz), "UTC", name)
+            elif kind == "category":
+                self.assertIsInstance(dtype, pd.CategoricalDtype, name)
+            elif kind == "float":
+                self.assertEqual(dtype, float, name)
+            else:
+                self.assertEqual(dtype, pd.StringDtype(), name)
+
+    def test_checkin_dtypes(self):
+        """Test that every check-in column has the dtype of its kind."""
+        frame = checkins_to_frame(self.feed)
+        self.assertEqual(len(frame), 25)
+        self.assertKinds(frame, CHECKIN_COLUMNS)
+        items = self.feed["response"]["checkins"]["items"]
+        self.assertEqual(frame["checkin_id"].tolist(), [i["checkin_id"] for i in items])
+        self.assertEqual(frame["created_at"].iloc[0].tzname(), "UTC")
+
+    def test_beer_dtypes(self):
+        """Test that every beer column has the dtype of its kind."""
+        frame = beers_to_frame(self.beers)
+        self.assertEqual(len(frame), 25)
+        self.assertKinds(frame, BEER_COLUMNS)
+        self.assertEqual(list(to_frame(self.beers).columns), list(frame.columns))
+
+    def test_models_match_dictionaries(self):
+        """Test that check-in models give the same frame as their dictionaries."""
+        from pandas.testing import assert_frame_equal
+
+        models = checkin_models(self.feed)
+        assert_frame_equal(checkins_to_frame(models), checkins_to_frame(self.feed))
+
+    def test_missing_values(self):
+        """Test that missing ids, times and venues become missing values, not errors."""
+        import pandas as pd
+
+        frame = checkins_to_frame(
+            [
+                {"checkin_id": 1, "venue": []},
+                {
+                    "checkin_id": 2,
+                    "created_at": "Sat, 17 Oct 2026 18:04:11 +0000",
+                    "beer": {"bid": 3, "beer_name": "Pale Ale"},
+                },
+            ]
+        )
+        self.assertKinds(frame, CHECKIN_COLUMNS)
+        self.assertIs(frame["bid"].iloc[0], pd.NA)
+        self.assertEqual(frame["bid"].iloc[1], 3)
+        self.assertTrue(pd.isna(frame["created_at"].iloc[0]))
+        self.assertTrue(frame["venue_id"].isna().all())
+        self.assertTrue(frame["lat"].isna().all())
+
+    def test_empty_input(self):
+        """Test that no check-ins give an empty frame with typed columns."""
+        for source in ([], {"response": {"checkins": {"items": []}}}, iter(())):
+            frame = to_frame(source)
+            self.assertEqual(len(frame), 0)
+            self.assertKinds(frame, CHECKIN_COLUMNS)
+        frame = beers_to_frame([])
+        self.assertEqual(len(frame), 0)
+        self.assertKinds(frame, BEER_COLUMNS)
@@ -0,0 +1,139 @@
+import unittest
+
+import Untappd_Server
+
+from Untappd_Feed import UntappdFeed
+from Untappd_Geo import MAX_RADIUS, PubAreaFeed, Tile, cover_polygon, split_tile
+from Untappd_Server import FakeUntappdServer
+
+# The box the fake server spreads its venues over
+BBOX = (45.35, -122.85, 45.65, -122.45)
+
+# Slack for the flat projection the circles are computed on, well under one percent
+TOLERANCE = 1.01
+
+
+def _grid(south, west, north, east, steps=40):
+    """Returns points spread evenly over a bounding box, its edges included"""
+    return [
+        (
+            south + (north - south) * i / steps,
+            west + (east - west) * j / steps,
+        )
+        for i in range(steps + 1)
+        for j in range(steps + 1)
+    ]
+
+
+def _covered(lat, lng, tiles):
+    """Returns whether a point lies within one of the tiles"""
+    return any(
+        Untappd_Server._miles(lat, lng, tile.lat, tile.lng) <= tile.radius * TOLERANCE
+        for tile in tiles
+    )
+
+
+class TestCovering(unittest.TestCase):
+    """Test the circles covering areas and tiles."""
+
+    def test_bbox_is_covered(self):
+        """Test that every point of a bounding box is within a circle of its covering."""
+        for radius in (MAX_RADIUS, 5, 2, 1):
+            tiles = cover_polygon(BBOX, radius)
+            self.assertTrue(all(tile.radius == radius for tile in tiles))
+            for lat, lng in _grid(*BBOX):
+                self.assertTrue(_covered(lat, lng, tiles), (radius, lat, lng))
+
+    def test_polygon_is_covered(self):
+        """Test that every point inside a polygon is within a circle of its covering."""
+        triangle = [(45.0, -123.0), (46.0, -122.0), (45.0, -121.0)]
+        tiles = cover_polygon(triangle, 10)
+        inside = [
+            (lat, lng)
+            for lat, lng in _grid(45.0, -123.0, 46.0, -121.0)
+            if lat - 45.0 <= 1.0 - abs(lng + 122.0)
+        ]
+        self.assertGreater(len(inside), 100)
+        for lat, lng in inside:
+            self.assertTrue(_covered(lat, lng, tiles), (lat, lng))
+        # The circles past the corners of the bounding box are left out
+        self.assertLess(
+            len(tiles), len(cover_polygon((45.0, -123.0, 46.0, -121.0), 10))
+        )
+
+    def test_small_area_takes_one_circle(self):
+        """Test that an area a single circle spans is covered by that circle."""
+        self.assertEqual(len(cover_polygon(BBOX, MAX_RADIUS)), 1)
+
+    def test_invalid_radius(self):
+        """Test that radii pub_feed does not take are refused."""
+        for radius in (0, MAX_RADIUS + 1):
+            with self.assertRaises(ValueError):
+                cover_polygon(BBOX, radius)
+
+    def test_split_tile_covers_parent(self):
+        """Test that the seven circles of a split cover every point of the parent."""
+        for radius in (MAX_RADIUS, 8, 3, 2):
+            tile = Tile(45.5, -122.65, radius)
+            children = split_tile(tile)
+            self.assertEqual(len(children), 7)
+            self.assertTrue(all(child.radius == -(-radius // 2) for child in children))
+            degrees = radius / 69.09 * 1.5
+            for lat, lng in _grid(
+                tile.lat - degrees,
+                tile.lng - degrees * 1.5,
+                tile.lat + degrees,
+                tile.lng + degrees * 1.5,
+            ):
+                if Untappd_Server._miles(lat, lng, tile.lat, tile.lng) <= radius:
+                    self.assertTrue(_covered(lat, lng, children), (radius, lat, lng))
+
+    def test_split_tile_too_small(self):
+        """Test that a circle of one mile cannot be split."""
+        with self.assertRaises(ValueError):
+            split_tile(Tile(45.5, -122.65, 1))
+
+
+class TestPubAreaFeed(unittest.TestCase):
+    """Test collecting the pub feed of an area from the fake server."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9, feed_size=50).start()
+        self.client = UntappdFeed("id", "secret")
+        self.client.url = self.server.url
+
+    def tearDown(self):
+        self.server.stop()
+
+    def expected(self):
+        """Returns the ids of the check-ins the server holds in the box"""
+        south, west, north, east = BBOX
+        newest = Untappd_Server._PUB_NEWEST
+        result = set()
+        for checkin_id in range(newest, newest - 20 * self.server.feed_size, -1):
+            lat, lng = Untappd_Server._venue_location(
+                checkin_id % Untappd_Server._VENUES + 1
+            )
+            if south <= lat <= north and west <= lng <= east:
+                result.add(checkin_id)
+        return result
+
+    def test_pages_then_splits(self):
+        """Test that a full circle is paged, then split, and every check-in comes once."""
+        feed = PubAreaFeed(self.client, max_workers=4, max_pages=2)
+        found = [item["checkin_id"] for item in feed.checkins(BBOX)]
+        stats = feed.stats()
+        self.assertEqual(len(found), len(set(found)))
+        self.assertEqual(set(found), self.expected())
+        self.assertGreater(stats["pages"], 0)
+        self.assertGreater(stats["splits"], 0)
+        self.assertEqual(stats["requests"], self.server.requests)
+
+    def test_min_id(self):
+        """Test that polling from min_id only returns newer check-ins."""
+        min_id = Untappd_Server._PUB_NEWEST - 100
+        feed = PubAreaFeed(self.client)
+        found = {item["checkin_id"] for item in feed.checkins(BBOX, min_id=min_id)}
+        self.assertEqual(
+            found, {checkin_id for checkin_id in self.expected() if checkin_id > min_id}
+        )
@@ -0,0 +1,79 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from Untappd_Graph import FriendGraphCrawler, NodeIndex, read_graph
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Info import UntappdUserInfo
+
+
+class TestNodeIndex(unittest.TestCase):
+    """Test the open addressing index of usernames."""
+
+    def test_ids_are_dense_and_case_insensitive(self):
+        """Test that usernames get ids in order of arrival, ignoring case, across growth."""
+        index = NodeIndex(4)
+        for i in range(1000):
+            self.assertEqual(index.add(f"user{i}"), (i, True))
+        self.assertEqual(index.add("USER5"), (5, False))
+        self.assertEqual(index.get("user999"), 999)
+        self.assertIn("user0", index)
+        self.assertNotIn("someone", index)
+        self.assertEqual(len(index), 1000)
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "read_graph requires numpy")
+class TestGraphResume(unittest.TestCase):
+    """Test that a friend graph crawled in steps matches one crawled in one go."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(
+            rate_limit=10**9, list_size=20, friend_pool=400
+        ).start()
+        self.client = UntappdUserInfo("id", "secret")
+        self.client.url = self.server.url
+        self.client.set_auth("token")
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+        self.server.stop()
+
+    @staticmethod
+    def edges(directory):
+        names, indptr, indices = read_graph(directory)
+        return {
+            (names[node], names[friend])
+            for node in range(len(names))
+            for friend in indices[indptr[node] : indptr[node + 1]]
+        }
+
+    def test_resume_after_interruption(self):
+        """Test that a crawl stopped by an error and by max_expansions resumes exactly."""
+        reference = os.path.join(self.directory.name, "reference")
+        with FriendGraphCrawler(self.client, reference, max_depth=3) as crawler:
+            crawler.add_seeds(["user1", "user2"])
+            expected = crawler.run()
+        resumed = os.path.join(self.directory.name, "resumed")
+        with FriendGraphCrawler(self.client, resumed, max_depth=3) as crawler:
+            crawler.add_seeds(["user1", "user2", "USER1"])
+            self.assertEqual(crawler.run(max_expansions=20)["expanded"], 20)
+        calls = 0
+        crawler = FriendGraphCrawler(self.client, resumed, max_depth=3)
+        friends = crawler.friends
+
+        def failing(username):
+            nonlocal calls
+            calls += 1
+            if calls == 5:
+                raise RuntimeError("Stopped")
+            return friends(username)
+
+        crawler.friends = failing
+        with self.assertRaises(RuntimeError):
+            crawler.run()
+        crawler.close()
+        with FriendGraphCrawler(self.client, resumed, max_depth=3) as crawler:
+            self.assertEqual(crawler.run(), expected)
+        self.assertEqual(self.edges(resumed), self.edges(reference))
@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from UntappdAPI import HEDGE_WORKERS
+from Untappd_Deadline import deadline
+from Untappd_Errors import UntappdDeadlineError
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Hedge import HedgePolicy
+from Untappd_Server import FakeUntappdServer
+
+
+def _client(url: str) -> UntappdGeneralInfo:
+    """Returns a client of the server at url"""
+    client = UntappdGeneralInfo("id", "secret")
+    client.url = url
+    return client
+
+
+class TestDeadlines(unittest.TestCase):
+    """Test that timeouts and deadlines bound calls to a slow server."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9, latency=0.5).start()
+        self.client = _client(self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def assert_bounded(self, call, seconds):
+        started = time.monotonic()
+        with self.assertRaises(UntappdDeadlineError):
+            call()
+        self.assertLess(time.monotonic() - started, seconds)
+
+    def test_deadline(self):
+        """Test that a call inside a deadline fails once the deadline passes."""
+
+        def call():
+            with deadline(0.1):
+                self.client.beer_info_id("1")
+
+        self.assert_bounded(call, 0.4)
+
+    def test_client_timeout(self):
+        """Test that the client's timeout bounds every call."""
+        self.client.set_timeout(0.1)
+        self.assert_bounded(lambda: self.client.beer_info_id("1"), 0.4)
+
+    def test_earliest_deadline_wins(self):
+        """Test that a deadline shorter than the client's timeout is kept."""
+        self.client.set_timeout(5.0)
+
+        def call():
+            with deadline(0.1):
+                self.client.beer_info_id("1")
+
+        self.assert_bounded(call, 0.4)
+
+    def test_generous_deadline(self):
+        """Test that a call finishing before its deadline is answered."""
+        with deadline(5.0):
+            self.assertEqual(
+                self.client.beer_info_id("1")["response"]["beer"]["bid"], 1
+            )
+
+
+class TestHedging(unittest.TestCase):
+    """Test that slow reads are hedged within the extra load allowed."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(
+            rate_limit=10**9, tail_latency=0.2, tail_rate=0.2
+        ).start()
+        self.client = _client(self.server.url)
+        self.policy = HedgePolicy(percentile=50.0, min_samples=5, max_extra=0.1)
+        self.client.set_hedging(self.policy)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_hedges_are_capped(self):
+        """Test that slow reads are raced and the copies stay within max_extra."""
+        for beer_id in range(100):
+            self.client.beer_info_id(str(beer_id))
+        stats = self.policy.stats()
+        self.assertEqual(stats["requests"], 100)
+        self.assertGreater(stats["hedged"], 0)
+        self.assertLessEqual(stats["hedged"], 10)
+        self.assertGreater(stats["hedge_wins"], 0)
+        self.assertLessEqual(self.server.requests, 100 + stats["hedged"])
+
+    def test_primary_threads_are_bounded(self):
+        """Test that concurrent hedged reads never use more than HEDGE_WORKERS primary threads."""
+        for beer_id in range(10):
+            self.client.beer_info_id(str(beer_id))
+        with ThreadPoolExecutor(max_workers=2 * HEDGE_WORKERS) as executor:
+            results = list(
+                executor.map(
+                    lambda beer_id: self.client.beer_info_id(str(beer_id)),
+                    range(4 * HEDGE_WORKERS),
+                )
+            )
+        self.assertEqual(len(results), 4 * HEDGE_WORKERS)
+        primaries = [
+            thread
+            for thread in threading.enumerate()
+            if thread.name.startswith("untappd-hedge-primary")
+        ]
+        self.assertGreater(len(primaries), 0)
+        self.assertLessEqual(len(primaries), HEDGE_WORKERS)
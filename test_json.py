@@ -0,0 +1,78 @@
+import importlib.util
+import json
+import sys
+import unittest
+
+from unittest import mock
+
+import Untappd_Json
+
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Json import BACKENDS, default_decoder, get_decoder
+from Untappd_Server import FakeUntappdServer
+
+BODY = '{"response": {"beer": {"bid": 1, "beer_name": "Ölbier"}}}'.encode("utf-8")
+
+
+def _missing(*names):
+    """Returns a patch making the modules named fail to import"""
+    return mock.patch.dict(sys.modules, {name: None for name in names})
+
+
+class TestDecoders(unittest.TestCase):
+    """Test choosing and falling back between JSON backends."""
+
+    def installed(self):
+        return [
+            name
+            for name in BACKENDS
+            if name == "json" or importlib.util.find_spec(name) is not None
+        ]
+
+    def test_backends_decode_alike(self):
+        """Test that every installed backend decodes bytes, and raises ValueError for bad JSON."""
+        for name in self.installed():
+            with self.subTest(backend=name):
+                decode = get_decoder(name)
+                self.assertEqual(decode(BODY), json.loads(BODY))
+                with self.assertRaises(ValueError):
+                    decode(b'{"response": ')
+
+    def test_auto_falls_back_to_json(self):
+        """Test that the standard library is used without orjson and msgspec."""
+        with _missing("orjson", "msgspec"):
+            self.assertIs(get_decoder("auto"), json.loads)
+            with mock.patch.object(Untappd_Json, "_default", None):
+                self.assertIs(default_decoder(), json.loads)
+                self.assertIs(Untappd_Json._default, json.loads)
+
+    def test_auto_prefers_first_installed(self):
+        """Test that auto skips a missing backend for the next one installed."""
+        if "msgspec" not in self.installed():
+            self.skipTest("requires msgspec")
+        with _missing("orjson"):
+            decode = get_decoder("auto")
+        self.assertIsNot(decode, json.loads)
+        self.assertEqual(decode(BODY), json.loads(BODY))
+
+    def test_missing_backend(self):
+        """Test that asking for a backend which is not installed says how to install it."""
+        with _missing("orjson"):
+            with self.assertRaisesRegex(ImportError, "requirements-speedups.txt"):
+                get_decoder("orjson")
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is refused."""
+        with self.assertRaises(ValueError):
+            get_decoder("simplejson")
+
+    def test_client_decoders(self):
+        """Test that a client gives the same responses whichever decoder it uses."""
+        with FakeUntappdServer(rate_limit=10**9) as server:
+            client = UntappdGeneralInfo("id", "secret")
+            client.url = server.url
+            responses = []
+            for decoder in [None, json.loads] + self.installed():
+                client.set_decoder(decoder)
+                responses.append(client.beer_info_id("1"))
+        self.assertTrue(all(response == responses[0] for response in responses))
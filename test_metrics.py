@@ -0,0 +1,106 @@
+import unittest
+
+from Untappd_Errors import UntappdRateLimitError
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Metrics import Metrics
+from Untappd_Server import FakeUntappdServer
+
+
+def _samples(text):
+    """Returns the samples of a Prometheus text exposition, keyed on name and labels"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestPrometheus(unittest.TestCase):
+    """Test exporting metrics in the Prometheus text format."""
+
+    def test_histogram(self):
+        """Test that latency buckets are cumulative and end with the count and sum."""
+        metrics = Metrics(buckets=(0.1, 1.0))
+        headers = {"X-Ratelimit-Limit": "100", "X-Ratelimit-Remaining": "97"}
+        for seconds in (0.05, 0.5, 0.5, 2.0):
+            metrics.observe_response("beer/info/1", 200, headers, 1000, seconds)
+        metrics.observe_decode("beer/info/2", 0.25)
+        samples = _samples(metrics.to_prometheus())
+        endpoint = 'endpoint="beer/info/{id}"'
+        self.assertEqual(
+            [
+                samples[
+                    f"untappd_request_duration_seconds_bucket{{{endpoint},le={le}}}"
+                ]
+                for le in ('"0.1"', '"1.0"', '"+Inf"')
+            ],
+            [1, 3, 4],
+        )
+        self.assertEqual(
+            samples[f"untappd_request_duration_seconds_count{{{endpoint}}}"], 4
+        )
+        self.assertEqual(
+            samples[f"untappd_request_duration_seconds_sum{{{endpoint}}}"], 3.05
+        )
+        self.assertEqual(
+            samples[f'untappd_requests_total{{{endpoint},status="200"}}'], 4
+        )
+        self.assertEqual(samples[f"untappd_response_bytes_total{{{endpoint}}}"], 4000)
+        self.assertEqual(samples[f"untappd_decode_seconds_sum{{{endpoint}}}"], 0.25)
+        self.assertEqual(samples[f"untappd_decode_seconds_count{{{endpoint}}}"], 1)
+        self.assertEqual(samples[f"untappd_ratelimit_limit{{{endpoint}}}"], 100)
+        self.assertEqual(samples[f"untappd_ratelimit_remaining{{{endpoint}}}"], 97)
+
+    def test_families_are_declared(self):
+        """Test that every family has its help and type once, before its samples."""
+        metrics = Metrics()
+        metrics.observe_response("beer/info/1", 200, {}, 10, 0.01)
+        text = metrics.to_prometheus(prefix="brewing")
+        types = [line for line in text.splitlines() if line.startswith("# TYPE")]
+        self.assertIn("# TYPE brewing_request_duration_seconds histogram", types)
+        self.assertIn("# TYPE brewing_requests_total counter", types)
+        self.assertIn("# TYPE brewing_ratelimit_remaining gauge", types)
+        self.assertEqual(len(types), len(set(types)))
+        self.assertTrue(text.endswith("\n"))
+        # A gauge never reported has no sample rather than a made up one
+        self.assertNotIn("brewing_ratelimit_limit{", text)
+
+    def test_label_escaping(self):
+        """Test that quotes, backslashes and newlines in label values are escaped."""
+        metrics = Metrics()
+        metrics.observe_response('search/"a\\b"\n', 200, {}, 10, 0.01)
+        text = metrics.to_prometheus()
+        self.assertIn('endpoint="search/\\"a\\\\b\\"\\n"', text)
+        self.assertEqual(
+            len([line for line in text.splitlines() if "requests_total{" in line]), 1
+        )
+
+    def test_client_requests(self):
+        """Test that the requests and errors of a client are exported by endpoint."""
+        metrics = Metrics()
+        with FakeUntappdServer(rate_limit=3) as server:
+            client = UntappdGeneralInfo("id", "secret")
+            client.url = server.url
+            client.set_metrics(metrics)
+            for beer_id in ("1", "2", "3"):
+                client.beer_info_id(beer_id)
+            with self.assertRaises(UntappdRateLimitError):
+                client.beer_info_id("4")
+        samples = _samples(metrics.to_prometheus())
+        endpoint = 'endpoint="beer/info/{id}"'
+        self.assertEqual(
+            samples[f'untappd_requests_total{{{endpoint},status="200"}}'], 3
+        )
+        self.assertEqual(
+            samples[f'untappd_requests_total{{{endpoint},status="429"}}'], 1
+        )
+        self.assertEqual(
+            samples[
+                f'untappd_errors_total{{{endpoint},error="UntappdRateLimitError"}}'
+            ],
+            1,
+        )
+        self.assertEqual(samples[f"untappd_ratelimit_remaining{{{endpoint}}}"], 0)
+        # The error body is decoded too, for its error type and detail
+        self.assertEqual(samples[f"untappd_decode_seconds_count{{{endpoint}}}"], 4)
@@ -0,0 +1,103 @@
+import unittest
+
+from datetime import timezone
+
+from Untappd_Feed import UntappdFeed
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Models import Beer, Brewery, Checkin, User, Venue
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Info import UntappdUserInfo
+
+
+class TestModelsFromResponses(unittest.TestCase):
+    """Test building models from the responses of the fake server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeUntappdServer(rate_limit=10**9).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def client(self, cls):
+        client = cls("id", "secret")
+        client.url = self.server.url
+        client.set_auth("token")
+        return client
+
+    def test_beer(self):
+        """Test that a beer model holds the fields of its dictionary."""
+        info = self.client(UntappdGeneralInfo)
+        data = info.beer_info_id("7")["response"]["beer"]
+        beer = info.beer_info_id("7", model=True)
+        self.assertIsInstance(beer, Beer)
+        self.assertEqual(beer.bid, data["bid"])
+        self.assertEqual(beer.beer_name, data["beer_name"])
+        self.assertEqual(beer.beer_abv, data["beer_abv"])
+        self.assertEqual(beer.rating_score, data["rating_score"])
+
+    def test_feed(self):
+        """Test that a feed gives one check-in model per item, with nested models."""
+        feed = self.client(UntappdFeed)
+        items = feed.user_feed("someone", limit=10)["response"]["checkins"]["items"]
+        checkins = feed.user_feed("someone", limit=10, model=True)
+        self.assertEqual(
+            [c.checkin_id for c in checkins], [i["checkin_id"] for i in items]
+        )
+        checkin = checkins[0]
+        self.assertIsInstance(checkin, Checkin)
+        self.assertIsInstance(checkin.user, User)
+        self.assertIsInstance(checkin.beer, Beer)
+        self.assertEqual(checkin.beer.bid, items[0]["beer"]["bid"])
+        self.assertEqual(checkin.created.tzinfo, timezone.utc)
+
+    def test_iterator_models(self):
+        """Test that iterators yield models when asked to."""
+        user_info = self.client(UntappdUserInfo)
+        friends = list(user_info.iter_friends("someone", max_items=5, model=True))
+        self.assertEqual(len(friends), 5)
+        self.assertTrue(all(isinstance(friend, User) for friend in friends))
+
+    def test_checkin_without_venue(self):
+        """Test that the empty list Untappd sends for a missing venue becomes None."""
+        checkin = Checkin.from_dict(
+            {
+                "checkin_id": 1,
+                "created_at": "Sat, 17 Oct 2026 18:04:11 +0000",
+                "venue": [],
+            }
+        )
+        self.assertIsNone(checkin.venue)
+        self.assertIsNone(checkin.beer)
+
+
+class TestModelEquality(unittest.TestCase):
+    """Test comparing and hashing models."""
+
+    def test_equal_models_hash_alike(self):
+        """Test that equal models are equal in sets and as dictionary keys."""
+        first = Beer(1, "Pale Ale", "Pale Ale - American", 5.5)
+        second = Beer(1, "Pale Ale", "Pale Ale - American", 5.5)
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(len({first, second}), 1)
+        self.assertEqual({first: "found"}[second], "found")
+
+    def test_fields_are_compared(self):
+        """Test that models sharing an id but not their fields are different."""
+        self.assertNotEqual(Beer(1, "Pale Ale"), Beer(1, "Stout"))
+        self.assertEqual(len({Beer(1, "Pale Ale"), Beer(1, "Stout")}), 2)
+
+    def test_types_are_compared(self):
+        """Test that models of different types sharing an id are different."""
+        self.assertNotEqual(Brewery(1, "One"), Venue(1, "One"))
+        self.assertEqual(len({Brewery(1, "One"), Venue(1, "One")}), 2)
+        self.assertNotEqual(Beer(1, "Pale Ale"), {"bid": 1, "beer_name": "Pale Ale"})
+
+    def test_to_dict_round_trip(self):
+        """Test that to_dict gives the fields, nested models included."""
+        beer = Beer(1, "Pale Ale", brewery=Brewery(2, "Two"))
+        data = beer.to_dict()
+        self.assertEqual(data["bid"], 1)
+        self.assertEqual(data["brewery"]["brewery_name"], "Two")
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Name_Store import NameResolutionStore
+from Untappd_Server import FakeUntappdServer
+
+
+class TestNameResolutionStore(unittest.TestCase):
+    """Test storing the ids names resolve to."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "names.sqlite")
+        self.store = NameResolutionStore(self.path, max_age=60.0)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_keys_are_normalized(self):
+        """Test that names differing in case and whitespace resolve to the same id."""
+        self.store.put("beer", ("Pliny  the Elder", "Russian River"), 4499)
+        self.assertEqual(
+            self.store.get("beer", (" pliny the ELDER", "russian\triver ")), 4499
+        )
+        self.assertIsNone(self.store.get("brewery", ("Pliny the Elder",)))
+        self.assertIsNone(self.store.get("beer", ("Pliny the Elder", "Other")))
+        # The names of a key stay apart rather than being joined into one
+        self.store.put("beer", ("a b", "c"), 1)
+        self.assertIsNone(self.store.get("beer", ("a", "b c")))
+
+    def test_expiry(self):
+        """Test that an id older than max_age is stale and a newer one is not."""
+        with mock.patch("Untappd_Name_Store.time.time", return_value=1000.0):
+            self.store.put("brewery", ("Russian River",), 5143)
+        with mock.patch("Untappd_Name_Store.time.time", return_value=1059.0):
+            self.assertEqual(self.store.get("brewery", ("Russian River",)), 5143)
+        with mock.patch("Untappd_Name_Store.time.time", return_value=1061.0):
+            self.assertIsNone(self.store.get("brewery", ("Russian River",)))
+            self.store.put("brewery", ("Russian River",), 5143)
+            self.assertEqual(self.store.get("brewery", ("Russian River",)), 5143)
+
+    def test_no_expiry(self):
+        """Test that ids never expire without a max_age."""
+        store = NameResolutionStore(self.path, max_age=None)
+        with mock.patch("Untappd_Name_Store.time.time", return_value=0.0):
+            store.put("venue", ("Bar", "1 Main St"), 7)
+        self.assertEqual(store.get("venue", ("Bar", "1 Main St")), 7)
+        store.close()
+
+    def test_invalidate(self):
+        """Test that invalidating removes one name, a kind, or everything."""
+        self.store.put("beer", ("A", "B"), 1)
+        self.store.put("beer", ("C", "D"), 2)
+        self.store.put("venue", ("E", "F"), 3)
+        self.assertEqual(self.store.invalidate("beer", ("a", "b")), 1)
+        self.assertIsNone(self.store.get("beer", ("A", "B")))
+        self.assertEqual(self.store.invalidate("beer"), 1)
+        self.assertEqual(self.store.invalidate(), 1)
+
+    def test_client_skips_search(self):
+        """Test that a client resolves a stored name without searching again, across stores."""
+        with FakeUntappdServer(rate_limit=10**9) as server:
+            client = UntappdGeneralInfo("id", "secret")
+            client.url = server.url
+            client.set_name_store(self.store)
+            first = client.brewery_info_name("Russian River")
+            self.assertEqual(server.requests, 2)
+            client.set_name_store(NameResolutionStore(self.path))
+            second = client.brewery_info_name("  russian RIVER")
+            self.assertEqual(server.requests, 3)
+            client.name_store.close()
+        self.assertEqual(first, second)
@@ -0,0 +1,174 @@
+import threading
+import time
+import unittest
+
+from Untappd_Feed import UntappdFeed
+from Untappd_Pagination import MaxIdIterator, parse_created_at
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Info import UntappdUserInfo
+
+
+def _client(cls, url: str):
+    """Returns a client of cls authorized as a user"""
+    client = cls("id", "secret")
+    client.url = url
+    client.set_auth("token")
+    return client
+
+
+class TestMaxIdIterator(unittest.TestCase):
+    """Test walking a check-in feed by max_id."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeUntappdServer(rate_limit=10**9, feed_size=90).start()
+        cls.feed = _client(UntappdFeed, cls.server.url)
+        cls.checkins = list(cls.feed.iter_user_feed("someone", limit=25))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    @staticmethod
+    def ids(items):
+        return [item["checkin_id"] for item in items]
+
+    def test_walks_the_whole_feed(self):
+        """Test that every check-in is yielded once, newest first."""
+        ids = self.ids(self.checkins)
+        self.assertEqual(len(ids), 90)
+        self.assertEqual(ids, sorted(set(ids), reverse=True))
+
+    def test_short_page_is_last(self):
+        """Test that a page shorter than the limit ends the walk without another request."""
+        iterator = self.feed.iter_user_feed("someone", limit=25)
+        self.assertEqual(len(list(iterator)), 90)
+        self.assertEqual(iterator.pages, 4)
+
+    def test_max_items(self):
+        """Test that the walk stops after max_items, fetching only the pages needed."""
+        iterator = self.feed.iter_user_feed("someone", limit=25, max_items=30)
+        self.assertEqual(self.ids(iterator), self.ids(self.checkins[:30]))
+        self.assertEqual(iterator.pages, 2)
+
+    def test_min_id(self):
+        """Test that the walk stops at the first check-in at or below the watermark."""
+        min_id = self.checkins[40]["checkin_id"]
+        iterator = self.feed.iter_user_feed("someone", limit=25, min_id=min_id)
+        self.assertEqual(self.ids(iterator), self.ids(self.checkins[:40]))
+
+    def test_until(self):
+        """Test that the walk stops at the first check-in older than until."""
+        until = parse_created_at(self.checkins[60]["created_at"])
+        iterator = self.feed.iter_user_feed("someone", limit=25, until=until)
+        self.assertEqual(self.ids(iterator), self.ids(self.checkins[:61]))
+
+    def test_resume_token(self):
+        """Test that an iterator started from resume_token continues after the last item."""
+        first = self.feed.iter_user_feed("someone", limit=25, max_items=33)
+        head = self.ids(first)
+        rest = self.ids(
+            self.feed.iter_user_feed(
+                "someone", limit=25, resume_token=first.resume_token
+            )
+        )
+        self.assertEqual(head + rest, self.ids(self.checkins))
+
+
+class TestOffsetIterator(unittest.TestCase):
+    """Test walking a user list by offset."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeUntappdServer(rate_limit=10**9, list_size=120).start()
+        cls.user_info = _client(UntappdUserInfo, cls.server.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_short_page_is_last(self):
+        """Test that a page shorter than the first one ends the walk without another request."""
+        iterator = self.user_info.iter_badges("someone")
+        badges = list(iterator)
+        self.assertEqual(len(badges), 120)
+        self.assertEqual(len({badge["badge_id"] for badge in badges}), 120)
+        self.assertEqual(iterator.pages, 5)
+
+    def test_capped_page_size(self):
+        """Test that a limit above the server's cap still walks the whole list."""
+        iterator = self.user_info.iter_friends("someone", limit=100)
+        self.assertEqual(len(list(iterator)), 120)
+        self.assertEqual(iterator.pages, 3)
+
+    def test_max_items_and_resume_token(self):
+        """Test that a walk stopped by max_items resumes right after its last item."""
+        first = self.user_info.iter_badges("someone", max_items=30)
+        head = [badge["badge_id"] for badge in first]
+        self.assertEqual(len(head), 30)
+        self.assertEqual(first.resume_token, 30)
+        rest = [
+            badge["badge_id"]
+            for badge in self.user_info.iter_badges(
+                "someone", resume_token=first.resume_token
+            )
+        ]
+        everything = [
+            badge["badge_id"] for badge in self.user_info.iter_badges("someone")
+        ]
+        self.assertEqual(head + rest, everything)
+
+
+class TestPrefetch(unittest.TestCase):
+    """Test fetching pages ahead on a background thread."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9, feed_size=200).start()
+        self.feed = _client(UntappdFeed, self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    @staticmethod
+    def prefetching():
+        return sum(
+            thread.name == "untappd-prefetch" for thread in threading.enumerate()
+        )
+
+    def test_same_items_as_sequential(self):
+        """Test that prefetching yields the same items as fetching each page when needed."""
+        sequential = list(self.feed.iter_user_feed("someone", limit=25))
+        prefetched = list(self.feed.iter_user_feed("someone", limit=25, prefetch=2))
+        self.assertEqual(len(sequential), 200)
+        self.assertEqual(prefetched, sequential)
+
+    def test_close_cancels_prefetch(self):
+        """Test that closing the iterator early stops the thread fetching ahead."""
+        iterator = self.feed.iter_user_feed("someone", limit=10, prefetch=1)
+        next(iterator)
+        self.assertEqual(self.prefetching(), 1)
+        iterator.close()
+        for _ in range(50):
+            if not self.prefetching():
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.prefetching(), 0)
+        requests = self.server.requests
+        time.sleep(0.3)
+        self.assertEqual(self.server.requests, requests)
+        self.assertLess(iterator.pages, 20)
+
+    def test_fetch_error_is_raised(self):
+        """Test that an error fetching ahead is raised where its page would have been."""
+
+        def fetch(max_id):
+            if max_id is not None:
+                raise ValueError("Page failed")
+            return self.feed.user_feed("someone", limit=25)
+
+        iterator = MaxIdIterator(fetch, prefetch=2, page_size=25)
+        items = []
+        with self.assertRaises(ValueError):
+            for item in iterator:
+                items.append(item)
+        self.assertEqual(len(items), 25)
@@ -0,0 +1,81 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from Untappd_Feed import UntappdFeed
+from Untappd_Frame import CHECKIN_COLUMNS, checkins_to_frame
+from Untappd_Server import FakeUntappdServer
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+class TestCheckinArchive(unittest.TestCase):
+    """Test writing check-ins to a Parquet archive and reading them back."""
+
+    @classmethod
+    def setUpClass(cls):
+        with FakeUntappdServer(rate_limit=10**9, feed_size=300) as server:
+            feed = UntappdFeed("id", "secret")
+            feed.url = server.url
+            feed.set_auth("token")
+            cls.checkins = list(feed.iter_user_feed("someone", limit=50))
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, "archive")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, **kwargs):
+        from Untappd_Parquet import CheckinArchiveWriter
+
+        with CheckinArchiveWriter(self.root, **kwargs) as writer:
+            self.assertEqual(writer.write(iter(self.checkins)), len(self.checkins))
+        self.assertEqual(writer.rows_written, len(self.checkins))
+
+    def test_round_trip(self):
+        """Test that the check-ins read back are those written, across row groups and files."""
+        from Untappd_Parquet import read_archive
+
+        self.write(row_group_size=64, rows_per_file=128, max_open_partitions=1)
+        table = read_archive(self.root, columns=[name for name, _ in CHECKIN_COLUMNS])
+        frame = table.to_pandas().sort_values("checkin_id", ascending=False)
+        expected = checkins_to_frame(self.checkins)
+        self.assertEqual(len(frame), 300)
+        self.assertEqual(frame["checkin_id"].tolist(), expected["checkin_id"].tolist())
+        for column in ("created_at", "beer_name", "venue_city", "lat", "rating_score"):
+            self.assertEqual(
+                frame[column].astype(object).tolist(),
+                expected[column].astype(object).tolist(),
+                column,
+            )
+
+    def test_partition_filter(self):
+        """Test that a filter on the partition columns reads only the matching check-ins."""
+        from Untappd_Parquet import open_archive, read_archive
+
+        self.write(partition_by=("year", "month"))
+        self.assertEqual(sorted(os.listdir(self.root)), ["year=2023", "year=2024"])
+        newest = read_archive(
+            self.root, columns=["checkin_id"], filters=[("year", "=", 2024)]
+        )
+        self.assertEqual(
+            newest.column("checkin_id").to_pylist(), [self.checkins[0]["checkin_id"]]
+        )
+        december = read_archive(
+            self.root,
+            columns=["checkin_id", "month"],
+            filters=[("year", "=", 2023), ("month", "=", 12)],
+        )
+        self.assertEqual(december.num_rows, 299)
+        self.assertEqual(set(december.column("month").to_pylist()), {12})
+        self.assertEqual(open_archive(self.root).count_rows(), 300)
+
+    def test_appending_runs(self):
+        """Test that a second writer adds its files next to those of the first."""
+        from Untappd_Parquet import read_archive
+
+        self.write()
+        self.write()
+        self.assertEqual(read_archive(self.root, columns=["checkin_id"]).num_rows, 600)
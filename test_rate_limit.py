@@ -0,0 +1,67 @@
+import time
+import unittest
+
+from Untappd_General_Info import UntappdGeneralInfo
+from Untappd_Rate_Limit import RateLimiter
+from Untappd_Server import FakeUntappdServer
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test that the rate limiter spreads the budget over the window."""
+
+    def setUp(self):
+        self.now = 0.0
+
+    def limiter(self, **kwargs):
+        return RateLimiter(clock=lambda: self.now, **kwargs)
+
+    def test_even_spacing(self):
+        """Test that requests are spaced by the time left over the requests left."""
+        limiter = self.limiter(limit=10, window=100.0, burst=1)
+        self.assertEqual([limiter.reserve() for _ in range(4)], [0.0, 10.0, 20.0, 30.0])
+
+    def test_burst(self):
+        """Test that up to burst requests are sent back to back after an idle period."""
+        limiter = self.limiter(limit=10, window=100.0, burst=3)
+        self.assertEqual([limiter.reserve() for _ in range(4)], [0.0, 0.0, 0.0, 10.0])
+
+    def test_update_from_headers(self):
+        """Test that the reported limit and remaining budget replace the modelled ones."""
+        limiter = self.limiter(limit=10, window=100.0)
+        limiter.reserve()
+        limiter.update({"X-Ratelimit-Limit": "100", "X-Ratelimit-Remaining": "50"})
+        state = limiter.state()
+        self.assertEqual(state["limit"], 100)
+        self.assertEqual(state["remaining"], 50)
+        self.assertEqual(state["in_flight"], 0)
+
+    def test_malformed_headers_are_ignored(self):
+        """Test that unparsable headers leave the modelled budget as it was."""
+        limiter = self.limiter(limit=10, window=100.0)
+        limiter.reserve()
+        limiter.update({"X-Ratelimit-Limit": "ten", "X-Ratelimit-Remaining": ""})
+        state = limiter.state()
+        self.assertEqual(state["limit"], 10)
+        self.assertEqual(state["remaining"], 9)
+
+    def test_refusal_waits_for_the_window_end(self):
+        """Test that a 429 spends the budget, so the next request waits for a new window."""
+        limiter = self.limiter(limit=10, window=100.0, margin=1.0)
+        limiter.reserve()
+        limiter.update({}, status=429)
+        self.assertEqual(limiter.peek(), 101.0)
+        self.assertEqual(limiter.reserve(), 101.0)
+        self.assertEqual(limiter.state()["remaining"], 9)
+
+    def test_client_is_never_refused(self):
+        """Test that a client pacing its requests stays within the server's budget."""
+        with FakeUntappdServer(rate_limit=4, window=1.0) as server:
+            client = UntappdGeneralInfo("id", "secret")
+            client.url = server.url
+            limiter = RateLimiter(limit=4, window=1.0, burst=1, margin=0.05)
+            client.set_rate_limiter(limiter)
+            started = time.monotonic()
+            for beer_id in range(1, 9):
+                client.beer_info_id(str(beer_id))
+            self.assertGreaterEqual(time.monotonic() - started, 1.0)
+            self.assertGreater(limiter.throttled, 0)
@@ -0,0 +1,164 @@
+import socket
+import unittest
+
+from Untappd_Errors import (
+    CircuitOpenError,
+    UntappdConnectionError,
+    UntappdServerError,
+)
+from Untappd_Retry import CircuitBreaker, CircuitBreakers, RetryPolicy
+from Untappd_Server import FakeUntappdServer
+from Untappd_User_Actions import UntappdUserActions
+from Untappd_User_Info import UntappdUserInfo
+
+
+def _client(cls, url: str):
+    """Returns a client of cls authorized as a user, retrying without waiting"""
+    client = cls("id", "secret")
+    client.url = url
+    client.set_auth("token")
+    client.set_retry_policy(RetryPolicy(max_attempts=4, base_delay=0.0))
+    return client
+
+
+class TestRetries(unittest.TestCase):
+    """Test that failed requests are retried only when that cannot apply a write twice."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9, error_rate=1.0).start()
+        self.actions = _client(UntappdUserActions, self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def assert_sent_once(self, call):
+        requests = self.server.requests
+        with self.assertRaises(UntappdServerError):
+            call()
+        self.assertEqual(self.server.requests - requests, 1)
+        self.assertEqual(self.actions.retry_policy.retries, 0)
+
+    def test_checkin_is_not_retried(self):
+        """Test that a check-in which reached the server is never sent again."""
+        self.assert_sent_once(lambda: self.actions.checkin(0, "UTC", "1"))
+
+    def test_add_comment_is_not_retried(self):
+        """Test that a comment which reached the server is never sent again."""
+        self.assert_sent_once(lambda: self.actions.add_comment("1", "Cheers"))
+
+    def test_toast_is_not_retried(self):
+        """Test that a toast which reached the server is never sent again."""
+        self.assert_sent_once(lambda: self.actions.toast("1"))
+
+    def test_idempotent_write_is_retried(self):
+        """Test that a write applying the same change twice is retried."""
+        requests = self.server.requests
+        with self.assertRaises(UntappdServerError):
+            self.actions.add_to_wishlist("1")
+        self.assertEqual(self.server.requests - requests, 4)
+
+    def test_read_is_retried(self):
+        """Test that a read is retried up to max_attempts."""
+        user_info = _client(UntappdUserInfo, self.server.url)
+        requests = self.server.requests
+        with self.assertRaises(UntappdServerError):
+            user_info.user_badges("someone")
+        self.assertEqual(self.server.requests - requests, 4)
+
+    def test_wishlist_read_named_like_a_write_is_retried(self):
+        """Test that the wishlist of a user named like a write endpoint is a read."""
+        user_info = _client(UntappdUserInfo, self.server.url)
+        requests = self.server.requests
+        with self.assertRaises(UntappdServerError):
+            user_info.user_wishlist("addison")
+        self.assertEqual(self.server.requests - requests, 4)
+
+    def test_unsent_checkin_is_retried(self):
+        """Test that a check-in which never reached a server is retried."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        self.actions.url = f"http://127.0.0.1:{port}/v4/"
+        with self.assertRaises(UntappdConnectionError) as caught:
+            self.actions.checkin(0, "UTC", "1")
+        self.assertFalse(caught.exception.sent)
+        self.assertEqual(self.actions.retry_policy.retries, 3)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test the state changes of circuit breakers."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(
+            failure_threshold=3, reset_timeout=10.0, clock=lambda: self.now
+        )
+        self.error = UntappdServerError("beer/info/1 failed", "beer/info/1")
+
+    def fail(self, times):
+        for _ in range(times):
+            self.breaker.before_request("beer/info/1")
+            self.breaker.record_failure(self.error)
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the breaker, which then fails fast."""
+        self.fail(2)
+        self.assertEqual(self.breaker.state, "closed")
+        self.fail(1)
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request("beer/info/1")
+        self.assertEqual(self.breaker.rejected, 1)
+
+    def test_success_resets_failures(self):
+        """Test that a success in between failures keeps the breaker closed."""
+        self.fail(2)
+        self.breaker.record_success()
+        self.fail(2)
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_trial_success_closes(self):
+        """Test that one trial is let through after reset_timeout and closes on success."""
+        self.fail(3)
+        self.now = 10.0
+        self.breaker.before_request("beer/info/1")
+        self.assertEqual(self.breaker.state, "half_open")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request("beer/info/1")
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_trial_failure_reopens(self):
+        """Test that a failed trial opens the breaker for another reset_timeout."""
+        self.fail(3)
+        self.now = 10.0
+        self.fail(1)
+        self.assertEqual(self.breaker.state, "open")
+        self.now = 15.0
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request("beer/info/1")
+
+    def test_endpoints_have_their_own_breakers(self):
+        """Test that ids share an endpoint's breaker and writes are endpoints of their own."""
+        breakers = CircuitBreakers()
+        self.assertIs(
+            breakers.breaker_for("beer/info/1"), breakers.breaker_for("beer/info/2")
+        )
+        self.assertIsNot(
+            breakers.breaker_for("user/wishlist/add"),
+            breakers.breaker_for("user/wishlist/someone"),
+        )
+
+    def test_client_fails_fast_once_open(self):
+        """Test that a client stops sending requests to an endpoint whose breaker opened."""
+        with FakeUntappdServer(rate_limit=10**9, error_rate=1.0) as server:
+            user_info = _client(UntappdUserInfo, server.url)
+            user_info.set_retry_policy(None)
+            user_info.set_circuit_breakers(CircuitBreakers(failure_threshold=2))
+            for _ in range(2):
+                with self.assertRaises(UntappdServerError):
+                    user_info.user_badges("someone")
+            requests = server.requests
+            with self.assertRaises(CircuitOpenError):
+                user_info.user_badges("someone")
+            self.assertEqual(server.requests, requests)
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from Untappd_Feed import UntappdFeed
+from Untappd_Scheduler import PollScheduler
+from Untappd_Server import FakeUntappdServer
+from Untappd_Sync import FeedSync, WatermarkStore
+
+
+class TestPollScheduler(unittest.TestCase):
+    """Test that polls spend the request budget by the pages they fetch."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9, feed_size=100).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = WatermarkStore(os.path.join(self.directory.name, "watermarks.db"))
+        self.client = UntappdFeed("id", "secret")
+        self.client.url = self.server.url
+        self.now = 0.0
+        self.polled = []
+
+    def tearDown(self):
+        self.store.close()
+        self.server.stop()
+        self.directory.cleanup()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def run_scheduler(self, backfill, duration):
+        """Runs a scheduler of three venue feeds on a fake clock for duration seconds"""
+        sync = FeedSync(self.client, self.store, limit=25, backfill=backfill)
+        scheduler = PollScheduler(
+            sync, budget=10, window=100.0, min_interval=1000.0, clock=lambda: self.now
+        )
+        for venue_id in ("1", "2", "3"):
+            scheduler.add("venue", venue_id)
+        clock = mock.Mock(sleep=self.sleep)
+        with mock.patch("Untappd_Scheduler.time", clock):
+            scheduler.run(
+                lambda kind, entity_id, checkins: self.polled.append(
+                    (self.now, entity_id, len(checkins))
+                ),
+                duration=duration,
+            )
+        return scheduler
+
+    def test_one_page_polls(self):
+        """Test that polls of a single page are spaced window / budget apart."""
+        scheduler = self.run_scheduler(backfill=10, duration=25.0)
+        self.assertEqual(
+            self.polled, [(0.0, "1", 10), (10.0, "2", 10), (20.0, "3", 10)]
+        )
+        self.assertEqual(scheduler.sync.requests, 3)
+        self.assertEqual(self.now, 30.0)
+
+    def test_pages_are_charged(self):
+        """Test that a poll walking several pages waits for each of them."""
+        scheduler = self.run_scheduler(backfill=None, duration=60.0)
+        # Each feed holds 100 check-ins, four full pages and an empty one
+        self.assertEqual(self.polled, [(0.0, "1", 100), (50.0, "2", 100)])
+        self.assertEqual(scheduler.sync.requests, 10)
+        self.assertEqual(self.now, 100.0)
+        self.assertLessEqual(scheduler.sync.requests, scheduler.budget)
+
+    def test_failed_poll_is_charged(self):
+        """Test that a failed poll still spends its share of the budget."""
+        errors = []
+        sync = FeedSync(self.client, self.store, backfill=10)
+        scheduler = PollScheduler(
+            sync, budget=10, window=100.0, min_interval=1000.0, clock=lambda: self.now
+        )
+        scheduler.add("user", "someone")
+        scheduler.add("venue", "1")
+        with mock.patch("Untappd_Scheduler.time", mock.Mock(sleep=self.sleep)):
+            scheduler.run(
+                lambda kind, entity_id, checkins: self.polled.append(
+                    (self.now, entity_id, len(checkins))
+                ),
+                duration=15.0,
+                on_error=lambda kind, entity_id, error: errors.append(entity_id),
+            )
+        self.assertEqual(errors, ["someone"])
+        self.assertEqual(self.polled, [(10.0, "1", 10)])
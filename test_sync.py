@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from Untappd_Errors import UntappdError
+from Untappd_Feed import UntappdFeed
+from Untappd_Server import FakeUntappdServer
+from Untappd_Sync import FeedSync, WatermarkStore
+
+
+class TestFeedSync(unittest.TestCase):
+    """Test syncing feeds from their watermarks."""
+
+    def setUp(self):
+        self.server = FakeUntappdServer(rate_limit=10**9, feed_size=100).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "watermarks.db")
+        self.store = WatermarkStore(self.path)
+        self.client = UntappdFeed("id", "secret")
+        self.client.url = self.server.url
+        self.history = list(self.client.iter_venue_feed("7", limit=50))
+
+    def tearDown(self):
+        self.store.close()
+        self.server.stop()
+        self.directory.cleanup()
+
+    @staticmethod
+    def ids(checkins):
+        return [checkin["checkin_id"] for checkin in checkins]
+
+    def test_backfill(self):
+        """Test that a first sync fetches the newest backfill check-ins and sets the watermark."""
+        sync = FeedSync(self.client, self.store, limit=25, backfill=30)
+        self.assertEqual(self.ids(sync.poll("venue", "7")), self.ids(self.history[:30]))
+        self.assertEqual(sync.requests, 2)
+        self.assertEqual(self.store.get("venue", "7"), self.history[0]["checkin_id"])
+
+    def test_whole_history(self):
+        """Test that a backfill of None fetches the whole history on the first sync."""
+        sync = FeedSync(self.client, self.store, limit=25, backfill=None)
+        self.assertEqual(self.ids(sync.poll("venue", "7")), self.ids(self.history))
+        # The fourth page is full, so an empty fifth one ends the walk
+        self.assertEqual(sync.requests, 5)
+
+    def test_watermark_persists(self):
+        """Test that a sync reopened from the same database only asks for newer check-ins."""
+        FeedSync(self.client, self.store).poll("venue", "7")
+        store = WatermarkStore(self.path)
+        sync = FeedSync(self.client, store)
+        self.assertEqual(sync.poll("venue", "7"), [])
+        self.assertEqual(sync.requests, 1)
+        store.close()
+
+    def test_new_checkins_since_watermark(self):
+        """Test that a poll walks every page above the watermark, and only those."""
+        self.store.put("venue", "7", self.history[60]["checkin_id"])
+        sync = FeedSync(self.client, self.store, limit=25)
+        self.assertEqual(self.ids(sync.poll("venue", "7")), self.ids(self.history[:60]))
+        self.assertEqual(sync.requests, 3)
+        self.assertEqual(self.store.get("venue", "7"), self.history[0]["checkin_id"])
+
+    def test_failed_poll_keeps_watermark(self):
+        """Test that a failed poll leaves the watermark for the next poll to retry from."""
+        watermark = self.history[60]["checkin_id"]
+        self.store.put("venue", "7", watermark)
+        with FakeUntappdServer(rate_limit=10**9, error_rate=1.0) as failing:
+            self.client.url = failing.url
+            with self.assertRaises(UntappdError):
+                FeedSync(self.client, self.store).poll("venue", "7")
+        self.assertEqual(self.store.get("venue", "7"), watermark)
+
+    def test_remove_starts_over(self):
+        """Test that removing a watermark makes the next poll backfill again."""
+        sync = FeedSync(self.client, self.store, backfill=10)
+        sync.poll("venue", "7")
+        self.store.remove("venue", "7")
+        self.assertEqual(self.ids(sync.poll("venue", "7")), self.ids(self.history[:10]))
+
+    def test_unknown_kind(self):
+        """Test that only venue, beer and brewery feeds can be synced."""
+        with self.assertRaises(ValueError):
+            FeedSync(self.client, self.store).poll("user", "someone")
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from Untappd_Errors import UntappdError
+from Untappd_Feed import UntappdFeed
+from Untappd_Rate_Limit import RateLimiter
+from Untappd_Server import FakeUntappdServer
+from Untappd_Transport import RecordingTransport, ReplayTransport
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Test that a recorded run replays offline with the same responses."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cassette.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that replayed responses and rate limit headers match the recorded ones."""
+        with FakeUntappdServer(rate_limit=500) as server:
+            client = UntappdFeed("recorded-client-id", "recorded-client-secret")
+            client.url = server.url
+            client.set_auth("recorded-access-token")
+            with RecordingTransport(self.path) as recorder:
+                client.set_transport(recorder)
+                recorded = [
+                    client.beer_feed_id("1", limit=5),
+                    client.user_feed("someone", limit=5),
+                    client.venue_feed_id("2", limit=5),
+                ]
+            self.assertEqual(recorder.recorded, 3)
+        with open(self.path, encoding="utf-8") as f:
+            cassette = f.read()
+        for secret in (
+            "recorded-client-id",
+            "recorded-client-secret",
+            "recorded-access",
+        ):
+            self.assertNotIn(secret, cassette)
+        self.assertIn("X-Ratelimit-Remaining", cassette)
+
+        replay = ReplayTransport(self.path)
+        client = UntappdFeed("other-client-id", "other-client-secret")
+        client.url = server.url
+        client.set_auth("other-access-token")
+        client.set_transport(replay)
+        limiter = RateLimiter(limit=500)
+        client.set_rate_limiter(limiter)
+        replayed = [
+            client.beer_feed_id("1", limit=5),
+            client.user_feed("someone", limit=5),
+            client.venue_feed_id("2", limit=5),
+        ]
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(replay.replayed, 3)
+        self.assertEqual(replay.misses, 0)
+        self.assertEqual(limiter.state()["remaining"], 497)
+
+    def test_unrecorded_request(self):
+        """Test that a request missing from the cassette fails instead of reaching a server."""
+        open(self.path, "w").close()
+        replay = ReplayTransport(self.path)
+        client = UntappdFeed("id", "secret")
+        client.set_transport(replay)
+        with self.assertRaises(UntappdError):
+            client.beer_feed_id("1")
+        self.assertEqual(replay.misses, 1)
+
+    def test_headers_are_case_insensitive(self):
+        """Test that replayed headers are looked up regardless of case."""
+        with FakeUntappdServer(rate_limit=500) as server:
+            with RecordingTransport(self.path) as recorder:
+                recorder.request("GET", server.url + "beer/info/1?client_id=id")
+        _, headers, _ = ReplayTransport(self.path).request(
+            "GET", server.url + "beer/info/1?client_id=other"
+        )
+        self.assertEqual(headers["x-ratelimit-limit"], "500")
+        self.assertEqual(headers.get("X-RATELIMIT-LIMIT"), "500")
+        self.assertIn("content-type", headers)